@@ -0,0 +1,58 @@
+import os
+import argparse
+import uvicorn
+from loguru import logger
+from run_server import init_logger, get_version
+from src.open_llm_vtuber.inference_server import InferenceServer, ENGINE_KINDS
+from src.open_llm_vtuber.config_manager import Config, read_yaml, validate_config
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Open-LLM-VTuber inference server: serves the ASR, TTS and "
+        "LLM of a config to front servers using the remote_* engines"
+    )
+    parser.add_argument("--verbose", action="store_true", help="Enable verbose logging")
+    parser.add_argument(
+        "--hf_mirror", action="store_true", help="Use Hugging Face mirror"
+    )
+    parser.add_argument(
+        "--config", default="conf.yaml", help="Config file (default: conf.yaml)"
+    )
+    parser.add_argument(
+        "--host", default="127.0.0.1", help="Host to listen on (default: 127.0.0.1)"
+    )
+    parser.add_argument(
+        "--port", type=int, default=12394, help="Port to listen on (default: 12394)"
+    )
+    parser.add_argument(
+        "--engines",
+        default=",".join(ENGINE_KINDS),
+        help="Comma-separated engines to serve (default: asr,tts,llm)",
+    )
+    return parser.parse_args()
+
+
+@logger.catch
+def run(args, console_log_level: str):
+    init_logger(console_log_level)
+    logger.info(f"t41372/Open-LLM-VTuber inference server, version v{get_version()}")
+
+    config: Config = validate_config(read_yaml(args.config))
+    engines = [kind.strip() for kind in args.engines.split(",") if kind.strip()]
+
+    server = InferenceServer(config=config, engines=engines)
+    uvicorn.run(
+        app=server.app,
+        host=args.host,
+        port=args.port,
+        log_level=console_log_level.lower(),
+    )
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    console_log_level = "DEBUG" if args.verbose else "INFO"
+    if args.hf_mirror:
+        os.environ["HF_ENDPOINT"] = "https://hf-mirror.com"
+    run(args, console_log_level=console_log_level)
@@ -68,6 +68,7 @@ def run(console_log_level: str):
         app=server.app,
         host=server_config.host,
         port=server_config.port,
+        ws_per_message_deflate=server_config.websocket.per_message_deflate,
         log_level=console_log_level.lower(),
     )
 
@@ -1,13 +1,48 @@
-from typing import Type
+from typing import Tuple, Type
 from loguru import logger
 
 from .agents.agent_interface import AgentInterface
 from .agents.basic_memory_agent import BasicMemoryAgent
+from .stateless_llm.stateless_llm_interface import StatelessLLMInterface
 from .stateless_llm_factory import LLMFactory as StatelessLLMFactory
 from .agents.hume_ai import HumeAIAgent
 
 
 class AgentFactory:
+    @staticmethod
+    def get_llm_config(
+        conversation_agent_choice: str, agent_settings: dict, llm_configs: dict
+    ) -> Tuple[str, dict] | None:
+        """Return the LLM provider and its config used by the agent.
+
+        Args:
+            conversation_agent_choice: The type of agent
+            agent_settings: Settings for different types of agents
+            llm_configs: Pool of LLM configurations
+
+        Returns:
+            (llm_provider, llm_config), or None if the agent doesn't use a
+            stateless LLM
+        """
+        if conversation_agent_choice != "basic_memory_agent":
+            return None
+
+        # Get the LLM provider choice from agent settings
+        basic_memory_settings: dict = agent_settings.get("basic_memory_agent", {})
+        llm_provider: str = basic_memory_settings.get("llm_provider")
+
+        if not llm_provider:
+            raise ValueError("LLM provider not specified for basic memory agent")
+
+        # Get the LLM config for this provider
+        llm_config = llm_configs.get(llm_provider)
+        if not llm_config:
+            raise ValueError(
+                f"Configuration not found for LLM provider: {llm_provider}"
+            )
+
+        return llm_provider, llm_config
+
     @staticmethod
     def create_agent(
         conversation_agent_choice: str,
@@ -16,6 +51,8 @@ class AgentFactory:
         system_prompt: str,
         live2d_model=None,
         tts_preprocessor_config=None,
+        translate_engine=None,
+        llm: StatelessLLMInterface | None = None,
         **kwargs,
     ) -> Type[AgentInterface]:
         """Create an agent based on the configuration.
@@ -27,29 +64,24 @@ class AgentFactory:
             system_prompt: The system prompt to use
             live2d_model: Live2D model instance for expression extraction
             tts_preprocessor_config: Configuration for TTS preprocessing
+            translate_engine: Translator for the TTS text, or None to disable
+            llm: A stateless LLM to share with other agents. Created from
+                llm_configs if None
             **kwargs: Additional arguments
         """
         logger.info(f"Initializing agent: {conversation_agent_choice}")
 
         if conversation_agent_choice == "basic_memory_agent":
-            # Get the LLM provider choice from agent settings
             basic_memory_settings: dict = agent_settings.get("basic_memory_agent", {})
-            llm_provider: str = basic_memory_settings.get("llm_provider")
-
-            if not llm_provider:
-                raise ValueError("LLM provider not specified for basic memory agent")
-
-            # Get the LLM config for this provider
-            llm_config = llm_configs.get(llm_provider)
-            if not llm_config:
-                raise ValueError(
-                    f"Configuration not found for LLM provider: {llm_provider}"
-                )
 
             # Create the stateless LLM
-            llm = StatelessLLMFactory.create_llm(
-                llm_provider=llm_provider, system_prompt=system_prompt, **llm_config
-            )
+            if llm is None:
+                llm_provider, llm_config = AgentFactory.get_llm_config(
+                    conversation_agent_choice, agent_settings, llm_configs
+                )
+                llm = StatelessLLMFactory.create_llm(
+                    llm_provider=llm_provider, system_prompt=system_prompt, **llm_config
+                )
 
             # Create the agent with the LLM and live2d_model
             return BasicMemoryAgent(
@@ -61,6 +93,10 @@ class AgentFactory:
                     "faster_first_response", True
                 ),
                 segment_method=basic_memory_settings.get("segment_method", "pysbd"),
+                translator=translate_engine,
+                memory_restore_chars=basic_memory_settings.get(
+                    "memory_restore_chars", 24000
+                ),
             )
 
         elif conversation_agent_choice == "mem0_agent":
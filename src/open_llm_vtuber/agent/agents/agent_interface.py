@@ -9,6 +9,10 @@ from ..input_types import BaseInput
 class AgentInterface(ABC):
     """Base interface for all agent implementations"""
 
+    # Whether `chat` accepts a `memory_gate` event, so a response can be started
+    # before the user has finished speaking and dropped without touching memory.
+    SUPPORTS_SPECULATION = False
+
     @abstractmethod
     async def chat(self, input_data: BaseInput) -> AsyncIterator[BaseOutput]:
         """
@@ -28,6 +32,13 @@ class AgentInterface(ABC):
         logger.critical("Agent: No chat function set.")
         raise ValueError("Agent: No chat function set.")
 
+    async def warmup(self) -> None:
+        """
+        Warm up the models behind the agent. Called once after the agent is
+        created. Does nothing by default.
+        """
+        return None
+
     @abstractmethod
     def handle_interrupt(self, heard_response: str) -> None:
         """
@@ -1,10 +1,11 @@
+import asyncio
 from typing import AsyncIterator, List, Dict, Any, Callable
 from loguru import logger
 
 from .agent_interface import AgentInterface
 from ..output_types import SentenceOutput
 from ..stateless_llm.stateless_llm_interface import StatelessLLMInterface
-from ...chat_history_manager import get_history
+from ...chat_history_manager import get_history_tail
 from ..transformers import (
     sentence_divider,
     actions_extractor,
@@ -12,6 +13,7 @@ from ..transformers import (
     display_processor,
 )
 from ...config_manager import TTSPreprocessorConfig
+from ...translate.translate_interface import TranslateInterface
 from ..input_types import BatchInput, TextSource, ImageSource
 
 
@@ -27,6 +29,8 @@ class BasicMemoryAgent(AgentInterface):
         Don't say anything else.
         """
 
+    SUPPORTS_SPECULATION = True
+
     def __init__(
         self,
         llm: StatelessLLMInterface,
@@ -35,6 +39,8 @@ class BasicMemoryAgent(AgentInterface):
         tts_preprocessor_config: TTSPreprocessorConfig = None,
         faster_first_response: bool = True,
         segment_method: str = "pysbd",
+        translator: TranslateInterface | None = None,
+        memory_restore_chars: int = 24000,
     ):
         """
         Initialize the agent with LLM, system prompt and configuration
@@ -46,6 +52,9 @@ class BasicMemoryAgent(AgentInterface):
             tts_preprocessor_config: TTSPreprocessorConfig - Configuration for TTS preprocessing
             faster_first_response: bool - Whether to enable faster first response
             segment_method: str - Method for sentence segmentation
+            translator: TranslateInterface - Translator for the TTS text, or None
+            memory_restore_chars: int - Budget in characters of the history
+                restored into memory when a conversation is reopened, 0 for all
         """
         super().__init__()
         self._memory = []
@@ -53,6 +62,8 @@ class BasicMemoryAgent(AgentInterface):
         self._tts_preprocessor_config = tts_preprocessor_config
         self._faster_first_response = faster_first_response
         self._segment_method = segment_method
+        self._translator = translator
+        self._memory_restore_chars = memory_restore_chars
         self._set_llm(llm)
         self.set_system(system)
         logger.info("BasicMemoryAgent initialized.")
@@ -66,6 +77,10 @@ class BasicMemoryAgent(AgentInterface):
         self._llm: StatelessLLMInterface = llm
         self.chat = self._chat_function_factory(llm.chat_completion)
 
+    async def warmup(self) -> None:
+        """Warm up the underlying LLM."""
+        await self._llm.warmup()
+
     def set_system(self, system: str):
         """
         Set the system prompt
@@ -91,8 +106,11 @@ class BasicMemoryAgent(AgentInterface):
         )
 
     def set_memory_from_history(self, conf_uid: str, history_uid: str) -> None:
-        """Load the memory from chat history"""
-        messages = get_history(conf_uid, history_uid)
+        """Load the memory from the latest messages of a chat history, as many
+        as fit in the restore budget"""
+        messages = get_history_tail(
+            conf_uid, history_uid, max_chars=self._memory_restore_chars
+        )
 
         self._memory = []
         self._memory.append(
@@ -210,7 +228,7 @@ class BasicMemoryAgent(AgentInterface):
         LLM tokens -> sentence_divider -> actions_extractor -> display_processor -> tts_filter
         """
 
-        @tts_filter(self._tts_preprocessor_config)
+        @tts_filter(self._tts_preprocessor_config, translator=self._translator)
         @display_processor()
         @actions_extractor(self._live2d_model)
         @sentence_divider(
@@ -218,12 +236,16 @@ class BasicMemoryAgent(AgentInterface):
             segment_method=self._segment_method,
             valid_tags=["think"],
         )
-        async def chat_with_memory(input_data: BatchInput) -> AsyncIterator[str]:
+        async def chat_with_memory(
+            input_data: BatchInput, memory_gate: asyncio.Event | None = None
+        ) -> AsyncIterator[str]:
             """
             Chat implementation with memory and processing pipeline
 
             Args:
                 input_data: BatchInput
+                memory_gate: asyncio.Event - If given, the response is only
+                    stored in memory once this event is set (speculative turns)
 
             Returns:
                 AsyncIterator[str] - Token stream from LLM
@@ -239,11 +261,16 @@ class BasicMemoryAgent(AgentInterface):
                 yield token
                 complete_response += token
 
+            if memory_gate is not None:
+                await memory_gate.wait()
+
             # Store complete response
             self._add_message(complete_response, "assistant")
 
         return chat_with_memory
 
-    async def chat(self, input_data: BatchInput) -> AsyncIterator[SentenceOutput]:
+    async def chat(
+        self, input_data: BatchInput, memory_gate: asyncio.Event | None = None
+    ) -> AsyncIterator[SentenceOutput]:
         """Placeholder chat method that will be replaced at runtime"""
-        return self.chat(input_data)
+        return self.chat(input_data, memory_gate)
@@ -25,12 +25,24 @@ class LLM(StatelessLLMInterface):
         """
         logger.info(f"Initializing llama cpp with model path: {model_path}")
         self.model_path = model_path
+        # A Llama instance can only run one completion at a time, but it is
+        # shared by all sessions, so completions are queued.
+        self._lock = asyncio.Lock()
         try:
             self.llm = Llama(model_path=model_path, **kwargs)
         except Exception as e:
             logger.critical(f"Failed to initialize Llama model: {e}")
             raise
 
+    async def warmup(self) -> None:
+        """Generate one token, so the model weights are paged in."""
+        async with self._lock:
+            await asyncio.to_thread(
+                lambda: self.llm.create_chat_completion(
+                    messages=[{"role": "user", "content": "Hi"}], max_tokens=1
+                )
+            )
+
     async def chat_completion(
         self, messages: List[Dict[str, Any]], system: str = None
     ) -> AsyncIterator[str]:
@@ -55,21 +67,24 @@ class LLM(StatelessLLMInterface):
                     *messages,
                 ]
 
-            # Create chat completion in a separate thread to avoid blocking
-            chat_completion = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.llm.create_chat_completion(
-                    messages=messages_with_system,
-                    stream=True,
-                ),
-            )
+            async with self._lock:
+                # Create chat completion in a separate thread to avoid blocking
+                chat_completion = await asyncio.to_thread(
+                    lambda: self.llm.create_chat_completion(
+                        messages=messages_with_system,
+                        stream=True,
+                    )
+                )
 
-            # Process chunks
-            for chunk in chat_completion:
-                if chunk.get("choices") and chunk["choices"][0].get("delta"):
-                    content = chunk["choices"][0]["delta"].get("content", "")
-                    if content:
-                        yield content
+                # Process chunks, generating each one in a separate thread too
+                while True:
+                    chunk = await asyncio.to_thread(next, chat_completion, None)
+                    if chunk is None:
+                        break
+                    if chunk.get("choices") and chunk["choices"][0].get("delta"):
+                        content = chunk["choices"][0]["delta"].get("content", "")
+                        if content:
+                            yield content
 
         except Exception as e:
             logger.error(f"Error in chat completion: {e}")
@@ -1,7 +1,8 @@
 import atexit
-import requests
+import httpx
 from loguru import logger
 from .openai_compatible_llm import AsyncLLM
+from ...utils.http_client import get_http_client
 
 
 class OllamaLLM(AsyncLLM):
@@ -32,15 +33,17 @@ class OllamaLLM(AsyncLLM):
             logger.info("Preloading model for Ollama")
             # Send the POST request to preload model
             logger.debug(
-                requests.post(
+                get_http_client().post(
                     base_url.replace("/v1", "") + "/api/chat",
                     json={
                         "model": model,
                         "keep_alive": keep_alive,
                     },
+                    # loading a large model can take a while
+                    timeout=None,
                 )
             )
-        except requests.exceptions.ConnectionError as e:
+        except httpx.ConnectError as e:
             logger.error(f"Failed to preload model: {e}")
             logger.critical("Fail to connect to Ollama backend. Is Ollama server running? Try running `ollama list` to start the server and try again.\nThe AI will repeat 'Error connecting chat endpoint' until the server is running.")
         except Exception as e:
@@ -60,7 +63,7 @@ class OllamaLLM(AsyncLLM):
             # Unload the model
             # unloading is just the same as preload, but with keep alive set to 0
             logger.debug(
-                requests.post(
+                get_http_client().post(
                     self.base_url.replace("/v1", "") + "/api/chat",
                     json={
                         "model": self.model,
@@ -0,0 +1,56 @@
+from typing import AsyncIterator, List, Dict, Any
+
+from loguru import logger
+
+from .stateless_llm_interface import StatelessLLMInterface
+from ...remote_inference.endpoint_pool import EndpointPool
+from ...remote_inference.protocol import FRAME_ERROR, FRAME_TEXT, FrameDecoder
+
+
+class LLM(StatelessLLMInterface):
+    """Streams completions from the LLM of remote inference servers
+    (`run_inference_server.py`)."""
+
+    def __init__(
+        self,
+        urls: List[str],
+        health_check_interval: float = 10.0,
+        system: str = None,
+    ):
+        """
+        Args:
+            urls: Base URLs of the inference servers.
+            health_check_interval (float): Seconds between health checks.
+            system (str, optional): System prompt used when a request has none.
+        """
+        self.endpoints = EndpointPool(urls, "llm", health_check_interval)
+        self.system = system
+        logger.info(f"Remote LLM servers: {[e.url for e in self.endpoints.endpoints]}")
+
+    async def chat_completion(
+        self, messages: List[Dict[str, Any]], system: str = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream the completion of the messages from a remote server.
+
+        Raises:
+            RuntimeError: If the remote LLM failed while generating.
+            httpx.HTTPError: If no server could be reached.
+        """
+        decoder = FrameDecoder()
+        stream = self.endpoints.astream(
+            "POST",
+            "/llm/chat",
+            json={"messages": messages, "system": system or self.system},
+        )
+        try:
+            async for data in stream:
+                for frame_type, text in decoder.feed(data):
+                    if frame_type == FRAME_TEXT:
+                        yield text
+                    elif frame_type == FRAME_ERROR:
+                        raise RuntimeError(f"Remote LLM error: {text}")
+        finally:
+            await stream.aclose()
+        if decoder.pending:
+            raise RuntimeError("Remote LLM stream ended in the middle of a frame")
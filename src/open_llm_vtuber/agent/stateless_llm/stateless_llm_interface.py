@@ -39,3 +39,14 @@ class StatelessLLMInterface(metaclass=abc.ABCMeta):
         - APIError: For other API-related errors
         """
         raise NotImplementedError
+
+    async def warmup(self) -> None:
+        """
+        Prepare the model so the first real request doesn't pay the cold-start
+        cost (model loading, prompt cache...).
+
+        Does nothing by default: a completion would be billed by API providers
+        on every startup and config switch. LLMs running a local model override
+        this with a one-token completion.
+        """
+        return None
@@ -3,9 +3,59 @@ from typing import Type
 from loguru import logger
 
 from .stateless_llm.stateless_llm_interface import StatelessLLMInterface
-from .stateless_llm.openai_compatible_llm import AsyncLLM as OpenAICompatibleLLM
-from .stateless_llm.ollama_llm import OllamaLLM
-from .stateless_llm.claude_llm import AsyncLLM as ClaudeLLM
+from ..utils.engine_registry import EngineRegistry
+
+# Provider modules are only imported when the provider is selected in the config.
+llm_registry = EngineRegistry("LLM provider", f"{__package__}.stateless_llm")
+
+_openai_compatible_params = [
+    "model",
+    "base_url",
+    "llm_api_key",
+    "organization_id",
+    "project_id",
+]
+for _provider in [
+    "openai_compatible_llm",
+    "openai_llm",
+    "gemini_llm",
+    "zhipu_llm",
+    "deepseek_llm",
+    "groq_llm",
+    "mistral_llm",
+]:
+    llm_registry.register(
+        _provider, ".openai_compatible_llm", "AsyncLLM", _openai_compatible_params
+    )
+
+llm_registry.register(
+    "ollama_llm",
+    ".ollama_llm",
+    "OllamaLLM",
+    _openai_compatible_params + ["temperature", "keep_alive", "unload_at_exit"],
+)
+llm_registry.register("llama_cpp_llm", ".llama_cpp_llm", "LLM", ["model_path"])
+llm_registry.register(
+    "claude_llm",
+    ".claude_llm",
+    "AsyncLLM",
+    {
+        "system": "system_prompt",
+        "base_url": "base_url",
+        "model": "model",
+        "llm_api_key": "llm_api_key",
+    },
+)
+llm_registry.register(
+    "remote_llm",
+    ".remote_llm",
+    "LLM",
+    {
+        "urls": "urls",
+        "health_check_interval": "health_check_interval",
+        "system": "system_prompt",
+    },
+)
 
 
 class LLMFactory:
@@ -18,50 +68,7 @@ class LLMFactory:
             **kwargs: Additional arguments
         """
         logger.info(f"Initializing LLM: {llm_provider}")
-
-        if (
-            llm_provider == "openai_compatible_llm"
-            or llm_provider == "openai_llm"
-            or llm_provider == "gemini_llm"
-            or llm_provider == "zhipu_llm"
-            or llm_provider == "deepseek_llm"
-            or llm_provider == "groq_llm"
-            or llm_provider == "mistral_llm"
-        ):
-            return OpenAICompatibleLLM(
-                model=kwargs.get("model"),
-                base_url=kwargs.get("base_url"),
-                llm_api_key=kwargs.get("llm_api_key"),
-                organization_id=kwargs.get("organization_id"),
-                project_id=kwargs.get("project_id"),
-            )
-        if llm_provider == "ollama_llm":
-            return OllamaLLM(
-                model=kwargs.get("model"),
-                base_url=kwargs.get("base_url"),
-                llm_api_key=kwargs.get("llm_api_key"),
-                organization_id=kwargs.get("organization_id"),
-                project_id=kwargs.get("project_id"),
-                temperature=kwargs.get("temperature"),
-                keep_alive=kwargs.get("keep_alive"),
-                unload_at_exit=kwargs.get("unload_at_exit"),
-            )
-
-        elif llm_provider == "llama_cpp_llm":
-            from .stateless_llm.llama_cpp_llm import LLM as LlamaLLM
-
-            return LlamaLLM(
-                model_path=kwargs.get("model_path"),
-            )
-        elif llm_provider == "claude_llm":
-            return ClaudeLLM(
-                system=kwargs.get("system_prompt"),
-                base_url=kwargs.get("base_url"),
-                model=kwargs.get("model"),
-                llm_api_key=kwargs.get("llm_api_key"),
-            )
-        else:
-            raise ValueError(f"Unsupported LLM provider: {llm_provider}")
+        return llm_registry.create(llm_provider, **kwargs)
 
 
 # 使用工廠創建 LLM 實例
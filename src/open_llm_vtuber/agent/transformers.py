@@ -1,3 +1,4 @@
+import asyncio
 from typing import AsyncIterator, Tuple, Callable, List
 from functools import wraps
 from .output_types import Actions, SentenceOutput
@@ -5,6 +6,7 @@ from ..utils.tts_preprocessor import tts_filter as filter_text
 from ..live2d_model import Live2dModel
 from ..utils.sentence_divider import SentenceDivider
 from ..config_manager import TTSPreprocessorConfig
+from ..translate.translate_interface import TranslateInterface
 from ..utils.sentence_divider import SentenceWithTags, TagState
 from loguru import logger
 
@@ -102,10 +104,18 @@ def display_processor():
     return decorator
 
 
-def tts_filter(tts_preprocessor_config: TTSPreprocessorConfig = None):
+def tts_filter(
+    tts_preprocessor_config: TTSPreprocessorConfig = None,
+    translator: TranslateInterface | None = None,
+):
     """
     Decorator that filters text for TTS.
     Skips TTS for think tag content.
+
+    If a translator is given, the TTS text is translated in a pipelined stage:
+    the translation of the next sentences runs while the current one is being
+    synthesized, with at most `translate_lookahead` sentences in flight.
+    The display text (subtitles) is never translated.
     """
 
     def decorator(
@@ -116,29 +126,89 @@ def tts_filter(tts_preprocessor_config: TTSPreprocessorConfig = None):
             sentence_stream = func(*args, **kwargs)
             config = tts_preprocessor_config or TTSPreprocessorConfig()
 
-            async for sentence, display, actions in sentence_stream:
+            def filter_for_tts(sentence: SentenceWithTags, display: str) -> str:
                 # Skip TTS for think tags and their content
                 if any(tag.name == "think" for tag in sentence.tags):
-                    tts = ""
-                else:
-                    tts = filter_text(
-                        text=display,
-                        remove_special_char=config.remove_special_char,
-                        ignore_brackets=config.ignore_brackets,
-                        ignore_parentheses=config.ignore_parentheses,
-                        ignore_asterisks=config.ignore_asterisks,
-                        ignore_angle_brackets=config.ignore_angle_brackets,
-                        translator=None,
-                    )
+                    return ""
+                return filter_text(
+                    text=display,
+                    remove_special_char=config.remove_special_char,
+                    ignore_brackets=config.ignore_brackets,
+                    ignore_parentheses=config.ignore_parentheses,
+                    ignore_asterisks=config.ignore_asterisks,
+                    ignore_angle_brackets=config.ignore_angle_brackets,
+                    translator=None,
+                )
 
-                logger.debug(f"display: {display}")
-                logger.debug(f"tts: {tts}")
+            if translator is None:
+                async for sentence, display, actions in sentence_stream:
+                    tts = filter_for_tts(sentence, display)
 
-                yield SentenceOutput(
-                    display_text=display,
-                    tts_text=tts,
-                    actions=actions,
-                )
+                    logger.debug(f"display: {display}")
+                    logger.debug(f"tts: {tts}")
+
+                    yield SentenceOutput(
+                        display_text=display,
+                        tts_text=tts,
+                        actions=actions,
+                    )
+                return
+
+            # the sentence being spoken holds one slot, the rest are lookahead
+            lookahead = max(0, config.translator_config.translate_lookahead)
+            slots = asyncio.Semaphore(lookahead + 1)
+            pending: asyncio.Queue = asyncio.Queue()
+
+            async def translate_ahead():
+                """Start translating upcoming sentences while earlier ones are spoken"""
+                try:
+                    async for sentence, display, actions in sentence_stream:
+                        await slots.acquire()
+                        tts = filter_for_tts(sentence, display)
+                        translation = (
+                            asyncio.create_task(translator.async_translate(tts))
+                            if tts.strip()
+                            else None
+                        )
+                        pending.put_nowait((display, tts, actions, translation))
+                except Exception as e:
+                    pending.put_nowait(e)
+                    return
+                pending.put_nowait(None)
+
+            producer = asyncio.create_task(translate_ahead())
+            try:
+                while (item := await pending.get()) is not None:
+                    if isinstance(item, Exception):
+                        raise item
+
+                    display, tts, actions, translation = item
+                    if translation is not None:
+                        try:
+                            tts = await translation
+                            logger.info(f"Translated: {tts}")
+                        except Exception as e:
+                            logger.critical(f"Error translating: {e}")
+                            logger.critical(f"Text: {tts}")
+                            logger.warning("Skipping...")
+
+                    logger.debug(f"display: {display}")
+                    logger.debug(f"tts: {tts}")
+
+                    yield SentenceOutput(
+                        display_text=display,
+                        tts_text=tts,
+                        actions=actions,
+                    )
+                    # the consumer is done with this sentence
+                    slots.release()
+            finally:
+                # interrupted or done: stop reading ahead and drop pending translations
+                producer.cancel()
+                while not pending.empty():
+                    item = pending.get_nowait()
+                    if isinstance(item, tuple) and item[3] is not None:
+                        item[3].cancel()
 
         return wrapper
 
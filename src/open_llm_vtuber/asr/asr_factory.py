@@ -1,59 +1,56 @@
 from typing import Type
 from .asr_interface import ASRInterface
+from ..utils.engine_registry import EngineRegistry
+
+# Engine modules are only imported when the engine is selected in the config.
+asr_registry = EngineRegistry("ASR system", __package__)
+
+asr_registry.register(
+    "faster_whisper",
+    ".faster_whisper_asr",
+    "VoiceRecognition",
+    ["model_path", "download_root", "language", "device"],
+)
+asr_registry.register("whisper_cpp", ".whisper_cpp_asr", "VoiceRecognition")
+asr_registry.register("whisper", ".openai_whisper_asr", "VoiceRecognition")
+asr_registry.register(
+    "fun_asr",
+    ".fun_asr",
+    "VoiceRecognition",
+    [
+        "model_name",
+        "vad_model",
+        "punc_model",
+        "ncpu",
+        "hub",
+        "device",
+        "language",
+        "use_itn",
+        "sample_rate",
+    ],
+)
+asr_registry.register(
+    "azure_asr",
+    ".azure_asr",
+    "VoiceRecognition",
+    {"subscription_key": "api_key", "region": "region"},
+)
+asr_registry.register(
+    "groq_whisper_asr",
+    ".groq_whisper_asr",
+    "VoiceRecognition",
+    ["api_key", "model", "lang"],
+)
+asr_registry.register("sherpa_onnx_asr", ".sherpa_onnx_asr", "VoiceRecognition")
+asr_registry.register(
+    "sherpa_onnx_online_asr", ".sherpa_onnx_online_asr", "VoiceRecognition"
+)
+asr_registry.register(
+    "remote_asr", ".remote_asr", "VoiceRecognition", ["urls", "health_check_interval"]
+)
 
 
 class ASRFactory:
     @staticmethod
     def get_asr_system(system_name: str, **kwargs) -> Type[ASRInterface]:
-        if system_name == "faster_whisper":
-            from .faster_whisper_asr import VoiceRecognition as FasterWhisperASR
-
-            return FasterWhisperASR(
-                model_path=kwargs.get("model_path"),
-                download_root=kwargs.get("download_root"),
-                language=kwargs.get("language"),
-                device=kwargs.get("device"),
-            )
-        elif system_name == "whisper_cpp":
-            from .whisper_cpp_asr import VoiceRecognition as WhisperCPPASR
-
-            return WhisperCPPASR(**kwargs)
-        elif system_name == "whisper":
-            from .openai_whisper_asr import VoiceRecognition as WhisperASR
-
-            return WhisperASR(**kwargs)
-        elif system_name == "fun_asr":
-            from .fun_asr import VoiceRecognition as FunASR
-
-            return FunASR(
-                model_name=kwargs.get("model_name"),
-                vad_model=kwargs.get("vad_model"),
-                punc_model=kwargs.get("punc_model"),
-                ncpu=kwargs.get("ncpu"),
-                hub=kwargs.get("hub"),
-                device=kwargs.get("device"),
-                language=kwargs.get("language"),
-                use_itn=kwargs.get("use_itn"),
-                # sample_rate=kwargs.get("sample_rate"),
-            )
-        elif system_name == "azure_asr":
-            from .azure_asr import VoiceRecognition as AzureASR
-
-            return AzureASR(
-                subscription_key=kwargs.get("api_key"),
-                region=kwargs.get("region"),
-            )
-        elif system_name == "groq_whisper_asr":
-            from .groq_whisper_asr import VoiceRecognition as GroqWhisperASR
-
-            return GroqWhisperASR(
-                api_key=kwargs.get("api_key"),
-                model=kwargs.get("model"),
-                lang=kwargs.get("lang"),
-            )
-        elif system_name == "sherpa_onnx_asr":
-            from .sherpa_onnx_asr import VoiceRecognition as SherpaOnnxASR
-
-            return SherpaOnnxASR(**kwargs)
-        else:
-            raise ValueError(f"Unknown ASR system: {system_name}")
+        return asr_registry.create(system_name, **kwargs)
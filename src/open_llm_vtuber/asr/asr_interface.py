@@ -1,55 +1,125 @@
 import abc
 import numpy as np
 import asyncio
+from typing import List
+
+from .audio_buffer import AudioBuffer
+
+
+class ASRStream(metaclass=abc.ABCMeta):
+    """Incremental transcription of one utterance, fed while the user speaks."""
+
+    @abc.abstractmethod
+    def accept_chunk(self, audio: np.ndarray) -> None:
+        """Feed the next chunk of audio and decode as much of it as possible.
+
+        Args:
+            audio: The numpy array of the next audio samples, at 16 kHz
+                (ASRInterface.SAMPLE_RATE) whatever the native rate of the engine.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def partial_result(self) -> str:
+        """Return the transcription of the audio fed so far."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def finalize(self) -> str:
+        """Decode the rest of the audio and return the final transcription.
+        The stream can't be used afterwards."""
+        raise NotImplementedError
 
 
 class ASRInterface(metaclass=abc.ABCMeta):
     SAMPLE_RATE = 16000
     NUM_CHANNELS = 1
     SAMPLE_WIDTH = 2
+    # True if the engine implements create_stream
+    SUPPORTS_STREAMING = False
+    # True if the engine runs a model in this process, see warmup
+    LOCAL_MODEL = False
+
+    def create_stream(self) -> ASRStream:
+        """Start the streaming transcription of a new utterance.
+
+        Only available if SUPPORTS_STREAMING is True.
+
+        Returns:
+            ASRStream: The stream to feed the audio to.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support streaming transcription"
+        )
 
-    async def async_transcribe_np(self, audio: np.ndarray) -> str:
+    async def async_transcribe_np(self, audio: np.ndarray | AudioBuffer) -> str:
         """Asynchronously transcribe speech audio in numpy array format.
 
         By default, this runs the synchronous transcribe_np in a coroutine.
         Subclasses can override this method to provide true async implementation.
 
         Args:
-            audio: The numpy array of the audio data to transcribe.
+            audio: The audio data to transcribe, as a numpy array or an AudioBuffer.
 
         Returns:
             str: The transcription result.
         """
         return await asyncio.to_thread(self.transcribe_np, audio)
 
+    def warmup(self) -> None:
+        """Run a short synthetic transcription so later calls don't pay the
+        cold-start cost (graph optimization, CUDA autotune, JIT...).
+
+        Only engines with LOCAL_MODEL set transcribe half a second of silence.
+        The others do nothing, so cloud APIs aren't called (and billed) on every
+        startup and config switch.
+        """
+        if self.LOCAL_MODEL:
+            self.transcribe_np(np.zeros(self.SAMPLE_RATE // 2, dtype=np.float32))
+
+    def prepare_audio(self, audio: np.ndarray | AudioBuffer) -> AudioBuffer:
+        """Wrap the audio in an AudioBuffer at the native rate of the engine.
+
+        Numpy arrays are assumed to be at SAMPLE_RATE already. AudioBuffers at
+        another rate (e.g. 48 kHz mic audio) are resampled.
+        """
+        return AudioBuffer.from_any(audio, self.SAMPLE_RATE).resample(self.SAMPLE_RATE)
+
     @abc.abstractmethod
-    def transcribe_np(self, audio: np.ndarray) -> str:
+    def transcribe_np(self, audio: np.ndarray | AudioBuffer) -> str:
         """Transcribe speech audio in numpy array format and return the transcription.
 
+        Implementations should pass the input through `prepare_audio` and use the
+        cached conversions of the AudioBuffer, so the audio is converted only once.
+
         Args:
-            audio: The numpy array of the audio data to transcribe.
+            audio: The audio data to transcribe, as a numpy array or an AudioBuffer.
         """
         raise NotImplementedError
 
+    def transcribe_batch_np(self, audios: List[np.ndarray | AudioBuffer]) -> List[str]:
+        """Transcribe several utterances and return one transcription per utterance.
+
+        By default, this transcribes them one after another. Subclasses whose
+        models can decode several inputs at once should override this method.
+
+        Args:
+            audios: The audio data of each utterance to transcribe.
+
+        Returns:
+            List[str]: The transcription results, in the same order.
+        """
+        return [self.transcribe_np(audio) for audio in audios]
+
     def nparray_to_audio_file(
-        self, audio: np.ndarray, sample_rate: int, file_path: str
+        self, audio: np.ndarray | AudioBuffer, sample_rate: int, file_path: str
     ) -> None:
         """Convert a numpy array of audio data to a .wav file.
 
         Args:
-            audio: The numpy array of audio data.
-            sample_rate: The sample rate of the audio data.
+            audio: The numpy array of audio data, or an AudioBuffer.
+            sample_rate: The sample rate of the audio data. Ignored for an
+                AudioBuffer, which knows its own.
             file_path: The path to save the .wav file.
         """
-        import wave
-
-        # Make sure the audio is in the range [-1, 1]
-        audio = np.clip(audio, -1, 1)
-        # Convert the audio to 16-bit PCM
-        audio_integer = (audio * 32767).astype(np.int16)
-
-        with wave.open(file_path, "wb") as wf:
-            wf.setnchannels(1)
-            wf.setsampwidth(2)
-            wf.setframerate(sample_rate)
-            wf.writeframes(audio_integer.tobytes())
+        AudioBuffer.from_any(audio, sample_rate).write_wav(file_path)
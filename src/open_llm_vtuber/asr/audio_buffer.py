@@ -0,0 +1,121 @@
+import io
+import wave
+
+import numpy as np
+
+from .resample import resample
+
+
+class AudioBuffer:
+    """
+    Mono audio of one utterance, with its sample rate attached.
+
+    Engines want the audio in different formats (float32 samples, 16-bit PCM,
+    a WAV file...). The conversions are done on first use and cached, so an
+    utterance is converted at most once per format no matter how many engines
+    or retries look at it. The returned arrays are shared and must not be
+    modified.
+    """
+
+    def __init__(self, samples: np.ndarray, sample_rate: int = 16000):
+        """
+        Args:
+            samples: 1-D array of float samples in [-1, 1] or int16 PCM samples.
+            sample_rate (int): Sample rate of the samples in Hz.
+        """
+        self.samples = np.asarray(samples).reshape(-1)
+        self.sample_rate = sample_rate
+
+        self._float32: np.ndarray | None = None
+        self._pcm16: np.ndarray | None = None
+        self._pcm16_bytes: bytes | None = None
+        self._wav_bytes: bytes | None = None
+        self._resampled: dict[int, "AudioBuffer"] = {}
+
+    @classmethod
+    def from_any(
+        cls, audio: "np.ndarray | AudioBuffer", sample_rate: int = 16000
+    ) -> "AudioBuffer":
+        """Wrap a numpy array, or return the audio unchanged if it already is
+        an AudioBuffer.
+
+        Args:
+            audio: The audio, as a numpy array or an AudioBuffer.
+            sample_rate (int): Sample rate of a numpy array. Ignored for an
+                AudioBuffer, which knows its own.
+        """
+        if isinstance(audio, AudioBuffer):
+            return audio
+        return cls(audio, sample_rate)
+
+    @classmethod
+    def from_file(cls, file_path: str) -> "AudioBuffer":
+        """Decode an audio file (any format ffmpeg can read) to mono 16-bit PCM."""
+        from pydub import AudioSegment
+
+        segment = AudioSegment.from_file(file_path).set_channels(1).set_sample_width(2)
+        return cls(np.frombuffer(segment.raw_data, dtype=np.int16), segment.frame_rate)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.samples.dtype
+
+    @property
+    def duration(self) -> float:
+        """Length of the audio in seconds."""
+        return len(self.samples) / self.sample_rate
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def float32(self) -> np.ndarray:
+        """Samples as float32 in [-1, 1]. No copy if they already are."""
+        if self._float32 is None:
+            if self.samples.dtype == np.int16:
+                self._float32 = self.samples.astype(np.float32) / 32768.0
+            else:
+                self._float32 = self.samples.astype(np.float32, copy=False)
+        return self._float32
+
+    def resample(self, sample_rate: int) -> "AudioBuffer":
+        """The audio at another sample rate. Returns self if the rate is already
+        right, and resamples at most once per rate."""
+        if sample_rate == self.sample_rate:
+            return self
+        if sample_rate not in self._resampled:
+            self._resampled[sample_rate] = AudioBuffer(
+                resample(self.float32(), self.sample_rate, sample_rate), sample_rate
+            )
+        return self._resampled[sample_rate]
+
+    def pcm16(self) -> np.ndarray:
+        """Samples as 16-bit PCM. No copy if they already are."""
+        if self._pcm16 is None:
+            if self.samples.dtype == np.int16:
+                self._pcm16 = self.samples
+            else:
+                self._pcm16 = (np.clip(self.float32(), -1, 1) * 32767).astype(np.int16)
+        return self._pcm16
+
+    def pcm16_bytes(self) -> bytes:
+        """Raw little-endian 16-bit PCM."""
+        if self._pcm16_bytes is None:
+            self._pcm16_bytes = self.pcm16().astype("<i2", copy=False).tobytes()
+        return self._pcm16_bytes
+
+    def wav_bytes(self) -> bytes:
+        """The audio as the contents of a 16-bit mono WAV file."""
+        if self._wav_bytes is None:
+            buffer = io.BytesIO()
+            with wave.open(buffer, "wb") as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(self.sample_rate)
+                wf.writeframes(self.pcm16_bytes())
+            self._wav_bytes = buffer.getvalue()
+        return self._wav_bytes
+
+    def write_wav(self, file_path: str) -> None:
+        """Save the audio as a 16-bit mono WAV file."""
+        with open(file_path, "wb") as f:
+            f.write(self.wav_bytes())
@@ -4,6 +4,7 @@ import numpy as np
 from loguru import logger
 import azure.cognitiveservices.speech as speechsdk
 from .asr_interface import ASRInterface
+from .audio_buffer import AudioBuffer
 
 CACHE_DIR = os.path.join(os.path.dirname(__file__), "cache")
 
@@ -45,22 +46,28 @@ class VoiceRecognition(ASRInterface):
             speech_config=self.speech_config, audio_config=audio_config
         )
 
-    def transcribe_np(self, audio: np.ndarray) -> str:
+    def transcribe_np(self, audio: np.ndarray | AudioBuffer) -> str:
         """Transcribe audio using the given parameters.
 
         Args:
-            audio: The numpy array of the audio data to transcribe.
+            audio: The audio data to transcribe, as a numpy array or an AudioBuffer.
         """
-        temp_file = "temp.wav"
+        audio = self.prepare_audio(audio)
 
-        np.savetxt(temp_file, audio)
+        # push the PCM samples straight to the recognizer instead of a temp file
+        stream_format = speechsdk.audio.AudioStreamFormat(
+            samples_per_second=audio.sample_rate, bits_per_sample=16, channels=1
+        )
+        push_stream = speechsdk.audio.PushAudioInputStream(stream_format=stream_format)
+        push_stream.write(audio.pcm16_bytes())
+        push_stream.close()
 
-        audio_config = speechsdk.AudioConfig(filename=temp_file)
+        audio_config = speechsdk.audio.AudioConfig(stream=push_stream)
         speech_recognizer = speechsdk.SpeechRecognizer(
             speech_config=self.speech_config, audio_config=audio_config
         )
 
-        return speech_recognizer.recognize_once()
+        return speech_recognizer.recognize_once().text
 
 
 if __name__ == "__main__":
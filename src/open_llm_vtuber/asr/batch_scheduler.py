@@ -0,0 +1,62 @@
+import asyncio
+import threading
+from typing import Callable, List
+
+import numpy as np
+from loguru import logger
+
+from ..utils.micro_batcher import MicroBatcher
+
+
+class ASRBatchScheduler:
+    """
+    Collects utterances from concurrent callers and transcribes them together.
+
+    Utterances that arrive within `batch_window_ms` of the first one, up to
+    `max_batch_size`, are handed to `transcribe_batch` in a single call. Only one
+    batch runs at a time, and `transcribe_now` waits for it, so the model is
+    never used from two threads at once.
+    """
+
+    def __init__(
+        self,
+        transcribe_batch: Callable[[List[np.ndarray]], List[str]],
+        max_batch_size: int = 8,
+        batch_window_ms: float = 20,
+    ):
+        """
+        Args:
+            transcribe_batch: Synchronous function that transcribes a list of
+                audio arrays and returns one text per array.
+            max_batch_size (int): Maximum number of utterances decoded together.
+            batch_window_ms (float): How long to wait for more utterances
+                before decoding a batch.
+        """
+        self.transcribe_batch = transcribe_batch
+        self._lock = threading.Lock()
+        self._batcher = MicroBatcher(
+            self._transcribe_batch, max_batch_size, batch_window_ms
+        )
+
+    async def transcribe(self, audio: np.ndarray) -> str:
+        """Queue the audio for the next batch and wait for its transcription."""
+        return await self._batcher.submit(audio)
+
+    def transcribe_now(self, audio: np.ndarray) -> str:
+        """Transcribe the audio in the calling thread, between two batches."""
+        return self._transcribe_locked([audio])[0]
+
+    def _transcribe_locked(self, audios: List[np.ndarray]) -> List[str]:
+        with self._lock:
+            return self.transcribe_batch(audios)
+
+    async def _transcribe_batch(self, audios: List[np.ndarray]) -> List[str]:
+        try:
+            texts = await asyncio.to_thread(self._transcribe_locked, audios)
+        except Exception as e:
+            logger.error(f"Error transcribing a batch of {len(audios)} utterances: {e}")
+            raise
+
+        if len(audios) > 1:
+            logger.debug(f"Transcribed a batch of {len(audios)} utterances.")
+        return texts
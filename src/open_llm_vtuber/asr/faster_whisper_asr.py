@@ -1,9 +1,11 @@
 import numpy as np
 from faster_whisper import WhisperModel
 from .asr_interface import ASRInterface
+from .audio_buffer import AudioBuffer
 
 
 class VoiceRecognition(ASRInterface):
+    LOCAL_MODEL = True
     BEAM_SEARCH = True
     # SAMPLE_RATE # Defined in asr_interface.py
 
@@ -24,9 +26,10 @@ class VoiceRecognition(ASRInterface):
             compute_type="float32",
         )
 
-    def transcribe_np(self, audio: np.ndarray) -> str:
+    def transcribe_np(self, audio: np.ndarray | AudioBuffer) -> str:
+        audio = self.prepare_audio(audio)
         segments, info = self.model.transcribe(
-            audio,
+            audio.float32(),
             beam_size=5 if self.BEAM_SEARCH else 1,
             language=self.LANG,
             condition_on_previous_text=False,
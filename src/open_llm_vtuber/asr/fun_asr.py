@@ -1,10 +1,9 @@
-import io
 import re
 import torch
 import numpy as np
-import soundfile as sf
 from funasr import AutoModel
 from .asr_interface import ASRInterface
+from .audio_buffer import AudioBuffer
 
 
 # paraformer-zh is a multi-functional asr model
@@ -12,6 +11,8 @@ from .asr_interface import ASRInterface
 
 
 class VoiceRecognition(ASRInterface):
+    LOCAL_MODEL = True
+
     def __init__(
         self,
         model_name: str = "iic/SenseVoiceSmall",
@@ -39,14 +40,17 @@ class VoiceRecognition(ASRInterface):
         self.use_itn = use_itn
         self.language = language
 
-    def transcribe_np(self, audio: np.ndarray) -> str:
-        audio_tensor = torch.tensor(audio, dtype=torch.float32)
+    def transcribe_np(self, audio: np.ndarray | AudioBuffer) -> str:
+        audio = self.prepare_audio(audio)
+        # shares memory with the float32 samples instead of copying them
+        audio_tensor = torch.from_numpy(audio.float32())
 
         res = self.model.generate(
             input=audio_tensor,
             batch_size_s=300,
             use_itn=self.use_itn,
             language=self.language,
+            fs=audio.sample_rate,
         )
 
         full_text = res[0]["text"]
@@ -61,10 +65,3 @@ class VoiceRecognition(ASRInterface):
         full_text = re.sub(r"< \|.*?\| >", "", full_text)
 
         return full_text.strip()
-
-    def _numpy_to_wav_in_memory(self, numpy_array: np.ndarray, sample_rate):
-        memory_file = io.BytesIO()
-        sf.write(memory_file, numpy_array, sample_rate, format="WAV")
-        memory_file.seek(0)
-
-        return memory_file
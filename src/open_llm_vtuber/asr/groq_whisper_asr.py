@@ -1,9 +1,8 @@
-import io
-import wave
 import numpy as np
 from loguru import logger
 from groq import Groq
 from .asr_interface import ASRInterface
+from .audio_buffer import AudioBuffer
 
 
 class VoiceRecognition(ASRInterface):
@@ -17,35 +16,20 @@ class VoiceRecognition(ASRInterface):
         self.lang = lang
         self.model = model
 
-    def transcribe_np(self, audio: np.ndarray) -> str:
+    def transcribe_np(self, audio: np.ndarray | AudioBuffer) -> str:
         """Transcribe speech audio in numpy array format and return the transcription.
 
         Args:
-            audio: The numpy array of the audio data to transcribe.
+            audio: The audio data to transcribe, as a numpy array or an AudioBuffer.
         """
 
         logger.info("Transcribing audio (GroqWhisperASR)...")
 
-        # Turn the audio into an audio file
-        # Make sure the audio is in the range [-1, 1]
-        audio = np.clip(audio, -1, 1)
-        # Convert the audio to 16-bit PCM
-        audio_integer = (audio * 32767).astype(np.int16)
+        # groq api requires an audio file, so we send the audio as WAV bytes
+        audio = self.prepare_audio(audio)
 
-        # groq api requires a file-like object for the audio data, so we use a BytesIO object
-        audio_buffer = io.BytesIO()
-
-        with wave.open(audio_buffer, "wb") as wf:
-            wf.setnchannels(self.NUM_CHANNELS)
-            wf.setsampwidth(self.SAMPLE_WIDTH)
-            wf.setframerate(self.SAMPLE_RATE)
-            wf.writeframes(audio_integer.tobytes())
-
-        audio_buffer.seek(0)
-
-        # Transcribe the audio with the BytesIO object
         transcription = self.client.audio.transcriptions.create(
-            file=("audio.wav", audio_buffer.read()),
+            file=("audio.wav", audio.wav_bytes()),
             model=self.model,
             # prompt="Specify context or spelling",
             response_format="text",
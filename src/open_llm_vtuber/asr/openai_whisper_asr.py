@@ -1,9 +1,12 @@
 import numpy as np
 import whisper
 from .asr_interface import ASRInterface
+from .audio_buffer import AudioBuffer
 
 
 class VoiceRecognition(ASRInterface):
+    LOCAL_MODEL = True
+
     def __init__(
         self,
         name: str = "base",
@@ -16,8 +19,9 @@ class VoiceRecognition(ASRInterface):
             download_root=download_root,
         )
 
-    def transcribe_np(self, audio: np.ndarray) -> str:
-        segments = self.model.transcribe(audio)
+    def transcribe_np(self, audio: np.ndarray | AudioBuffer) -> str:
+        audio = self.prepare_audio(audio)
+        segments = self.model.transcribe(audio.float32())
         full_text = ""
         for segment in segments:
             full_text += segment
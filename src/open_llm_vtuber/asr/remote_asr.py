@@ -0,0 +1,39 @@
+import numpy as np
+from loguru import logger
+
+from .asr_interface import ASRInterface
+from .audio_buffer import AudioBuffer
+from ..remote_inference.endpoint_pool import EndpointPool
+from ..remote_inference.protocol import PCM_CONTENT_TYPE, SAMPLE_RATE_HEADER
+
+
+class VoiceRecognition(ASRInterface):
+    """Sends the audio to the ASR engine of remote inference servers
+    (`run_inference_server.py`)."""
+
+    def __init__(self, urls: list[str], health_check_interval: float = 10.0):
+        self.endpoints = EndpointPool(urls, "asr", health_check_interval)
+        logger.info(f"Remote ASR servers: {[e.url for e in self.endpoints.endpoints]}")
+
+    def _request_args(self, audio: np.ndarray | AudioBuffer) -> dict:
+        # sent at its own rate, the server resamples it for its engine
+        audio = AudioBuffer.from_any(audio, self.SAMPLE_RATE)
+        return {
+            "content": audio.pcm16_bytes(),
+            "headers": {
+                "Content-Type": PCM_CONTENT_TYPE,
+                SAMPLE_RATE_HEADER: str(audio.sample_rate),
+            },
+        }
+
+    def transcribe_np(self, audio: np.ndarray | AudioBuffer) -> str:
+        response = self.endpoints.request(
+            "POST", "/asr/transcribe", **self._request_args(audio)
+        )
+        return response.json()["text"]
+
+    async def async_transcribe_np(self, audio: np.ndarray | AudioBuffer) -> str:
+        response = await self.endpoints.arequest(
+            "POST", "/asr/transcribe", **self._request_args(audio)
+        )
+        return response.json()["text"]
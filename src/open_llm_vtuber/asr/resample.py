@@ -0,0 +1,102 @@
+"""
+Sample rate conversion for incoming audio.
+
+Uses soxr if it is installed, and the polyphase filter of scipy otherwise.
+"""
+
+from math import ceil, gcd
+
+import numpy as np
+from scipy.signal import resample_poly
+
+try:
+    import soxr
+except ImportError:
+    soxr = None
+
+
+def resample(audio: np.ndarray, orig_rate: int, target_rate: int) -> np.ndarray:
+    """Resample a whole float32 signal from `orig_rate` to `target_rate`."""
+    audio = np.asarray(audio, dtype=np.float32)
+    if orig_rate == target_rate or len(audio) == 0:
+        return audio
+    if soxr is not None:
+        return soxr.resample(audio, orig_rate, target_rate)
+    g = gcd(orig_rate, target_rate)
+    return resample_poly(audio, target_rate // g, orig_rate // g).astype(
+        np.float32, copy=False
+    )
+
+
+class StreamResampler:
+    """
+    Resamples audio that arrives in chunks, e.g. mic frames.
+
+    Resampling each chunk on its own would leave clicks at the chunk borders,
+    so the scipy fallback keeps enough of the previous input around for the
+    filter and holds back the last few output samples until the next chunk.
+    """
+
+    def __init__(self, orig_rate: int, target_rate: int):
+        self.orig_rate = orig_rate
+        self.target_rate = target_rate
+
+        g = gcd(orig_rate, target_rate)
+        self.up = target_rate // g
+        self.down = orig_rate // g
+
+        self._soxr_stream = None
+        if orig_rate != target_rate and soxr is not None:
+            self._soxr_stream = soxr.ResampleStream(
+                orig_rate, target_rate, 1, dtype="float32"
+            )
+
+        # input samples the filter of resample_poly reaches on each side,
+        # rounded up to a multiple of `down` to stay on the output grid
+        half_len = 10 * max(self.up, self.down) / self.up
+        self.margin = (ceil(half_len / self.down) + 1) * self.down
+
+        # starts with silence, the left context of the first samples
+        self._pending = np.zeros(self.margin, dtype=np.float32)
+        self._samples_in = 0
+        self._samples_out = 0
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        """Feed the next chunk and return the resampled audio that is ready."""
+        chunk = np.asarray(chunk, dtype=np.float32)
+        if self.orig_rate == self.target_rate:
+            return chunk
+        if self._soxr_stream is not None:
+            return self._soxr_stream.resample_chunk(chunk)
+
+        self._samples_in += len(chunk)
+        return self._process_poly(chunk)
+
+    def flush(self) -> np.ndarray:
+        """Return the audio held back at the end of the input. Nothing can be
+        fed afterwards."""
+        if self.orig_rate == self.target_rate:
+            return np.zeros(0, dtype=np.float32)
+        if self._soxr_stream is not None:
+            return self._soxr_stream.resample_chunk(
+                np.zeros(0, dtype=np.float32), last=True
+            )
+
+        missing = round(self._samples_in * self.up / self.down) - self._samples_out
+        tail = self._process_poly(np.zeros(2 * self.margin, dtype=np.float32))
+        return tail[: max(0, missing)]
+
+    def _process_poly(self, chunk: np.ndarray) -> np.ndarray:
+        buffer = np.concatenate([self._pending, chunk])
+        # input samples with a full margin on their right side
+        ready = (len(buffer) - self.margin) // self.down * self.down
+        if ready <= self.margin:
+            self._pending = buffer
+            return np.zeros(0, dtype=np.float32)
+
+        out = resample_poly(buffer[: ready + self.margin], self.up, self.down)
+        out = out[self.margin * self.up // self.down : ready * self.up // self.down]
+        # keep the left context of the next output sample
+        self._pending = buffer[ready - self.margin :]
+        self._samples_out += len(out)
+        return out.astype(np.float32, copy=False)
@@ -1,13 +1,19 @@
 import os
+from typing import List
+
 import numpy as np
 import sherpa_onnx
 from loguru import logger
 from .asr_interface import ASRInterface
+from .audio_buffer import AudioBuffer
+from .batch_scheduler import ASRBatchScheduler
 from .utils import download_and_extract
 import onnxruntime
 
 
 class VoiceRecognition(ASRInterface):
+    LOCAL_MODEL = True
+
     def __init__(
         self,
         model_type: str = "paraformer",  # or "transducer", "nemo_ctc", "wenet_ctc", "whisper", "tdnn_ctc", "sense_voice"
@@ -37,6 +43,8 @@ class VoiceRecognition(ASRInterface):
         feature_dim: int = 80,  # Feature dimension
         use_itn: bool = True,  # Use ITN for SenseVoice models
         provider: str = "cpu",  # Provider for inference (cpu or cuda)
+        max_batch_size: int = 8,  # Maximum number of utterances decoded together
+        batch_window_ms: float = 20,  # Time to wait for more utterances to batch
     ) -> None:
         self.model_type = model_type
         self.encoder = encoder
@@ -82,6 +90,13 @@ class VoiceRecognition(ASRInterface):
 
         self.recognizer = self._create_recognizer()
 
+        # utterances from concurrent sessions are decoded together
+        self.batch_scheduler = None
+        if max_batch_size > 1:
+            self.batch_scheduler = ASRBatchScheduler(
+                self.transcribe_batch_np, max_batch_size, batch_window_ms
+            )
+
     def _create_recognizer(self):
         if self.model_type == "transducer":
             recognizer = sherpa_onnx.OfflineRecognizer.from_transducer(
@@ -187,8 +202,23 @@ class VoiceRecognition(ASRInterface):
 
         return recognizer
 
-    def transcribe_np(self, audio: np.ndarray) -> str:
-        stream = self.recognizer.create_stream()
-        stream.accept_waveform(self.SAMPLE_RATE, audio)
-        self.recognizer.decode_streams([stream])
-        return stream.result.text
+    def transcribe_np(self, audio: np.ndarray | AudioBuffer) -> str:
+        if self.batch_scheduler is not None:
+            # not while a batch is decoded
+            return self.batch_scheduler.transcribe_now(audio)
+        return self.transcribe_batch_np([audio])[0]
+
+    def transcribe_batch_np(self, audios: List[np.ndarray | AudioBuffer]) -> List[str]:
+        streams = []
+        for audio in audios:
+            audio = self.prepare_audio(audio)
+            stream = self.recognizer.create_stream()
+            stream.accept_waveform(audio.sample_rate, audio.float32())
+            streams.append(stream)
+        self.recognizer.decode_streams(streams)
+        return [stream.result.text for stream in streams]
+
+    async def async_transcribe_np(self, audio: np.ndarray | AudioBuffer) -> str:
+        if self.batch_scheduler is None:
+            return await super().async_transcribe_np(audio)
+        return await self.batch_scheduler.transcribe(audio)
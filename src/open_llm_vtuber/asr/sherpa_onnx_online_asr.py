@@ -0,0 +1,152 @@
+import os
+
+import numpy as np
+import sherpa_onnx
+from loguru import logger
+from .asr_interface import ASRInterface, ASRStream
+from .audio_buffer import AudioBuffer
+from .utils import download_and_extract
+import onnxruntime
+
+DEFAULT_MODEL_DIR = (
+    "./models/sherpa-onnx-streaming-zipformer-bilingual-zh-en-2023-02-20"
+)
+
+
+class OnlineStream(ASRStream):
+    # silence appended on finalize, so the model emits the last tokens
+    TAIL_PADDING_SECONDS = 0.66
+
+    def __init__(self, recognizer: sherpa_onnx.OnlineRecognizer, sample_rate: int):
+        self.recognizer = recognizer
+        self.sample_rate = sample_rate
+        self.stream = recognizer.create_stream()
+
+    def _decode(self) -> None:
+        while self.recognizer.is_ready(self.stream):
+            self.recognizer.decode_stream(self.stream)
+
+    def accept_chunk(self, audio: np.ndarray) -> None:
+        self.stream.accept_waveform(self.sample_rate, audio)
+        self._decode()
+
+    def partial_result(self) -> str:
+        return self.recognizer.get_result(self.stream)
+
+    def finalize(self) -> str:
+        tail_padding = np.zeros(
+            int(self.TAIL_PADDING_SECONDS * self.sample_rate), dtype=np.float32
+        )
+        self.stream.accept_waveform(self.sample_rate, tail_padding)
+        self.stream.input_finished()
+        self._decode()
+        return self.recognizer.get_result(self.stream)
+
+
+class VoiceRecognition(ASRInterface):
+    """Streaming ASR with sherpa-onnx OnlineRecognizer models."""
+
+    SUPPORTS_STREAMING = True
+    LOCAL_MODEL = True
+
+    def __init__(
+        self,
+        model_type: str = "transducer",  # or "paraformer", "zipformer2_ctc"
+        encoder: str = None,  # Path to the encoder model, used with transducer and paraformer
+        decoder: str = None,  # Path to the decoder model, used with transducer and paraformer
+        joiner: str = None,  # Path to the joiner model, used with transducer
+        zipformer2_ctc: str = None,  # Path to the model.onnx from Zipformer2 CTC
+        tokens: str = None,  # Path to tokens.txt
+        num_threads: int = 1,  # Number of threads for neural network computation
+        decoding_method: str = "greedy_search",  # Decoding method (greedy_search or modified_beam_search)
+        debug: bool = False,  # Show debug messages
+        sample_rate: int = 16000,  # Sample rate
+        feature_dim: int = 80,  # Feature dimension
+        provider: str = "cpu",  # Provider for inference (cpu or cuda)
+    ) -> None:
+        self.model_type = model_type
+        self.encoder = encoder
+        self.decoder = decoder
+        self.joiner = joiner
+        self.zipformer2_ctc = zipformer2_ctc
+        self.tokens = tokens
+        self.num_threads = num_threads
+        self.decoding_method = decoding_method
+        self.debug = debug
+        self.SAMPLE_RATE = sample_rate
+        self.feature_dim = feature_dim
+
+        self.provider = provider
+        if self.provider == "cuda":
+            if "CUDAExecutionProvider" not in onnxruntime.get_available_providers():
+                logger.warning(
+                    "CUDA provider not available for ONNX. Falling back to CPU."
+                )
+                self.provider = "cpu"
+        logger.info(f"Sherpa-Onnx-Online-ASR: Using {self.provider} for inference")
+
+        self.recognizer = self._create_recognizer()
+
+    def _create_recognizer(self) -> sherpa_onnx.OnlineRecognizer:
+        if self.tokens and not os.path.isfile(self.tokens):
+            if self.tokens.startswith(DEFAULT_MODEL_DIR):
+                logger.warning("Streaming model not found. Downloading the model...")
+                download_and_extract(
+                    url=f"https://github.com/k2-fsa/sherpa-onnx/releases/download/asr-models/{os.path.basename(DEFAULT_MODEL_DIR)}.tar.bz2",
+                    output_dir="./models",
+                )
+            else:
+                logger.critical(
+                    f"The streaming ASR model is missing. Please check the path: {self.tokens}"
+                )
+
+        if self.model_type == "transducer":
+            recognizer = sherpa_onnx.OnlineRecognizer.from_transducer(
+                tokens=self.tokens,
+                encoder=self.encoder,
+                decoder=self.decoder,
+                joiner=self.joiner,
+                num_threads=self.num_threads,
+                sample_rate=self.SAMPLE_RATE,
+                feature_dim=self.feature_dim,
+                decoding_method=self.decoding_method,
+                provider=self.provider,
+                debug=self.debug,
+            )
+        elif self.model_type == "paraformer":
+            recognizer = sherpa_onnx.OnlineRecognizer.from_paraformer(
+                tokens=self.tokens,
+                encoder=self.encoder,
+                decoder=self.decoder,
+                num_threads=self.num_threads,
+                sample_rate=self.SAMPLE_RATE,
+                feature_dim=self.feature_dim,
+                decoding_method=self.decoding_method,
+                provider=self.provider,
+                debug=self.debug,
+            )
+        elif self.model_type == "zipformer2_ctc":
+            recognizer = sherpa_onnx.OnlineRecognizer.from_zipformer2_ctc(
+                tokens=self.tokens,
+                model=self.zipformer2_ctc,
+                num_threads=self.num_threads,
+                sample_rate=self.SAMPLE_RATE,
+                feature_dim=self.feature_dim,
+                decoding_method=self.decoding_method,
+                provider=self.provider,
+                debug=self.debug,
+            )
+        else:
+            raise ValueError(f"Invalid model type: {self.model_type}")
+
+        return recognizer
+
+    def create_stream(self) -> OnlineStream:
+        # sherpa-onnx resamples the 16 kHz mic audio to the model rate itself
+        return OnlineStream(self.recognizer, ASRInterface.SAMPLE_RATE)
+
+    def transcribe_np(self, audio: np.ndarray | AudioBuffer) -> str:
+        audio = self.prepare_audio(audio)
+        stream = OnlineStream(self.recognizer, audio.sample_rate)
+        stream.accept_chunk(audio.float32())
+        return stream.finalize()
@@ -3,9 +3,12 @@ from pywhispercpp.model import Model
 import numpy as np
 from loguru import logger
 from .asr_interface import ASRInterface
+from .audio_buffer import AudioBuffer
 
 
 class VoiceRecognition(ASRInterface):
+    LOCAL_MODEL = True
+
     def __init__(
         self,
         model_name: str = "base",
@@ -24,8 +27,11 @@ class VoiceRecognition(ASRInterface):
             **kwargs,
         )
 
-    def transcribe_np(self, audio: np.ndarray) -> str:
-        segments = self.model.transcribe(audio, new_segment_callback=logger.info)
+    def transcribe_np(self, audio: np.ndarray | AudioBuffer) -> str:
+        audio = self.prepare_audio(audio)
+        segments = self.model.transcribe(
+            audio.float32(), new_segment_callback=logger.info
+        )
         full_text = ""
         for segment in segments:
             full_text += segment.text
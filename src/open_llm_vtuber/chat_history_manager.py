@@ -2,8 +2,10 @@ import os
 import re
 import json
 import uuid
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from typing import Literal, List, TypedDict
+from typing import Literal, List, Optional, Tuple, TypedDict
 from loguru import logger
 
 
@@ -13,6 +15,22 @@ class HistoryMessage(TypedDict):
     content: str
 
 
+class HistoryPage(TypedDict):
+    messages: List[HistoryMessage]
+    # pass as `before` to get the previous page, None on the first page
+    cursor: Optional[int]
+
+
+# Parsed history files, reused until the file changes on disk. Reopening a
+# conversation reads it for the agent memory and for the client; this way
+# the file is only parsed once.
+_HISTORY_CACHE_SIZE = 16
+_history_cache: "OrderedDict[str, Tuple[Tuple[int, int], List[HistoryMessage]]]" = (
+    OrderedDict()
+)
+_history_cache_lock = threading.Lock()
+
+
 def _is_safe_filename(filename: str) -> bool:
     """Validate filename for safety and allowed characters"""
     if not filename or len(filename) > 255:
@@ -182,8 +200,34 @@ def update_metadate(conf_uid: str, history_uid: str, metadata: dict) -> bool:
     return False
 
 
-def get_history(conf_uid: str, history_uid: str) -> List[HistoryMessage]:
-    """Read chat history for the given conf_uid and history_uid"""
+def _read_history_messages(filepath: str) -> List[HistoryMessage]:
+    """Messages of a history file without the metadata.
+
+    The result is cached until the modification time or size of the file
+    changes. It is shared between callers and must not be modified.
+    """
+    stat = os.stat(filepath)
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _history_cache_lock:
+        cached = _history_cache.get(filepath)
+        if cached is not None and cached[0] == version:
+            _history_cache.move_to_end(filepath)
+            return cached[1]
+
+    with open(filepath, "r", encoding="utf-8") as f:
+        history_data = json.load(f)
+    messages = [msg for msg in history_data if msg["role"] != "metadata"]
+
+    with _history_cache_lock:
+        _history_cache[filepath] = (version, messages)
+        _history_cache.move_to_end(filepath)
+        while len(_history_cache) > _HISTORY_CACHE_SIZE:
+            _history_cache.popitem(last=False)
+    return messages
+
+
+def _load_history_messages(conf_uid: str, history_uid: str) -> List[HistoryMessage]:
+    """Cached messages of a history, or an empty list if it can't be read"""
     if not conf_uid or not history_uid:
         if not conf_uid:
             logger.warning("Missing conf_uid")
@@ -198,14 +242,69 @@ def get_history(conf_uid: str, history_uid: str) -> List[HistoryMessage]:
         return []
 
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            history_data = json.load(f)
-            # Filter out metadata
-            return [msg for msg in history_data if msg["role"] != "metadata"]
+        return _read_history_messages(filepath)
     except Exception:
         return []
 
 
+def get_history(conf_uid: str, history_uid: str) -> List[HistoryMessage]:
+    """Read chat history for the given conf_uid and history_uid"""
+    return list(_load_history_messages(conf_uid, history_uid))
+
+
+def get_history_page(
+    conf_uid: str, history_uid: str, before: Optional[int] = None, limit: int = 50
+) -> HistoryPage:
+    """Read one page of a chat history, newest messages first.
+
+    Args:
+        conf_uid: The conf the history belongs to.
+        history_uid: The history to read.
+        before: Cursor returned with the previous page, None for the latest page.
+        limit: Maximum number of messages in the page.
+
+    Returns:
+        HistoryPage: The messages of the page in chronological order, without
+        system messages, and the cursor of the page before it.
+    """
+    messages = _load_history_messages(conf_uid, history_uid)
+    end = len(messages) if before is None else max(0, min(before, len(messages)))
+    start = max(0, end - max(1, limit))
+    return {
+        "messages": [msg for msg in messages[start:end] if msg["role"] != "system"],
+        "cursor": start if start > 0 else None,
+    }
+
+
+def get_history_tail(
+    conf_uid: str, history_uid: str, max_chars: int = 0
+) -> List[HistoryMessage]:
+    """Read the latest messages of a chat history that fit in a budget.
+
+    Args:
+        conf_uid: The conf the history belongs to.
+        history_uid: The history to read.
+        max_chars: Maximum total length of the message contents. The latest
+            message is always included. 0 reads the whole history.
+
+    A history file is a single JSON document, so the first read of a history
+    still parses all of it. Later reads use the cache of `_read_history_messages`
+    and only copy the tail.
+    """
+    messages = _load_history_messages(conf_uid, history_uid)
+    if max_chars <= 0:
+        return list(messages)
+
+    start = len(messages)
+    total = 0
+    while start > 0:
+        total += len(messages[start - 1].get("content") or "")
+        if total > max_chars and start < len(messages):
+            break
+        start -= 1
+    return messages[start:]
+
+
 def delete_history(conf_uid: str, history_uid: str) -> bool:
     """Delete a specific history file"""
     if not conf_uid or not history_uid:
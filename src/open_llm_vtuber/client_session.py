@@ -0,0 +1,467 @@
+"""
+The state and message handlers of one `/client-ws` connection.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Union
+
+import numpy as np
+from fastapi import WebSocket
+from loguru import logger
+from starlette.websockets import WebSocketDisconnect
+
+from .conversation import conversation_chain
+from .service_context import ServiceContext
+from .asr.asr_interface import ASRInterface, ASRStream
+from .asr.resample import StreamResampler
+from .speculative_turn import TurnSpeculator
+from .utils import serializer
+from .utils.websocket_sender import WebSocketSender
+from .utils.ws_compression import CompressionPolicy
+from .config_manager.catalog import config_catalog
+from .chat_history_manager import (
+    create_new_history,
+    store_message,
+    modify_latest_message,
+    get_history,
+    get_history_page,
+    delete_history,
+    get_history_list,
+)
+from .websocket_messages import (
+    DeleteHistoryMessage,
+    FetchAndSetHistoryMessage,
+    FetchHistoryPageMessage,
+    IncomingMessage,
+    InterruptSignalMessage,
+    MicAudioDataMessage,
+    SwitchConfigMessage,
+)
+
+# messages per history-page message
+HISTORY_PAGE_SIZE = 50
+MAX_HISTORY_PAGE_SIZE = 500
+
+
+class ClientSession:
+    """
+    Handles the messages of one connected client.
+
+    Each message type has its own handler in `self.handlers`, looked up by the
+    `type` field of the message.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        default_context_cache: ServiceContext,
+        codec: serializer.Codec = serializer.JSON_CODEC,
+        compression: CompressionPolicy | None = None,
+    ):
+        self.websocket = websocket
+        self.codec = codec
+        # messages are queued, so a slow client never holds up the conversation
+        self.sender = WebSocketSender(
+            websocket,
+            max_queue_size=default_context_cache.system_config.websocket.send_queue_size,
+            codec=codec,
+            compression=compression,
+        )
+
+        self.service_context: ServiceContext = ServiceContext()
+        self.service_context.load_cache(
+            config=default_context_cache.config,
+            system_config=default_context_cache.system_config,
+            character_config=default_context_cache.character_config,
+            live2d_model=default_context_cache.live2d_model,
+            asr_engine=default_context_cache.asr_engine,
+            tts_engine=default_context_cache.tts_engine,
+            llm_engine=default_context_cache.llm_engine,
+            translate_engine=default_context_cache.translate_engine,
+            system_prompt=default_context_cache.system_prompt,
+        )
+
+        self.current_history_uid: str | None = None
+        self.current_conversation_task: asyncio.Task | None = None
+        self.received_data_buffer = np.array([])
+        # streaming ASR state of the utterance in progress
+        self.asr_stream: ASRStream | None = None
+        self.last_partial_text = ""
+        # converts the mic audio to 16 kHz if the client sends another rate
+        self.mic_resampler: StreamResampler | None = None
+        # starts the agent early on the interim transcript, if enabled
+        speculation_config = self.service_context.system_config.speculative_turn
+        self.speculator = (
+            TurnSpeculator(
+                self.service_context,
+                transcribe_interval_ms=speculation_config.transcribe_interval_ms,
+                stable_ms=speculation_config.stable_ms,
+            )
+            if speculation_config.enabled
+            else None
+        )
+
+        self.handlers: Dict[str, Callable[[IncomingMessage], Awaitable[None]]] = {
+            # chat history
+            "fetch-history-list": self.handle_fetch_history_list,
+            "fetch-and-set-history": self.handle_fetch_and_set_history,
+            "fetch-history-page": self.handle_fetch_history_page,
+            "create-new-history": self.handle_create_new_history,
+            "delete-history": self.handle_delete_history,
+            # conversation
+            "interrupt-signal": self.handle_interrupt_signal,
+            "mic-audio-data": self.handle_mic_audio_data,
+            "mic-audio-end": self.handle_conversation_trigger,
+            "text-input": self.handle_conversation_trigger,
+            "ai-speak-signal": self.handle_conversation_trigger,
+            # configs and backgrounds
+            "fetch-configs": self.handle_fetch_configs,
+            "switch-config": self.handle_switch_config,
+            "fetch-backgrounds": self.handle_fetch_backgrounds,
+        }
+
+    @property
+    def conf_uid(self) -> str:
+        return self.service_context.character_config.conf_uid
+
+    async def start(self) -> None:
+        """Send the initial messages to a new client."""
+        await self.sender.send({"type": "full-text", "text": "Connection established"})
+        logger.info("Connection established")
+        await self.sender.send(
+            {
+                "type": "set-model-and-conf",
+                "model_info": self.service_context.live2d_model.model_info,
+                "conf_name": self.service_context.character_config.conf_name,
+                "conf_uid": self.conf_uid,
+            }
+        )
+        # start mic
+        await self.sender.send({"type": "control", "text": "start-mic"})
+
+    async def receive_loop(self) -> None:
+        """Handle messages until the client disconnects."""
+        while True:
+            message = await self.websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            # MessagePack clients send binary frames, JSON clients text frames
+            if message.get("bytes") is not None:
+                data: IncomingMessage = self.codec.loads(message["bytes"])
+            else:
+                data = serializer.loads(message["text"])
+            handler = self.handlers.get(data.get("type"))
+            if handler is None:
+                logger.info("Unknown data type received.")
+                continue
+            await handler(data)
+
+    async def close(self) -> None:
+        """Release the session's engines and stop sending."""
+        if self.speculator is not None:
+            self.speculator.reset()
+        self.service_context.close()
+        await self.sender.aclose()
+
+    async def start_conversation(
+        self,
+        user_input: Union[str, np.ndarray, ASRStream],
+        images: list | None = None,
+    ) -> None:
+        """
+        Initiate conversation chain task asynchronously.
+        We'll store the task object so we can cancel it if needed.
+        We'll NOT await the task here, so we can continue to receive messages.
+        A conversation that is still running (e.g. the user started talking
+        again, detected by the server VAD) is interrupted and waited for first,
+        so its conversation-chain-end reaches the client before the new start.
+        """
+        task = self.current_conversation_task
+        if task is not None and not task.done():
+            await self.interrupt_conversation(None)
+        speculative_turn = None
+        if self.speculator is not None:
+            if isinstance(user_input, str):
+                self.speculator.reset()
+            else:
+                speculative_turn = self.speculator.take_turn()
+        self.current_conversation_task = asyncio.create_task(
+            conversation_chain(
+                user_input=user_input,
+                asr_engine=self.service_context.asr_engine,
+                tts_engine=self.service_context.tts_engine,
+                agent_engine=self.service_context.agent_engine,
+                live2d_model=self.service_context.live2d_model,
+                websocket_send=self.sender.send,
+                conf_uid=self.conf_uid,
+                history_uid=self.current_history_uid,
+                images=images,
+                speculative_turn=speculative_turn,
+            )
+        )
+
+    # ==== chat history related
+
+    async def send_history_page(self, history_uid: str, before, page_size) -> None:
+        """Send one page of a history, ending at the `before` cursor."""
+        try:
+            before = None if before is None else int(before)
+            page_size = int(page_size or HISTORY_PAGE_SIZE)
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid history page request: {before}, {page_size}")
+            return
+        page = await asyncio.to_thread(
+            get_history_page,
+            self.conf_uid,
+            history_uid,
+            before,
+            min(max(page_size, 1), MAX_HISTORY_PAGE_SIZE),
+        )
+        await self.sender.send(
+            {"type": "history-page", "history_uid": history_uid, **page}
+        )
+
+    async def handle_fetch_history_list(self, data: IncomingMessage) -> None:
+        histories = get_history_list(self.conf_uid)
+        await self.sender.send({"type": "history-list", "histories": histories})
+
+    async def handle_fetch_and_set_history(
+        self, data: FetchAndSetHistoryMessage
+    ) -> None:
+        history_uid = data.get("history_uid")
+        if not history_uid:
+            return
+        self.current_history_uid = history_uid
+        # the history file is parsed off the event loop, then the agent
+        # memory is replaced on the loop (from the cached messages), never
+        # from another thread while a conversation is using it
+        history = await asyncio.to_thread(get_history, self.conf_uid, history_uid)
+        self.service_context.agent_engine.set_memory_from_history(
+            conf_uid=self.conf_uid,
+            history_uid=history_uid,
+        )
+        page_size = data.get("page_size")
+        if page_size:
+            # clients that page only get the latest messages, and ask for
+            # older ones with fetch-history-page
+            await self.send_history_page(history_uid, None, page_size)
+        else:
+            messages = [msg for msg in history if msg["role"] != "system"]
+            await self.sender.send({"type": "history-data", "messages": messages})
+
+    async def handle_fetch_history_page(self, data: FetchHistoryPageMessage) -> None:
+        history_uid = data.get("history_uid") or self.current_history_uid
+        if history_uid:
+            await self.send_history_page(
+                history_uid, data.get("before"), data.get("page_size")
+            )
+
+    async def handle_create_new_history(self, data: IncomingMessage) -> None:
+        self.current_history_uid = create_new_history(self.conf_uid)
+        self.service_context.agent_engine.set_memory_from_history(
+            conf_uid=self.conf_uid,
+            history_uid=self.current_history_uid,
+        )
+        await self.sender.send(
+            {
+                "type": "new-history-created",
+                "history_uid": self.current_history_uid,
+            }
+        )
+
+    async def handle_delete_history(self, data: DeleteHistoryMessage) -> None:
+        history_uid = data.get("history_uid")
+        if not history_uid:
+            return
+        success = delete_history(self.conf_uid, history_uid)
+        await self.sender.send(
+            {
+                "type": "history-deleted",
+                "success": success,
+                "history_uid": history_uid,
+            }
+        )
+        if history_uid == self.current_history_uid:
+            self.current_history_uid = None
+
+    # ==== conversation related
+
+    async def handle_interrupt_signal(self, data: InterruptSignalMessage) -> None:
+        # The part of the AI response heard by the user before interruption
+        # is sent back from the frontend as an interruption signal
+        # We'll store this in chat history instead of the full response
+        await self.interrupt_conversation(data.get("text", ""))
+
+    async def interrupt_conversation(self, heard_ai_response: str | None) -> None:
+        """
+        Cancel the running conversation, wait until it has stored its response
+        and ended, then record the interruption.
+
+        heard_ai_response: the part of the AI response heard by the user, or
+            None if it is unknown, in which case the stored response is kept.
+        """
+        if self.current_conversation_task is None:
+            logger.warning(
+                "❌ Conversation task was NOT cancelled because there is no running conversation."
+            )
+        else:
+            task, self.current_conversation_task = self.current_conversation_task, None
+            # Cancelling the task... and see if it was a success
+            if not task.cancel():
+                logger.warning(
+                    "❌ Conversation task was NOT cancelled for some reason."
+                )
+            else:
+                logger.info("🛑 Conversation task was succesfully interrupted.")
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                logger.error(f"Error in the interrupted conversation: {e}")
+
+        if heard_ai_response is not None:
+            try:
+                self.service_context.agent_engine.handle_interrupt(heard_ai_response)
+            except Exception as e:
+                logger.error(f"Error handling interrupt: {e}")
+
+            if not modify_latest_message(
+                conf_uid=self.conf_uid,
+                history_uid=self.current_history_uid,
+                role="ai",
+                new_content=heard_ai_response,
+            ):
+                logger.warning("Failed to modify message.")
+            logger.info(f"💾 Stored Paritial AI message: '''{heard_ai_response}'''")
+
+        store_message(
+            conf_uid=self.conf_uid,
+            history_uid=self.current_history_uid,
+            role="system",
+            content="[Interrupted by user]",
+        )
+
+    # Default sampleRate = 16000, frameSamples = 512, buffer window = 32ms
+    async def handle_mic_audio_data(self, data: MicAudioDataMessage) -> None:
+        audio = data.get("audio")
+        if isinstance(audio, bytes):
+            # MessagePack clients may send the samples as float32 bytes
+            audio = np.frombuffer(audio, dtype="<f4").astype(np.float32)
+        else:
+            audio = np.array(audio, dtype=np.float32)
+        # clients may send their native rate (e.g. 48 kHz) instead of
+        # resampling in the browser
+        sample_rate = int(data.get("sample_rate") or ASRInterface.SAMPLE_RATE)
+        if sample_rate != ASRInterface.SAMPLE_RATE:
+            if (
+                self.mic_resampler is None
+                or self.mic_resampler.orig_rate != sample_rate
+            ):
+                self.mic_resampler = StreamResampler(
+                    sample_rate, ASRInterface.SAMPLE_RATE
+                )
+            audio = self.mic_resampler.process(audio)
+        asr_engine = self.service_context.asr_engine
+        vad_engine = self.service_context.vad_engine
+
+        if asr_engine.SUPPORTS_STREAMING:
+            # transcribe while the user speaks and show the partial text
+            if self.asr_stream is None:
+                self.asr_stream = asr_engine.create_stream()
+                self.last_partial_text = ""
+            await asyncio.to_thread(self.asr_stream.accept_chunk, audio)
+            partial_text = self.asr_stream.partial_result()
+            if partial_text != self.last_partial_text:
+                self.last_partial_text = partial_text
+                await self.sender.send(
+                    {"type": "user-input-partial", "text": partial_text}
+                )
+            if self.speculator is not None:
+                self.speculator.on_partial_text(partial_text)
+        elif vad_engine is None:
+            self.received_data_buffer = np.append(self.received_data_buffer, audio)
+            if self.speculator is not None:
+                self.speculator.on_audio(self.received_data_buffer)
+
+        if vad_engine is not None:
+            # server-side VAD: start a conversation as soon as the user stops
+            # talking, with only the speech sent to the ASR
+            for speech in vad_engine.detect_speech(audio):
+                logger.debug(
+                    f"VAD: end of speech ({len(speech) / vad_engine.SAMPLE_RATE:.2f}s)"
+                )
+                await self.sender.send({"type": "full-text", "text": "Thinking..."})
+                # the stream holds everything since the last utterance
+                user_input = self.asr_stream if self.asr_stream is not None else speech
+                self.asr_stream = None
+                await self.start_conversation(user_input)
+
+    async def handle_conversation_trigger(self, data: IncomingMessage) -> None:
+        """Start a conversation on mic-audio-end, text-input or ai-speak-signal."""
+        message_type = data.get("type")
+        vad_engine = self.service_context.vad_engine
+        if message_type == "mic-audio-end":
+            self.mic_resampler = None
+        if message_type == "mic-audio-end" and vad_engine is not None:
+            # the server VAD already handled the utterances that ended, only
+            # the speech still in progress is left
+            speech = vad_engine.flush()
+            if not speech:
+                logger.debug("VAD: mic-audio-end without pending speech.")
+                self.asr_stream = None
+                if self.speculator is not None:
+                    self.speculator.reset()
+                return
+            self.received_data_buffer = np.concatenate(speech)
+
+        await self.sender.send({"type": "full-text", "text": "Thinking..."})
+
+        if message_type == "ai-speak-signal":
+            user_input = ""
+            await self.sender.send(
+                {
+                    "type": "full-text",
+                    "text": "AI wants to speak something...",
+                }
+            )
+        elif message_type == "text-input":
+            user_input = data.get("text")
+        elif self.asr_stream is not None:
+            user_input = self.asr_stream
+        else:
+            user_input = self.received_data_buffer
+
+        self.received_data_buffer = np.array([])
+        self.asr_stream = None
+
+        # Get images if present
+        images = data.get("images")
+
+        logger.debug(f"data: {data}")
+
+        await self.start_conversation(user_input, images)
+
+    # ==== configs and backgrounds
+
+    async def handle_fetch_configs(self, data: IncomingMessage) -> None:
+        # the catalog only parses the config files that changed
+        config_files = await asyncio.to_thread(
+            config_catalog.config_files,
+            self.service_context.system_config.config_alts_dir,
+        )
+        await self.sender.send({"type": "config-files", "configs": config_files})
+
+    async def handle_switch_config(self, data: SwitchConfigMessage) -> None:
+        config_file_name: str = data.get("file")
+        if not config_file_name:
+            return
+        # the stream belongs to the ASR engine that may be replaced
+        self.asr_stream = None
+        if self.speculator is not None:
+            self.speculator.reset()
+        await self.service_context.handle_config_switch(self.sender, config_file_name)
+
+    async def handle_fetch_backgrounds(self, data: IncomingMessage) -> None:
+        bg_files = await asyncio.to_thread(config_catalog.background_files)
+        await self.sender.send({"type": "background-files", "files": bg_files})
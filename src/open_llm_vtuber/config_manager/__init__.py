@@ -7,12 +7,21 @@ and utility functions for loading/saving configurations.
 
 # Import main configuration classes
 from .main import Config
-from .system import SystemConfig
+from .system import (
+    SystemConfig,
+    HTTPClientConfig,
+    EngineCacheConfig,
+    ProcessPoolConfig,
+    SpeculativeTurnConfig,
+    WebSocketConfig,
+    StaticFilesConfig,
+)
 from .character import CharacterConfig
 from .stateless_llm import (
     OpenAICompatibleConfig,
     ClaudeConfig,
     LlamaCppConfig,
+    RemoteLLMConfig,
 )
 from .asr import (
     ASRConfig,
@@ -22,7 +31,9 @@ from .asr import (
     WhisperConfig,
     FunASRConfig,
     SherpaOnnxASRConfig,
+    SherpaOnnxOnlineASRConfig,
     GroqWhisperASRConfig,
+    RemoteASRConfig,
 )
 from .tts import (
     TTSConfig,
@@ -36,8 +47,10 @@ from .tts import (
     GPTSoVITSConfig,
     FishAPITTSConfig,
     SherpaOnnxTTSConfig,
+    RemoteTTSConfig,
 )
 from .tts_preprocessor import TTSPreprocessorConfig, TranslatorConfig, DeepLXConfig
+from .vad import VADConfig, SileroVADConfig
 from .i18n import I18nMixin, Description, MultiLingualString
 from .agent import (
     AgentConfig,
@@ -57,17 +70,27 @@ from .utils import (
     save_config,
     scan_config_alts_directory,
     scan_bg_directory,
+    deep_merge,
+    diff_configs,
 )
+from .catalog import ConfigCatalog, config_catalog
 
 __all__ = [
     # Main configuration classes
     "Config",
     "SystemConfig",
+    "HTTPClientConfig",
+    "EngineCacheConfig",
+    "ProcessPoolConfig",
+    "SpeculativeTurnConfig",
+    "WebSocketConfig",
+    "StaticFilesConfig",
     "CharacterConfig",
     # LLM related classes
     "OpenAICompatibleConfig",
     "ClaudeConfig",
     "LlamaCppConfig",
+    "RemoteLLMConfig",
     # Agent related classes
     "AgentConfig",
     "AgentSettings",
@@ -85,7 +108,9 @@ __all__ = [
     "WhisperConfig",
     "FunASRConfig",
     "SherpaOnnxASRConfig",
+    "SherpaOnnxOnlineASRConfig",
     "GroqWhisperASRConfig",
+    "RemoteASRConfig",
     # TTS related classes
     "TTSConfig",
     "AzureTTSConfig",
@@ -98,10 +123,14 @@ __all__ = [
     "GPTSoVITSConfig",
     "FishAPITTSConfig",
     "SherpaOnnxTTSConfig",
+    "RemoteTTSConfig",
     # TTS preprocessor related classes
     "TTSPreprocessorConfig",
     "TranslatorConfig",
     "DeepLXConfig",
+    # VAD related classes
+    "VADConfig",
+    "SileroVADConfig",
     # i18n related classes
     "I18nMixin",
     "Description",
@@ -112,4 +141,8 @@ __all__ = [
     "save_config",
     "scan_config_alts_directory",
     "scan_bg_directory",
+    "deep_merge",
+    "diff_configs",
+    "ConfigCatalog",
+    "config_catalog",
 ]
@@ -25,10 +25,12 @@ class BasicMemoryAgentConfig(I18nMixin, BaseModel):
         "deepseek_llm",
         "groq_llm",
         "mistral_llm",
+        "remote_llm",
     ] = Field(..., alias="llm_provider")
 
     faster_first_response: Optional[bool] = Field(True, alias="faster_first_response")
     segment_method: Literal["regex", "pysbd"] = Field("pysbd", alias="segment_method")
+    memory_restore_chars: int = Field(24000, alias="memory_restore_chars")
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "llm_provider": Description(
             en="LLM provider to use for this agent",
@@ -42,6 +44,10 @@ class BasicMemoryAgentConfig(I18nMixin, BaseModel):
             en="Method for segmenting sentences: 'regex' or 'pysbd' (default: 'pysbd')",
             zh="分割句子的方法：'regex' 或 'pysbd'（默认：'pysbd'）",
         ),
+        "memory_restore_chars": Description(
+            en="When reopening a conversation, only its latest messages up to this many characters are loaded into the agent memory (0 loads all, default: 24000)",
+            zh="重新打开对话时，只将最近的、总长度不超过此字符数的消息加载到智能体记忆中（0 表示全部加载，默认：24000）",
+        ),
     }
 
 
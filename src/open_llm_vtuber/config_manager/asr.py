@@ -1,6 +1,6 @@
 # config_manager/asr.py
 from pydantic import ValidationInfo, Field, model_validator
-from typing import Literal, Optional, Dict, ClassVar
+from typing import Literal, Optional, Dict, ClassVar, List
 from .i18n import I18nMixin, Description
 
 
@@ -104,6 +104,7 @@ class FunASRConfig(I18nMixin):
     hub: Literal["ms", "hf"] = Field("ms", alias="hub")
     use_itn: bool = Field(False, alias="use_itn")
     language: Literal["auto", "zh", "en"] = Field("auto", alias="language")
+    sample_rate: int = Field(16000, alias="sample_rate")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "model_name": Description(en="Name of the FunASR model", zh="FunASR 模型名称"),
@@ -132,6 +133,10 @@ class FunASRConfig(I18nMixin):
         "language": Description(
             en="Language code (zh, en, or auto)", zh="语言代码（zh、en 或 auto）"
         ),
+        "sample_rate": Description(
+            en="Sample rate the audio is handed to the model at",
+            zh="传给模型的音频采样率",
+        ),
     }
 
 
@@ -185,6 +190,8 @@ class SherpaOnnxASRConfig(I18nMixin):
     num_threads: int = Field(4, alias="num_threads")
     use_itn: bool = Field(True, alias="use_itn")
     provider: Literal["cpu", "cuda"] = Field("cpu", alias="provider")
+    max_batch_size: int = Field(8, alias="max_batch_size")
+    batch_window_ms: float = Field(20, alias="batch_window_ms")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "model_type": Description(
@@ -226,6 +233,14 @@ class SherpaOnnxASRConfig(I18nMixin):
             en="Provider for inference (cpu or cuda) (cuda option needs additional settings. Please check our docs)",
             zh="推理平台（cpu 或 cuda）(cuda 需要额外配置，请参考文档)",
         ),
+        "max_batch_size": Description(
+            en="Maximum number of utterances decoded together (1 to disable batching)",
+            zh="一起识别的最大语音条数（1 表示关闭批处理）",
+        ),
+        "batch_window_ms": Description(
+            en="Milliseconds to wait for more utterances before decoding a batch",
+            zh="识别一批语音前等待更多语音的毫秒数",
+        ),
     }
 
     @model_validator(mode="after")
@@ -271,6 +286,93 @@ class SherpaOnnxASRConfig(I18nMixin):
         return values
 
 
+class SherpaOnnxOnlineASRConfig(I18nMixin):
+    """Configuration for streaming Sherpa Onnx ASR."""
+
+    model_type: Literal["transducer", "paraformer", "zipformer2_ctc"] = Field(
+        ..., alias="model_type"
+    )
+    encoder: Optional[str] = Field(None, alias="encoder")
+    decoder: Optional[str] = Field(None, alias="decoder")
+    joiner: Optional[str] = Field(None, alias="joiner")
+    zipformer2_ctc: Optional[str] = Field(None, alias="zipformer2_ctc")
+    tokens: str = Field(..., alias="tokens")
+    num_threads: int = Field(4, alias="num_threads")
+    decoding_method: Literal["greedy_search", "modified_beam_search"] = Field(
+        "greedy_search", alias="decoding_method"
+    )
+    provider: Literal["cpu", "cuda"] = Field("cpu", alias="provider")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "model_type": Description(
+            en="Type of streaming ASR model to use", zh="要使用的流式 ASR 模型类型"
+        ),
+        "encoder": Description(
+            en="Path to encoder model (for transducer and paraformer)",
+            zh="编码器模型路径（用于 transducer 和 paraformer）",
+        ),
+        "decoder": Description(
+            en="Path to decoder model (for transducer and paraformer)",
+            zh="解码器模型路径（用于 transducer 和 paraformer）",
+        ),
+        "joiner": Description(
+            en="Path to joiner model (for transducer)",
+            zh="连接器模型路径（用于 transducer）",
+        ),
+        "zipformer2_ctc": Description(
+            en="Path to Zipformer2 CTC model", zh="Zipformer2 CTC 模型路径"
+        ),
+        "tokens": Description(en="Path to tokens file", zh="词元文件路径"),
+        "num_threads": Description(en="Number of threads to use", zh="使用的线程数"),
+        "decoding_method": Description(en="Decoding method", zh="解码方法"),
+        "provider": Description(
+            en="Provider for inference (cpu or cuda)", zh="推理平台（cpu 或 cuda）"
+        ),
+    }
+
+    @model_validator(mode="after")
+    def check_model_paths(
+        cls, values: "SherpaOnnxOnlineASRConfig", info: ValidationInfo
+    ):
+        model_type = values.model_type
+
+        if model_type == "transducer":
+            if not all([values.encoder, values.decoder, values.joiner]):
+                raise ValueError(
+                    "encoder, decoder and joiner must be provided for transducer model type"
+                )
+        elif model_type == "paraformer":
+            if not all([values.encoder, values.decoder]):
+                raise ValueError(
+                    "encoder and decoder must be provided for paraformer model type"
+                )
+        elif model_type == "zipformer2_ctc":
+            if not values.zipformer2_ctc:
+                raise ValueError(
+                    "zipformer2_ctc must be provided for zipformer2_ctc model type"
+                )
+
+        return values
+
+
+class RemoteASRConfig(I18nMixin):
+    """Configuration for ASR on remote inference servers."""
+
+    urls: List[str] = Field(..., alias="urls")
+    health_check_interval: float = Field(10.0, alias="health_check_interval")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "urls": Description(
+            en="Base URLs of the inference servers running the ASR (run_inference_server.py)",
+            zh="运行ASR的推理服务器地址列表（run_inference_server.py）",
+        ),
+        "health_check_interval": Description(
+            en="Seconds between health checks of the servers (0 to disable)",
+            zh="服务器健康检查的间隔秒数（0 表示关闭）",
+        ),
+    }
+
+
 class ASRConfig(I18nMixin):
     """Configuration for Automatic Speech Recognition."""
 
@@ -282,6 +384,8 @@ class ASRConfig(I18nMixin):
         "fun_asr",
         "groq_whisper_asr",
         "sherpa_onnx_asr",
+        "sherpa_onnx_online_asr",
+        "remote_asr",
     ] = Field(..., alias="asr_model")
     azure_asr: Optional[AzureASRConfig] = Field(None, alias="azure_asr")
     faster_whisper: Optional[FasterWhisperConfig] = Field(None, alias="faster_whisper")
@@ -294,6 +398,10 @@ class ASRConfig(I18nMixin):
     sherpa_onnx_asr: Optional[SherpaOnnxASRConfig] = Field(
         None, alias="sherpa_onnx_asr"
     )
+    sherpa_onnx_online_asr: Optional[SherpaOnnxOnlineASRConfig] = Field(
+        None, alias="sherpa_onnx_online_asr"
+    )
+    remote_asr: Optional[RemoteASRConfig] = Field(None, alias="remote_asr")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "asr_model": Description(
@@ -314,6 +422,14 @@ class ASRConfig(I18nMixin):
         "sherpa_onnx_asr": Description(
             en="Configuration for Sherpa Onnx ASR", zh="Sherpa Onnx ASR 配置"
         ),
+        "sherpa_onnx_online_asr": Description(
+            en="Configuration for streaming Sherpa Onnx ASR",
+            zh="流式 Sherpa Onnx ASR 配置",
+        ),
+        "remote_asr": Description(
+            en="Configuration for ASR on remote inference servers",
+            zh="远程推理服务器 ASR 配置",
+        ),
     }
 
     @model_validator(mode="after")
@@ -0,0 +1,137 @@
+# config_manager/catalog.py
+"""
+Config files and backgrounds, shared by all client sessions.
+
+Opening the settings menu sends fetch-configs and fetch-backgrounds. Instead of
+parsing every config file for each of them, a listing is reused for `ttl`
+seconds, and rebuilding it only parses the config files whose modification
+time or size changed since they were last read.
+
+Config switches get the validated `CharacterConfig` of a file from here as
+well, so switching back and forth between characters validates each of them
+once, until their file (or conf.yaml) changes.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Tuple
+
+from .character import CharacterConfig
+from .utils import (
+    deep_merge,
+    read_yaml,
+    scan_bg_directory,
+    scan_config_alts_directory,
+)
+
+BASE_CONFIG = "conf.yaml"
+
+
+class ConfigCatalog:
+    def __init__(self, ttl: float = 2.0):
+        """
+        Args:
+            ttl (float): Seconds a listing is reused before the directories
+                are scanned again.
+        """
+        self.ttl = ttl
+        # path -> (mtime_ns, size, parsed config)
+        self._configs: Dict[str, Tuple[int, int, Dict[str, Any]]] = {}
+        # path -> (file versions it was built from, validated character config)
+        self._characters: Dict[str, Tuple[Tuple, CharacterConfig]] = {}
+        # listing key -> (time of the scan, listing)
+        self._listings: Dict[Tuple[str, str], Tuple[float, list]] = {}
+        self._lock = threading.Lock()
+
+    def read_config(self, config_path: str) -> Dict[str, Any]:
+        """`read_yaml`, reusing the result while the file is unchanged."""
+        stat_result = os.stat(config_path)
+        key = (stat_result.st_mtime_ns, stat_result.st_size)
+        with self._lock:
+            cached = self._configs.get(config_path)
+        if cached is not None and cached[:2] == key:
+            return cached[2]
+        config = read_yaml(config_path)
+        with self._lock:
+            self._configs[config_path] = (*key, config)
+        return config
+
+    @staticmethod
+    def _file_version(config_path: str) -> Tuple[int, int]:
+        stat_result = os.stat(config_path)
+        return stat_result.st_mtime_ns, stat_result.st_size
+
+    def character_config(
+        self, config_file_name: str, config_alts_dir: str
+    ) -> CharacterConfig:
+        """
+        Return the validated character config of a config file.
+
+        Parameters:
+        - config_file_name (str): "conf.yaml", or the name of a file in
+            config_alts_dir, which is merged into the character config of
+            conf.yaml.
+        - config_alts_dir (str): The directory of the alternative configs.
+
+        Returns:
+        - CharacterConfig: A copy the caller is free to modify.
+
+        Raises:
+        - ValueError: If the path is outside config_alts_dir or the file has
+            no character_config.
+        - ValidationError: If the merged config is invalid.
+        """
+        if config_file_name == BASE_CONFIG:
+            config_path = BASE_CONFIG
+        else:
+            config_path = os.path.normpath(
+                os.path.join(config_alts_dir, config_file_name)
+            )
+            if not config_path.startswith(config_alts_dir):
+                raise ValueError("Invalid configuration file path")
+
+        paths = {BASE_CONFIG, config_path}
+        versions = tuple(self._file_version(path) for path in sorted(paths))
+        with self._lock:
+            cached = self._characters.get(config_path)
+        if cached is not None and cached[0] == versions:
+            return cached[1].model_copy(deep=True)
+
+        character_data = self.read_config(config_path).get("character_config")
+        if not character_data:
+            raise ValueError(f"Failed to load configuration from {config_file_name}")
+        if config_path != BASE_CONFIG:
+            # alternative configs only hold what they change
+            base_data = self.read_config(BASE_CONFIG).get("character_config") or {}
+            character_data = deep_merge(base_data, character_data)
+
+        character_config = CharacterConfig(**character_data)
+        with self._lock:
+            self._characters[config_path] = (versions, character_config)
+        return character_config.model_copy(deep=True)
+
+    def _listing(self, key: Tuple[str, str], scan: Callable[[], list]) -> list:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._listings.get(key)
+        if cached is not None and now - cached[0] < self.ttl:
+            return list(cached[1])
+        listing = scan()
+        with self._lock:
+            self._listings[key] = (now, listing)
+        return list(listing)
+
+    def config_files(self, config_alts_dir: str) -> list[dict]:
+        """The same as `scan_config_alts_directory`, see the module docstring."""
+        return self._listing(
+            ("configs", config_alts_dir),
+            lambda: scan_config_alts_directory(config_alts_dir, read=self.read_config),
+        )
+
+    def background_files(self, bg_dir: str = "backgrounds") -> list[str]:
+        """The same as `scan_bg_directory`, see the module docstring."""
+        return self._listing(("backgrounds", bg_dir), lambda: scan_bg_directory(bg_dir))
+
+
+config_catalog = ConfigCatalog()
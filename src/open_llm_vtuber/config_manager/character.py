@@ -5,6 +5,7 @@ from .i18n import I18nMixin, Description
 from .asr import ASRConfig
 from .tts import TTSConfig
 from .tts_preprocessor import TTSPreprocessorConfig
+from .vad import VADConfig
 
 from .agent import AgentConfig
 
@@ -20,6 +21,7 @@ class CharacterConfig(I18nMixin):
     asr_config: ASRConfig = Field(..., alias="asr_config")
     tts_config: TTSConfig = Field(..., alias="tts_config")
     tts_preprocessor_config: TTSPreprocessorConfig = Field(...)
+    vad_config: VADConfig = Field(default_factory=VADConfig, alias="vad_config")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "conf_name": Description(
@@ -48,6 +50,10 @@ class CharacterConfig(I18nMixin):
             en="Configuration for Text-to-Speech Preprocessor",
             zh="语音合成预处理器配置",
         ),
+        "vad_config": Description(
+            en="Configuration for server-side Voice Activity Detection",
+            zh="服务端语音活动检测配置",
+        ),
     }
 
     @field_validator("persona_prompt")
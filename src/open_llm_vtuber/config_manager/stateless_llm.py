@@ -132,6 +132,24 @@ class LlamaCppConfig(I18nMixin):
     }
 
 
+class RemoteLLMConfig(I18nMixin):
+    """Configuration for the LLM of remote inference servers."""
+
+    urls: list[str] = Field(..., alias="urls")
+    health_check_interval: float = Field(10.0, alias="health_check_interval")
+
+    DESCRIPTIONS: ClassVar[dict[str, Description]] = {
+        "urls": Description(
+            en="Base URLs of the inference servers running the LLM (run_inference_server.py)",
+            zh="运行LLM的推理服务器地址列表（run_inference_server.py）",
+        ),
+        "health_check_interval": Description(
+            en="Seconds between health checks of the servers (0 to disable)",
+            zh="服务器健康检查的间隔秒数（0 表示关闭）",
+        ),
+    }
+
+
 class StatelessLLMConfigs(I18nMixin, BaseModel):
     """Pool of LLM provider configurations.
     This class contains configurations for different LLM providers."""
@@ -148,6 +166,7 @@ class StatelessLLMConfigs(I18nMixin, BaseModel):
     claude_llm: ClaudeConfig | None = Field(None, alias="claude_llm")
     llama_cpp_llm: LlamaCppConfig | None = Field(None, alias="llama_cpp_llm")
     mistral_llm: MistralConfig | None = Field(None, alias="mistral_llm")
+    remote_llm: RemoteLLMConfig | None = Field(None, alias="remote_llm")
 
     DESCRIPTIONS: ClassVar[dict[str, Description]] = {
         "openai_compatible_llm": Description(
@@ -175,4 +194,8 @@ class StatelessLLMConfigs(I18nMixin, BaseModel):
         "llama_cpp_llm": Description(
             en="Configuration for local Llama.cpp", zh="本地Llama.cpp配置"
         ),
+        "remote_llm": Description(
+            en="Configuration for the LLM of remote inference servers",
+            zh="远程推理服务器的语言模型配置",
+        ),
     }
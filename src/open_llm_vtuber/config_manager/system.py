@@ -1,9 +1,177 @@
 # config_manager/system.py
 from pydantic import Field, model_validator
-from typing import Dict, ClassVar
+from typing import Dict, ClassVar, List
 from .i18n import I18nMixin, Description
 
 
+class HTTPClientConfig(I18nMixin):
+    """Settings for the shared HTTP connection pool used by HTTP-based engines."""
+
+    max_connections: int = Field(100, alias="max_connections")
+    max_keepalive_connections: int = Field(20, alias="max_keepalive_connections")
+    keepalive_expiry: float = Field(30.0, alias="keepalive_expiry")
+    timeout: float = Field(120.0, alias="timeout")
+    connect_timeout: float = Field(10.0, alias="connect_timeout")
+    http2: bool = Field(True, alias="http2")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "max_connections": Description(
+            en="Maximum number of concurrent connections", zh="最大并发连接数"
+        ),
+        "max_keepalive_connections": Description(
+            en="Maximum number of idle keep-alive connections",
+            zh="最大空闲长连接数",
+        ),
+        "keepalive_expiry": Description(
+            en="Seconds an idle connection is kept open", zh="空闲连接保持的秒数"
+        ),
+        "timeout": Description(
+            en="Default request timeout in seconds", zh="默认请求超时（秒）"
+        ),
+        "connect_timeout": Description(
+            en="Connection timeout in seconds", zh="连接超时（秒）"
+        ),
+        "http2": Description(
+            en="Use HTTP/2 when the h2 package is installed",
+            zh="安装了 h2 包时使用 HTTP/2",
+        ),
+    }
+
+
+class EngineCacheConfig(I18nMixin):
+    """Settings for the process-wide cache of loaded engines."""
+
+    max_idle_engines: int = Field(2, alias="max_idle_engines")
+    memory_budget_mb: int = Field(0, alias="memory_budget_mb")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "max_idle_engines": Description(
+            en="Maximum number of unused engines kept loaded for later config switches",
+            zh="为之后切换配置而保留的未使用引擎的最大数量",
+        ),
+        "memory_budget_mb": Description(
+            en="Unload unused engines while the process uses more memory than this (MB, 0 to disable)",
+            zh="进程内存超过此值时卸载未使用的引擎（MB，0 表示不限制）",
+        ),
+    }
+
+
+class ProcessPoolConfig(I18nMixin):
+    """Settings for running local ASR/TTS engines in worker processes."""
+
+    asr_workers: int = Field(0, alias="asr_workers")
+    tts_workers: int = Field(0, alias="tts_workers")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "asr_workers": Description(
+            en="Number of worker processes for the ASR engine (0 to run it in the server process)",
+            zh="ASR 引擎的工作进程数（0 表示在服务器进程内运行）",
+        ),
+        "tts_workers": Description(
+            en="Number of worker processes for the TTS engine (0 to run it in the server process)",
+            zh="TTS 引擎的工作进程数（0 表示在服务器进程内运行）",
+        ),
+    }
+
+
+class SpeculativeTurnConfig(I18nMixin):
+    """Settings for starting the agent before the user has finished speaking."""
+
+    enabled: bool = Field(False, alias="enabled")
+    transcribe_interval_ms: int = Field(500, alias="transcribe_interval_ms")
+    stable_ms: int = Field(300, alias="stable_ms")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "enabled": Description(
+            en="Start the agent on the interim transcript while the user is still speaking",
+            zh="在用户仍在说话时，基于临时识别结果提前启动 AI 回复",
+        ),
+        "transcribe_interval_ms": Description(
+            en="Minimum time between two interim transcriptions (ms)",
+            zh="两次临时识别之间的最短间隔（毫秒）",
+        ),
+        "stable_ms": Description(
+            en="How long the interim transcript must stay unchanged before the agent starts (ms)",
+            zh="临时识别结果保持不变多久后启动 AI 回复（毫秒）",
+        ),
+    }
+
+
+class WebSocketConfig(I18nMixin):
+    """Settings for the client WebSocket connections."""
+
+    send_queue_size: int = Field(64, alias="send_queue_size")
+    msgpack: bool = Field(True, alias="msgpack")
+    per_message_deflate: bool = Field(True, alias="per_message_deflate")
+    compress_types: List[str] = Field(
+        default_factory=lambda: [
+            "history-list",
+            "history-data",
+            "history-page",
+            "config-files",
+            "background-files",
+        ],
+        alias="compress_types",
+    )
+    compress_min_size: int = Field(4096, alias="compress_min_size")
+    compress_level: int = Field(6, alias="compress_level")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "send_queue_size": Description(
+            en="Messages waiting to be sent to a client at which new ones wait for it to catch up",
+            zh="等待发送给客户端的消息数达到此值时，新消息需等待其跟上",
+        ),
+        "msgpack": Description(
+            en="Let clients choose the MessagePack encoding instead of JSON (requires msgpack)",
+            zh="允许客户端选择 MessagePack 编码代替 JSON（需要安装 msgpack）",
+        ),
+        "per_message_deflate": Description(
+            en="Compress every message with the permessage-deflate extension of uvicorn",
+            zh="使用 uvicorn 的 permessage-deflate 扩展压缩所有消息",
+        ),
+        "compress_types": Description(
+            en="Message types compressed for clients that offer a +deflate subprotocol",
+            zh="对提供 +deflate 子协议的客户端压缩的消息类型",
+        ),
+        "compress_min_size": Description(
+            en="Size in bytes below which those messages are sent uncompressed",
+            zh="小于此大小（字节）的消息不压缩",
+        ),
+        "compress_level": Description(
+            en="zlib compression level, 1 (fastest) to 9 (smallest)",
+            zh="zlib 压缩级别，1（最快）到 9（最小）",
+        ),
+    }
+
+
+class StaticFilesConfig(I18nMixin):
+    """Settings for serving the frontend, Live2D models and backgrounds."""
+
+    precompress: bool = Field(True, alias="precompress")
+    min_compress_size: int = Field(1024, alias="min_compress_size")
+    hot_cache_mb: int = Field(64, alias="hot_cache_mb")
+    max_cached_file_mb: int = Field(8, alias="max_cached_file_mb")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "precompress": Description(
+            en="Write gzip/brotli copies of text files (JS, JSON...) at startup and serve them",
+            zh="启动时生成文本文件（JS、JSON 等）的 gzip/brotli 压缩副本并提供给客户端",
+        ),
+        "min_compress_size": Description(
+            en="Files smaller than this (bytes) are not precompressed",
+            zh="小于此大小（字节）的文件不预压缩",
+        ),
+        "hot_cache_mb": Description(
+            en="Memory for the contents of the most requested files (MB)",
+            zh="用于缓存最常请求的文件内容的内存（MB）",
+        ),
+        "max_cached_file_mb": Description(
+            en="Larger files are always read from disk (MB)",
+            zh="更大的文件总是从磁盘读取（MB）",
+        ),
+    }
+
+
 class SystemConfig(I18nMixin):
     """System configuration settings."""
 
@@ -12,6 +180,25 @@ class SystemConfig(I18nMixin):
     port: int = Field(..., alias="port")
     config_alts_dir: str = Field(..., alias="config_alts_dir")
     tool_prompts: Dict[str, str] = Field(..., alias="tool_prompts")
+    http_client: HTTPClientConfig = Field(
+        default_factory=HTTPClientConfig, alias="http_client"
+    )
+    engine_warmup: bool = Field(True, alias="engine_warmup")
+    engine_cache: EngineCacheConfig = Field(
+        default_factory=EngineCacheConfig, alias="engine_cache"
+    )
+    process_pool: ProcessPoolConfig = Field(
+        default_factory=ProcessPoolConfig, alias="process_pool"
+    )
+    speculative_turn: SpeculativeTurnConfig = Field(
+        default_factory=SpeculativeTurnConfig, alias="speculative_turn"
+    )
+    websocket: WebSocketConfig = Field(
+        default_factory=WebSocketConfig, alias="websocket"
+    )
+    static_files: StaticFilesConfig = Field(
+        default_factory=StaticFilesConfig, alias="static_files"
+    )
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "conf_version": Description(en="Configuration version", zh="配置文件版本"),
@@ -24,6 +211,33 @@ class SystemConfig(I18nMixin):
             en="Tool prompts to be inserted into persona prompt", 
             zh="要插入到角色提示词中的工具提示词"
         ),
+        "http_client": Description(
+            en="Shared HTTP connection pool for HTTP-based engines",
+            zh="HTTP 类引擎共享的 HTTP 连接池设置",
+        ),
+        "engine_warmup": Description(
+            en="Run a short synthetic inference on each local engine after it is loaded",
+            zh="本地引擎加载后运行一次简短的预热推理",
+        ),
+        "engine_cache": Description(
+            en="Cache of loaded engines reused across config switches",
+            zh="在切换配置时复用已加载引擎的缓存",
+        ),
+        "process_pool": Description(
+            en="Worker processes for CPU-bound local ASR/TTS engines",
+            zh="为 CPU 密集的本地 ASR/TTS 引擎使用的工作进程",
+        ),
+        "speculative_turn": Description(
+            en="Speculative agent start on stable interim transcripts",
+            zh="基于稳定的临时识别结果提前启动 AI 回复",
+        ),
+        "websocket": Description(
+            en="Client WebSocket connection settings", zh="客户端 WebSocket 连接设置"
+        ),
+        "static_files": Description(
+            en="Caching and compression of the served static files",
+            zh="静态文件的缓存与压缩",
+        ),
     }
 
     @model_validator(mode="after")
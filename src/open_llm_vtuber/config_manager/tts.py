@@ -1,6 +1,6 @@
 # config_manager/tts.py
 from pydantic import ValidationInfo, Field, model_validator
-from typing import Literal, Optional, Dict, ClassVar
+from typing import Literal, Optional, Dict, ClassVar, List
 from .i18n import I18nMixin, Description
 
 
@@ -263,6 +263,24 @@ class SherpaOnnxTTSConfig(I18nMixin):
     }
 
 
+class RemoteTTSConfig(I18nMixin):
+    """Configuration for TTS on remote inference servers."""
+
+    urls: List[str] = Field(..., alias="urls")
+    health_check_interval: float = Field(10.0, alias="health_check_interval")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "urls": Description(
+            en="Base URLs of the inference servers running the TTS (run_inference_server.py)",
+            zh="运行TTS的推理服务器地址列表（run_inference_server.py）",
+        ),
+        "health_check_interval": Description(
+            en="Seconds between health checks of the servers (0 to disable)",
+            zh="服务器健康检查的间隔秒数（0 表示关闭）",
+        ),
+    }
+
+
 class TTSConfig(I18nMixin):
     """Configuration for Text-to-Speech."""
 
@@ -277,6 +295,7 @@ class TTSConfig(I18nMixin):
         "gpt_sovits_tts",
         "fish_api_tts",
         "sherpa_onnx_tts",
+        "remote_tts",
     ] = Field(..., alias="tts_model")
 
     azure_tts: Optional[AzureTTSConfig] = Field(None, alias="azure_tts")
@@ -291,6 +310,7 @@ class TTSConfig(I18nMixin):
     sherpa_onnx_tts: Optional[SherpaOnnxTTSConfig] = Field(
         None, alias="sherpa_onnx_tts"
     )
+    remote_tts: Optional[RemoteTTSConfig] = Field(None, alias="remote_tts")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "tts_model": Description(
@@ -314,6 +334,10 @@ class TTSConfig(I18nMixin):
         "sherpa_onnx_tts": Description(
             en="Configuration for Sherpa Onnx TTS", zh="Sherpa Onnx TTS 配置"
         ),
+        "remote_tts": Description(
+            en="Configuration for TTS on remote inference servers",
+            zh="远程推理服务器 TTS 配置",
+        ),
     }
 
     @model_validator(mode="after")
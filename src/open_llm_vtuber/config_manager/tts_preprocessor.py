@@ -11,6 +11,9 @@ class DeepLXConfig(I18nMixin):
 
     deeplx_target_lang: str = Field(..., alias="deeplx_target_lang")
     deeplx_api_endpoint: str = Field(..., alias="deeplx_api_endpoint")
+    deeplx_cache_size: int = Field(1024, alias="deeplx_cache_size")
+    deeplx_max_batch_size: int = Field(8, alias="deeplx_max_batch_size")
+    deeplx_batch_window_ms: float = Field(20, alias="deeplx_batch_window_ms")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "deeplx_target_lang": Description(
@@ -20,6 +23,18 @@ class DeepLXConfig(I18nMixin):
         "deeplx_api_endpoint": Description(
             en="API endpoint URL for DeepLX service", zh="DeepLX 服务的 API 端点 URL"
         ),
+        "deeplx_cache_size": Description(
+            en="Number of translated sentences kept in memory",
+            zh="内存中缓存的已翻译句子数量",
+        ),
+        "deeplx_max_batch_size": Description(
+            en="Maximum number of sentences sent to DeepLX in one request",
+            zh="单次请求发送给 DeepLX 的最大句子数",
+        ),
+        "deeplx_batch_window_ms": Description(
+            en="Milliseconds to wait for more sentences before sending a batch",
+            zh="发送批次前等待更多句子的毫秒数",
+        ),
     }
 
 
@@ -32,6 +47,7 @@ class TranslatorConfig(I18nMixin):
     translate_audio: bool = Field(..., alias="translate_audio")
     translate_provider: Literal["deeplx"] = Field(..., alias="translate_provider")
     deeplx: Optional[DeepLXConfig] = Field(None, alias="deeplx")
+    translate_lookahead: int = Field(2, alias="translate_lookahead")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "translate_audio": Description(
@@ -44,6 +60,10 @@ class TranslatorConfig(I18nMixin):
         "deeplx": Description(
             en="Configuration for DeepLX translation service", zh="DeepLX 翻译服务配置"
         ),
+        "translate_lookahead": Description(
+            en="Number of upcoming sentences translated while the current one is synthesized",
+            zh="在合成当前句子时提前翻译的后续句子数量",
+        ),
     }
 
     @model_validator(mode="after")
@@ -1,7 +1,7 @@
 # config_manager/utils.py
 import yaml
 from pathlib import Path
-from typing import Union, Dict, Any, TypeVar
+from typing import Union, Dict, Any, TypeVar, Callable
 from pydantic import BaseModel, ValidationError
 import os
 import re
@@ -104,6 +104,45 @@ def load_text_file_with_guess_encoding(file_path: str) -> str | None:
     return None
 
 
+def deep_merge(dict1, dict2):
+    """
+    Recursively merges dict2 into dict1, prioritizing values from dict2.
+    """
+    result = dict1.copy()
+    for key, value in dict2.items():
+        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
+            result[key] = deep_merge(result[key], value)
+        else:
+            result[key] = value
+    return result
+
+
+def diff_configs(old: BaseModel, new: BaseModel, prefix: str = "") -> set[str]:
+    """
+    Compare two configs of the same model field by field.
+
+    Parameters:
+    - old (BaseModel): The previous config.
+    - new (BaseModel): The new config.
+    - prefix (str): Prepended to the returned paths.
+
+    Returns:
+    - set[str]: Dotted paths of the fields that differ, as deep as both sides
+        are models of the same type (e.g. "tts_config.edge_tts.voice").
+    """
+    changed = set()
+    for name in type(new).model_fields:
+        old_value = getattr(old, name, None)
+        new_value = getattr(new, name)
+        if old_value == new_value:
+            continue
+        if isinstance(new_value, BaseModel) and type(old_value) is type(new_value):
+            changed |= diff_configs(old_value, new_value, f"{prefix}{name}.")
+        else:
+            changed.add(f"{prefix}{name}")
+    return changed
+
+
 def save_config(config: BaseModel, config_path: Union[str, Path]):
     """
     Saves a Pydantic model to a YAML configuration file.
@@ -124,13 +163,16 @@ def save_config(config: BaseModel, config_path: Union[str, Path]):
         raise yaml.YAMLError(f"Error writing YAML file: {e}")
 
 
-def scan_config_alts_directory(config_alts_dir: str) -> list[dict]:
+def scan_config_alts_directory(
+    config_alts_dir: str, read: Callable[[str], Dict[str, Any]] = read_yaml
+) -> list[dict]:
     """
     Scan the config_alts directory and return a list of config information.
     Each config info contains the filename and its display name from the config.
 
     Parameters:
     - config_alts_dir (str): The path to the config_alts directory.
+    - read (Callable): Reads a config file, `read_yaml` by default.
 
     Returns:
     - list[dict]: A list of dicts containing config info:
@@ -140,7 +182,7 @@ def scan_config_alts_directory(config_alts_dir: str) -> list[dict]:
     config_files = []
 
     # Add default config first
-    default_config = read_yaml("conf.yaml")
+    default_config = read("conf.yaml")
     config_files.append(
         {
             "filename": "conf.yaml",
@@ -156,7 +198,7 @@ def scan_config_alts_directory(config_alts_dir: str) -> list[dict]:
     for root, _, files in os.walk(config_alts_dir):
         for file in files:
             if file.endswith(".yaml"):
-                config: dict = read_yaml(os.path.join(root, file))
+                config: dict = read(os.path.join(root, file))
                 config_files.append(
                     {
                         "filename": file,
@@ -171,9 +213,8 @@ def scan_config_alts_directory(config_alts_dir: str) -> list[dict]:
     return config_files
 
 
-def scan_bg_directory() -> list[str]:
+def scan_bg_directory(bg_dir: str = "backgrounds") -> list[str]:
     bg_files = []
-    bg_dir = "backgrounds"
     for root, _, files in os.walk(bg_dir):
         for file in files:
             if file.endswith((".jpg", ".jpeg", ".png", ".gif")):
@@ -0,0 +1,62 @@
+# config_manager/vad.py
+from pydantic import Field
+from typing import Literal, Optional, Dict, ClassVar
+from .i18n import I18nMixin, Description
+
+
+class SileroVADConfig(I18nMixin):
+    """Configuration for Silero VAD (sherpa-onnx)."""
+
+    model_path: str = Field("./models/silero_vad.onnx", alias="model_path")
+    threshold: float = Field(0.5, alias="threshold")
+    min_silence_duration: float = Field(0.5, alias="min_silence_duration")
+    min_speech_duration: float = Field(0.25, alias="min_speech_duration")
+    max_speech_duration: float = Field(20, alias="max_speech_duration")
+    num_threads: int = Field(1, alias="num_threads")
+    provider: Literal["cpu", "cuda"] = Field("cpu", alias="provider")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "model_path": Description(
+            en="Path to silero_vad.onnx (downloaded automatically if missing)",
+            zh="silero_vad.onnx 的路径（不存在时自动下载）",
+        ),
+        "threshold": Description(
+            en="Speech probability above which a frame counts as speech",
+            zh="判定为语音的概率阈值",
+        ),
+        "min_silence_duration": Description(
+            en="Seconds of silence that end an utterance",
+            zh="结束一句话所需的静音秒数",
+        ),
+        "min_speech_duration": Description(
+            en="Utterances shorter than this (seconds) are ignored",
+            zh="短于此时长（秒）的语音会被忽略",
+        ),
+        "max_speech_duration": Description(
+            en="Utterances longer than this (seconds) are split",
+            zh="长于此时长（秒）的语音会被切分",
+        ),
+        "num_threads": Description(
+            en="Number of threads for inference", zh="推理线程数"
+        ),
+        "provider": Description(
+            en="Provider for inference (cpu or cuda)", zh="推理平台（cpu 或 cuda）"
+        ),
+    }
+
+
+class VADConfig(I18nMixin):
+    """Configuration for server-side Voice Activity Detection."""
+
+    vad_model: Optional[Literal["silero_vad"]] = Field(None, alias="vad_model")
+    silero_vad: Optional[SileroVADConfig] = Field(None, alias="silero_vad")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "vad_model": Description(
+            en="Server-side VAD model. Leave empty to rely on the frontend's VAD",
+            zh="服务端 VAD 模型，留空则使用前端的 VAD",
+        ),
+        "silero_vad": Description(
+            en="Configuration for Silero VAD", zh="Silero VAD 配置"
+        ),
+    }
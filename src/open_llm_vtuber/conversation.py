@@ -1,18 +1,19 @@
 from datetime import datetime
 import uuid
-import json
 import asyncio
-from typing import AsyncIterator, List, Dict, Union, Any
+from typing import AsyncIterator, Awaitable, Callable, List, Dict, Union, Any
 import numpy as np
 from loguru import logger
-from fastapi import WebSocket
 
 from .live2d_model import Live2dModel
-from .asr.asr_interface import ASRInterface
+from .asr.asr_interface import ASRInterface, ASRStream
+from .asr.audio_buffer import AudioBuffer
 from .agent.agents.agent_interface import AgentInterface
 from .agent.output_types import BaseOutput, SentenceOutput, AudioOutput, Actions
 from .agent.input_types import BatchInput, TextData, ImageData, TextSource, ImageSource
 from .tts.tts_interface import TTSInterface
+from .speculative_turn import SpeculativeTurn
+from .websocket_messages import OutgoingMessage
 
 from .utils.stream_audio import prepare_audio_payload
 from .chat_history_manager import store_message
@@ -35,7 +36,7 @@ class TTSTaskManager:
         tts_text: str,
         live2d_model: Live2dModel,
         tts_engine: TTSInterface,
-        websocket_send: WebSocket.send,
+        websocket_send: Callable[[OutgoingMessage], Awaitable[None]],
         display_text: str | None = None,
         actions: Actions | None = None,
     ) -> None:
@@ -47,7 +48,7 @@ class TTSTaskManager:
             tts_text: Text to be spoken
             live2d_model: Live2D model instance
             tts_engine: TTS engine instance
-            websocket_send: WebSocket send function
+            websocket_send: Coroutine function that sends a message to the client
             display_text: Text to display (defaults to tts_text)
             actions: Actions object
         """
@@ -61,7 +62,7 @@ class TTSTaskManager:
                 actions=actions,
                 display_text=display_text,
             )
-            await websocket_send(json.dumps(audio_payload))
+            await websocket_send(audio_payload)
             return
 
         logger.debug(f"🏃Generating audio for '''{tts_text}'''...")
@@ -88,7 +89,7 @@ class TTSTaskManager:
                     display_text=display_text,
                 )
                 logger.debug("Sending Audio payload.")
-                await websocket_send(json.dumps(audio_payload))
+                await websocket_send(audio_payload)
 
                 tts_engine.remove_file(audio_file_path)
                 logger.debug("Payload sent. Audio cache file cleaned.")
@@ -107,57 +108,69 @@ class TTSTaskManager:
 
 
 async def conversation_chain(
-    user_input: Union[str, np.ndarray],
+    user_input: Union[str, np.ndarray, AudioBuffer, ASRStream],
     asr_engine: ASRInterface,
     agent_engine: AgentInterface,
     tts_engine: TTSInterface,
     live2d_model: Live2dModel,
-    websocket_send: WebSocket.send,
+    websocket_send: Callable[[OutgoingMessage], Awaitable[None]],
     conf_uid: str = "",
     history_uid: str = "",
     images: List[Dict[str, Any]] = None,
+    speculative_turn: SpeculativeTurn | None = None,
 ) -> str:
     """
     One iteration of the main conversation chain.
 
     Args:
-        user_input: User input (string or audio array)
+        user_input: User input (string, 16 kHz audio array or AudioBuffer, or
+            a streaming ASR stream that already holds the utterance)
         asr_engine: ASR engine instance
         agent_engine: Agent instance
         tts_engine: TTS engine instance
         live2d_model: Live2D model instance
-        websocket_send: WebSocket send function
+        websocket_send: Coroutine function that sends a message to the client
         conf_uid: Configuration ID
         history_uid: History ID
         images: Optional list of image data from frontend
+        speculative_turn: Agent response already started on the interim
+            transcript. Used if the final transcript matches, cancelled otherwise.
 
     Returns:
         str: Complete response from the agent
     """
     tts_manager = TTSTaskManager()
     full_response: str = ""
+    agent_output: AsyncIterator[BaseOutput] | None = None
 
     try:
         session_emoji = np.random.choice(EMOJI_LIST)
 
         await websocket_send(
-            json.dumps(
-                {
-                    "type": "control",
-                    "text": "conversation-chain-start",
-                }
-            )
+            {
+                "type": "control",
+                "text": "conversation-chain-start",
+            }
         )
 
         logger.info(f"New Conversation Chain {session_emoji} started!")
 
         # Handle audio input
         input_text = user_input
-        if isinstance(user_input, np.ndarray):
+        if isinstance(user_input, (np.ndarray, AudioBuffer)):
             logger.info("Transcribing audio input...")
-            input_text = await asr_engine.async_transcribe_np(user_input)
+            # the engine resamples it to its native rate if needed
+            input_text = await asr_engine.async_transcribe_np(
+                AudioBuffer.from_any(user_input, ASRInterface.SAMPLE_RATE)
+            )
+            await websocket_send(
+                {"type": "user-input-transcription", "text": input_text}
+            )
+        elif isinstance(user_input, ASRStream):
+            # most of the audio was decoded while the user was speaking
+            input_text = await asyncio.to_thread(user_input.finalize)
             await websocket_send(
-                json.dumps({"type": "user-input-transcription", "text": input_text})
+                {"type": "user-input-transcription", "text": input_text}
             )
 
         # Prepare BatchInput
@@ -183,7 +196,18 @@ async def conversation_chain(
             logger.info(f"With {len(images)} images")
 
         # Process agent output
-        agent_output: AsyncIterator[BaseOutput] = agent_engine.chat(batch_input)
+        if (
+            speculative_turn is not None
+            and not images
+            and speculative_turn.matches(input_text)
+        ):
+            agent_output = speculative_turn.commit()
+        else:
+            if speculative_turn is not None:
+                logger.debug("Final transcript differs, restarting the agent.")
+                await speculative_turn.cancel()
+            agent_output = agent_engine.chat(batch_input)
+        speculative_turn = None
 
         async for output in agent_output:
             if isinstance(output, SentenceOutput):
@@ -205,7 +229,7 @@ async def conversation_chain(
                         display_text=display_text,
                         actions=actions,
                     )
-                    await websocket_send(json.dumps(audio_payload))
+                    await websocket_send(audio_payload)
 
         if tts_manager.task_list:
             await asyncio.gather(*tts_manager.task_list)
@@ -217,17 +241,22 @@ async def conversation_chain(
         logger.debug(f"🧹 Clearing up conversation {session_emoji}.")
         tts_manager.clear()
 
+        # close the agent pipeline right away so that any read-ahead work
+        # (e.g. pending translations) is cancelled on interrupt
+        if agent_output is not None and hasattr(agent_output, "aclose"):
+            await agent_output.aclose()
+        if speculative_turn is not None:
+            await speculative_turn.cancel()
+
         if full_response:
             store_message(conf_uid, history_uid, "ai", full_response)
             logger.info(f"💾 Stored AI message: '''{full_response}'''")
 
         await websocket_send(
-            json.dumps(
-                {
-                    "type": "control",
-                    "text": "conversation-chain-end",
-                }
-            )
+            {
+                "type": "control",
+                "text": "conversation-chain-end",
+            }
         )
         logger.info(f"😎👍✅ Conversation Chain {session_emoji} completed!")
         return full_response
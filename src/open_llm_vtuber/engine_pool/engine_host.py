@@ -0,0 +1,119 @@
+"""
+The loop that runs inside an engine worker process.
+
+Audio travels through a PCMRingBuffer in both directions: the server writes
+the utterances to transcribe, and the host writes the synthesized speech, so
+no request pickles audio.
+"""
+
+import multiprocessing
+from typing import Any, Dict
+
+import numpy as np
+from loguru import logger
+
+from ..asr.audio_buffer import AudioBuffer
+from .pcm_ring_buffer import PCMRingBuffer, PCMSlot, RingBufferFull
+
+
+def create_engine(kind: str, engine_type: str, engine_config: Dict[str, Any]):
+    """Create an engine through the registry of its kind."""
+    if kind == "asr":
+        from ..asr.asr_factory import asr_registry
+
+        return asr_registry.create(engine_type, **engine_config)
+    if kind == "tts":
+        from ..tts.tts_factory import tts_registry
+
+        return tts_registry.create(engine_type, **engine_config)
+    raise ValueError(f"Unknown engine kind: {kind}")
+
+
+class EngineHost:
+    """Serves transcription or synthesis requests with one engine."""
+
+    def __init__(
+        self,
+        kind: str,
+        engine_type: str,
+        engine_config: Dict[str, Any],
+        ring: PCMRingBuffer,
+        warmup: bool = True,
+    ):
+        self.ring = ring
+        self.engine = create_engine(kind, engine_type, engine_config)
+        if warmup:
+            self.engine.warmup()
+
+    def handle(self, op: str, args: tuple) -> Any:
+        if op == "transcribe":
+            return self.transcribe(*args)
+        if op == "synthesize":
+            return self.synthesize(*args)
+        raise ValueError(f"Unknown request: {op}")
+
+    def transcribe(self, audio: PCMSlot | np.ndarray, sample_rate: int) -> str:
+        """Transcribe audio the server wrote to the ring buffer (or sent as an
+        array if the buffer was full)."""
+        if isinstance(audio, PCMSlot):
+            audio = self.ring.view(audio)
+        return self.engine.transcribe_np(AudioBuffer(audio, sample_rate))
+
+    def synthesize(
+        self, text: str, file_name_no_ext=None
+    ) -> tuple[PCMSlot | np.ndarray | None, int]:
+        """
+        Synthesize the text and return its mono 16-bit PCM, in the ring buffer
+        if there is room, and its sample rate.
+        """
+        audio_path = self.engine.generate_audio(text, file_name_no_ext)
+        if not audio_path:
+            return None, 0
+        try:
+            audio = AudioBuffer.from_file(audio_path)
+        finally:
+            self.engine.remove_file(audio_path, verbose=False)
+
+        samples = audio.pcm16()
+        try:
+            return self.ring.write(samples), audio.sample_rate
+        except RingBufferFull:
+            logger.debug("PCM ring buffer full, sending the audio through the queue.")
+            return samples, audio.sample_rate
+
+    def serve(
+        self, requests: multiprocessing.Queue, results: multiprocessing.Queue
+    ) -> None:
+        """Answer requests until a None request arrives."""
+        while True:
+            request = requests.get()
+            if request is None:
+                return
+            request_id, op, args = request
+            try:
+                results.put((request_id, True, self.handle(op, args)))
+            except Exception as e:
+                results.put((request_id, False, f"{type(e).__name__}: {e}"))
+
+
+def run_engine_host(
+    kind: str,
+    engine_type: str,
+    engine_config: Dict[str, Any],
+    warmup: bool,
+    ring: PCMRingBuffer,
+    requests: multiprocessing.Queue,
+    results: multiprocessing.Queue,
+) -> None:
+    """Entry point of a worker process: load the engine, report that it is
+    ready (or why it failed), then serve requests."""
+    try:
+        host = EngineHost(kind, engine_type, engine_config, ring, warmup)
+    except Exception as e:
+        results.put((None, False, f"Failed to load {kind} {engine_type}: {e}"))
+        return
+    results.put((None, True, None))
+    try:
+        host.serve(requests, results)
+    finally:
+        ring.close()
@@ -0,0 +1,176 @@
+"""
+A ring of fixed-size PCM slots in shared memory.
+
+The server and the engine worker processes exchange audio through it: the
+writer copies the samples into free slots and sends only a small `PCMSlot`
+handle through the queue, the reader gets a numpy view on the slots without
+any copy, and releases them when done.
+"""
+
+import math
+import multiprocessing
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# header: the allocation cursor, then one owner entry per slot
+_CURSOR_BYTES = 8
+_HEADER_ALIGN = 64
+
+
+class RingBufferFull(Exception):
+    """Raised when there are not enough free slots for the audio."""
+
+
+@dataclass(frozen=True)
+class PCMSlot:
+    """Picklable handle to audio written to a PCMRingBuffer."""
+
+    start: int
+    count: int
+    length: int
+    dtype: str
+
+
+class PCMRingBuffer:
+    """
+    Shared memory split into `num_slots` slots of `slot_bytes` each.
+
+    Audio longer than one slot takes consecutive slots. Allocation starts at a
+    cursor that moves around the ring, so slots are reused in order and a
+    reader that is still busy with old audio doesn't block new writes.
+
+    The buffer can be passed to a worker process as a `Process` argument, which
+    attaches it to the same memory.
+    """
+
+    def __init__(
+        self,
+        num_slots: int = 512,
+        slot_bytes: int = 32 * 1024,
+        context: multiprocessing.context.BaseContext | None = None,
+    ):
+        """
+        Create a new buffer.
+
+        Args:
+            num_slots (int): Number of slots.
+            slot_bytes (int): Size of one slot in bytes.
+            context: Multiprocessing context of the worker processes, for the
+                allocation lock.
+        """
+        context = context or multiprocessing.get_context()
+        header_bytes = self._header_bytes(num_slots)
+        block = shared_memory.SharedMemory(
+            create=True, size=header_bytes + num_slots * slot_bytes
+        )
+        self._setup(block, num_slots, slot_bytes, context.Lock(), owner=True)
+        self._cursor[0] = 0
+        self._owners[:] = -1
+
+    @classmethod
+    def _attach(
+        cls, name: str, num_slots: int, slot_bytes: int, lock
+    ) -> "PCMRingBuffer":
+        ring = cls.__new__(cls)
+        block = shared_memory.SharedMemory(name=name)
+        ring._setup(block, num_slots, slot_bytes, lock, owner=False)
+        return ring
+
+    def __reduce__(self):
+        return (
+            PCMRingBuffer._attach,
+            (self._block.name, self.num_slots, self.slot_bytes, self._lock),
+        )
+
+    @staticmethod
+    def _header_bytes(num_slots: int) -> int:
+        size = _CURSOR_BYTES + 4 * num_slots
+        return math.ceil(size / _HEADER_ALIGN) * _HEADER_ALIGN
+
+    def _setup(self, block, num_slots: int, slot_bytes: int, lock, owner: bool):
+        self._block = block
+        self._lock = lock
+        self._is_owner = owner
+        self.num_slots = num_slots
+        self.slot_bytes = slot_bytes
+
+        self._cursor = np.ndarray((1,), np.int64, buffer=block.buf)
+        # first slot of the allocation that uses each slot, -1 if free
+        self._owners = np.ndarray(
+            (num_slots,), np.int32, buffer=block.buf, offset=_CURSOR_BYTES
+        )
+        self._data_offset = self._header_bytes(num_slots)
+
+    def write(self, samples: np.ndarray) -> PCMSlot:
+        """Copy the samples into free slots and return their handle.
+
+        Raises:
+            RingBufferFull: If there are not enough consecutive free slots.
+        """
+        samples = np.ascontiguousarray(samples).reshape(-1)
+        count = max(1, math.ceil(samples.nbytes / self.slot_bytes))
+        start = self._allocate(count)
+        slot = PCMSlot(start, count, len(samples), samples.dtype.str)
+        np.ndarray(
+            samples.shape,
+            samples.dtype,
+            buffer=self._block.buf,
+            offset=self._slot_offset(start),
+        )[:] = samples
+        return slot
+
+    def view(self, slot: PCMSlot) -> np.ndarray:
+        """Read-only view on the samples of a slot. Valid until it is released."""
+        samples = np.ndarray(
+            (slot.length,),
+            np.dtype(slot.dtype),
+            buffer=self._block.buf,
+            offset=self._slot_offset(slot.start),
+        )
+        samples.flags.writeable = False
+        return samples
+
+    def release(self, slot: PCMSlot) -> None:
+        """Free the slots so they can be written again."""
+        with self._lock:
+            used = self._owners[slot.start : slot.start + slot.count]
+            used[used == slot.start] = -1
+
+    def free_slots(self) -> int:
+        with self._lock:
+            return int(np.count_nonzero(self._owners == -1))
+
+    def close(self) -> None:
+        """Detach from the memory. The owner also frees it."""
+        # drop our own views first, the memory can't be closed while they exist
+        self._cursor = self._owners = None
+        try:
+            self._block.close()
+        except BufferError:
+            # a caller still holds a view; the memory goes away with the process
+            return
+        if self._is_owner:
+            self._block.unlink()
+
+    def _slot_offset(self, index: int) -> int:
+        return self._data_offset + index * self.slot_bytes
+
+    def _allocate(self, count: int) -> int:
+        if count > self.num_slots:
+            raise RingBufferFull(
+                f"{count} slots requested, the buffer only has {self.num_slots}"
+            )
+        with self._lock:
+            free = np.concatenate([[0], np.cumsum(self._owners == -1)])
+            # starts of `count` consecutive free slots, without wrapping around
+            starts = np.flatnonzero(free[count:] - free[:-count] == count)
+            if len(starts) == 0:
+                raise RingBufferFull(f"No {count} consecutive free slots")
+
+            after_cursor = starts[starts >= self._cursor[0]]
+            start = int(after_cursor[0] if len(after_cursor) else starts[0])
+            self._owners[start : start + count] = start
+            self._cursor[0] = (start + count) % self.num_slots
+            return start
@@ -0,0 +1,113 @@
+import asyncio
+import weakref
+from concurrent.futures import Future
+from typing import Any, Dict, List
+
+import numpy as np
+from loguru import logger
+
+from ..asr.asr_interface import ASRInterface
+from ..asr.audio_buffer import AudioBuffer
+from ..tts.tts_interface import TTSInterface
+from .pcm_ring_buffer import PCMSlot, RingBufferFull
+from .process_pool import EngineProcessPool
+
+
+class PooledASR(ASRInterface):
+    """ASR engine that runs in a pool of worker processes."""
+
+    def __init__(
+        self,
+        asr_model: str,
+        engine_config: Dict[str, Any],
+        num_workers: int,
+        warmup: bool = True,
+    ):
+        self.pool = EngineProcessPool(
+            "asr", asr_model, engine_config, num_workers, warmup
+        )
+
+    def _submit(self, audio: np.ndarray | AudioBuffer) -> Future:
+        audio = AudioBuffer.from_any(audio, self.SAMPLE_RATE)
+        ring = self.pool.ring
+        try:
+            slot = ring.write(audio.float32())
+        except RingBufferFull:
+            logger.debug("PCM ring buffer full, sending the audio through the queue.")
+            return self.pool.submit("transcribe", audio.float32(), audio.sample_rate)
+
+        try:
+            future = self.pool.submit("transcribe", slot, audio.sample_rate)
+        except Exception:
+            ring.release(slot)
+            raise
+        # the worker reads the slot until it answers
+        future.add_done_callback(lambda _: ring.release(slot))
+        return future
+
+    def transcribe_np(self, audio: np.ndarray | AudioBuffer) -> str:
+        return self._submit(audio).result()
+
+    async def async_transcribe_np(self, audio: np.ndarray | AudioBuffer) -> str:
+        # the work happens in another process, so no thread is needed to wait
+        return await asyncio.wrap_future(self._submit(audio))
+
+    def transcribe_batch_np(self, audios: List[np.ndarray | AudioBuffer]) -> List[str]:
+        # spread the utterances over the workers
+        futures = [self._submit(audio) for audio in audios]
+        return [future.result() for future in futures]
+
+
+class PooledTTS(TTSInterface):
+    """
+    TTS engine that runs in a pool of worker processes.
+
+    The workers decode the speech to PCM and write it to the pool's ring
+    buffer, so `generate_audio` returns an AudioBuffer viewing the shared
+    memory instead of a file path. `remove_file` releases it, and so does
+    garbage collection if the audio is dropped before being sent.
+    """
+
+    def __init__(
+        self,
+        tts_model: str,
+        engine_config: Dict[str, Any],
+        num_workers: int,
+        warmup: bool = True,
+    ):
+        self.pool = EngineProcessPool(
+            "tts", tts_model, engine_config, num_workers, warmup
+        )
+        self._slot_releases = weakref.WeakKeyDictionary()
+
+    def generate_audio(self, text: str, file_name_no_ext=None) -> AudioBuffer | None:
+        future = self.pool.submit("synthesize", text, file_name_no_ext)
+        return self._to_audio_buffer(*future.result())
+
+    async def async_generate_audio(
+        self, text: str, file_name_no_ext=None
+    ) -> AudioBuffer | None:
+        future = self.pool.submit("synthesize", text, file_name_no_ext)
+        return self._to_audio_buffer(*await asyncio.wrap_future(future))
+
+    def _to_audio_buffer(
+        self, audio: PCMSlot | np.ndarray | None, sample_rate: int
+    ) -> AudioBuffer | None:
+        if audio is None:
+            return None
+        if not isinstance(audio, PCMSlot):
+            return AudioBuffer(audio, sample_rate)
+
+        ring = self.pool.ring
+        buffer = AudioBuffer(ring.view(audio), sample_rate)
+        self._slot_releases[buffer] = weakref.finalize(buffer, ring.release, audio)
+        return buffer
+
+    def remove_file(self, filepath: str | AudioBuffer, verbose: bool = True) -> None:
+        """Release the shared memory of audio returned by `generate_audio`."""
+        if isinstance(filepath, AudioBuffer):
+            release = self._slot_releases.pop(filepath, None)
+            if release is not None:
+                release()
+            return
+        super().remove_file(filepath, verbose)
@@ -0,0 +1,189 @@
+"""
+Runs copies of an engine in worker processes.
+
+Local models (sherpa-onnx, faster-whisper, FunASR, Melo...) hold the GIL for a
+large part of their work, so running them with `asyncio.to_thread` serializes
+all sessions and slows down the event loop. A pool of worker processes, each
+with its own copy of the engine, runs them on all cores instead.
+"""
+
+import itertools
+import multiprocessing
+import queue
+import threading
+import weakref
+from concurrent.futures import Future
+from typing import Any, Dict, List
+
+from loguru import logger
+
+from .engine_host import run_engine_host
+from .pcm_ring_buffer import PCMRingBuffer
+
+
+def _shutdown(
+    processes: List[multiprocessing.Process],
+    requests: multiprocessing.Queue,
+    ring: PCMRingBuffer,
+) -> None:
+    for _ in processes:
+        requests.put(None)
+    for process in processes:
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+    ring.close()
+
+
+class EngineProcessPool:
+    """
+    N worker processes that each load the engine once and take requests from a
+    shared queue, so the next free worker picks up the next request.
+
+    Audio is exchanged through `ring`, a PCMRingBuffer shared with the workers.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        engine_type: str,
+        engine_config: Dict[str, Any],
+        num_workers: int,
+        warmup: bool = True,
+        ring_slots: int = 512,
+        ring_slot_bytes: int = 32 * 1024,
+    ):
+        """
+        Start the workers and wait until all of them have loaded the engine.
+
+        Args:
+            kind (str): "asr" or "tts".
+            engine_type (str): The engine name in the config (e.g. "sherpa_onnx_asr").
+            engine_config (dict): The engine settings from the config.
+            num_workers (int): Number of worker processes.
+            warmup (bool): Run the engine warmup in each worker after loading.
+            ring_slots (int): Number of slots of the PCM ring buffer.
+            ring_slot_bytes (int): Size of one slot of the PCM ring buffer.
+        """
+        self.name = f"{kind}:{engine_type}"
+        # spawn, since forking a process that already runs threads and models
+        # is unsafe
+        context = multiprocessing.get_context("spawn")
+        self._requests = context.Queue()
+        self._results = context.Queue()
+        self.ring = PCMRingBuffer(ring_slots, ring_slot_bytes, context)
+        self._lock = threading.Lock()
+        self._broken = threading.Event()
+        self._processes = [
+            context.Process(
+                target=run_engine_host,
+                args=(
+                    kind,
+                    engine_type,
+                    engine_config,
+                    warmup,
+                    self.ring,
+                    self._requests,
+                    self._results,
+                ),
+                name=f"{self.name}-worker-{i}",
+                daemon=True,
+            )
+            for i in range(num_workers)
+        ]
+
+        logger.info(f"Starting {num_workers} worker processes for {self.name}...")
+        for process in self._processes:
+            process.start()
+        # make sure the workers are stopped when the pool is garbage collected,
+        # e.g. when the engine cache drops it
+        self._finalizer = weakref.finalize(
+            self, _shutdown, self._processes, self._requests, self.ring
+        )
+
+        ready = 0
+        while ready < num_workers:
+            try:
+                _, ok, error = self._results.get(timeout=1)
+            except queue.Empty:
+                if all(process.is_alive() for process in self._processes):
+                    continue
+                ok, error = False, f"A worker process of {self.name} exited"
+            if not ok:
+                self.close()
+                raise RuntimeError(error)
+            ready += 1
+        logger.info(f"Worker processes for {self.name} are ready.")
+
+        self._ids = itertools.count()
+        self._pending: Dict[int, Future] = {}
+        threading.Thread(
+            target=self._read_results,
+            args=(
+                self._results,
+                self._pending,
+                self._lock,
+                self._processes,
+                self._broken,
+            ),
+            name=f"{self.name}-results",
+            daemon=True,
+        ).start()
+
+    def submit(self, op: str, *args) -> Future:
+        """Queue a request for the next free worker."""
+        future = Future()
+        # the request can't be taken back from the worker, so it can't be cancelled
+        future.set_running_or_notify_cancel()
+        request_id = next(self._ids)
+        with self._lock:
+            if self._broken.is_set():
+                raise RuntimeError(f"The worker processes of {self.name} exited")
+            self._pending[request_id] = future
+        self._requests.put((request_id, op, args))
+        return future
+
+    def close(self) -> None:
+        """Stop the workers."""
+        with self._lock:
+            self._broken.set()
+        self._finalizer()
+
+    @staticmethod
+    def _read_results(
+        results: multiprocessing.Queue,
+        pending: Dict[int, Future],
+        lock: threading.Lock,
+        processes: List[multiprocessing.Process],
+        broken: threading.Event,
+    ) -> None:
+        # static, so the thread doesn't keep the pool alive
+        try:
+            # checked for every result, so a dead worker is noticed even while
+            # the others keep answering
+            while all(process.is_alive() for process in processes):
+                try:
+                    request_id, ok, result = results.get(timeout=1)
+                except queue.Empty:
+                    continue
+
+                with lock:
+                    future = pending.pop(request_id, None)
+                if future is None:
+                    continue
+                if ok:
+                    future.set_result(result)
+                else:
+                    future.set_exception(RuntimeError(result))
+        except (EOFError, OSError, ValueError):
+            # the queue was closed along with the pool
+            pass
+        finally:
+            # a worker died (or the pool was closed): fail what is left, and
+            # make submit() refuse new requests
+            with lock:
+                broken.set()
+                futures = list(pending.values())
+                pending.clear()
+            for future in futures:
+                future.set_exception(RuntimeError("Engine worker process exited"))
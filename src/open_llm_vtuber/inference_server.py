@@ -0,0 +1,192 @@
+"""
+The inference tier of a split deployment.
+
+Serves the ASR, TTS and LLM engines of a config to front servers (the usual
+`run_server.py`) whose characters use the `remote_asr`, `remote_tts` and
+`remote_llm` engines. Front servers only keep the WebSocket sessions, so they
+can be scaled out independently of the GPU machines running the models. The
+wire format is described in `remote_inference/protocol.py`.
+"""
+
+import asyncio
+import uuid
+from typing import Dict, Iterable
+
+import numpy as np
+from fastapi import APIRouter, FastAPI, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from loguru import logger
+
+from .agent.agent_factory import AgentFactory
+from .agent.stateless_llm.stateless_llm_interface import StatelessLLMInterface
+from .agent.stateless_llm_factory import LLMFactory as StatelessLLMFactory
+from .asr.asr_interface import ASRInterface
+from .asr.audio_buffer import AudioBuffer
+from .config_manager.utils import Config
+from .remote_inference.protocol import (
+    FRAME_CONTENT_TYPE,
+    FRAME_ERROR,
+    FRAME_TEXT,
+    PCM_CONTENT_TYPE,
+    SAMPLE_RATE_HEADER,
+    encode_frame,
+)
+from .service_context import ServiceContext
+from .tts.tts_interface import TTSInterface
+from .utils.http_client import aclose_http_clients, configure_http_client
+
+ENGINE_KINDS = ("asr", "tts", "llm")
+
+
+class InferenceServer:
+    def __init__(self, config: Config, engines: Iterable[str] = ENGINE_KINDS):
+        """
+        Load the engines selected in the config's character.
+
+        Args:
+            config (Config): The config. The process pool settings are honored.
+            engines: The kinds of engines to serve, among "asr", "tts" and "llm".
+        """
+        self.app = FastAPI()
+        configure_http_client(**config.system_config.http_client.model_dump())
+        self.app.add_event_handler("shutdown", aclose_http_clients)
+
+        self.context = ServiceContext()
+        self.context.config = config
+        self.context.system_config = config.system_config
+        self.context.character_config = config.character_config.model_copy(deep=True)
+        character_config = self.context.character_config
+
+        # engine name of each kind served here, reported by /health
+        self.engines: Dict[str, str] = {}
+        self.llm: StatelessLLMInterface | None = None
+
+        engines = set(engines)
+        unknown = engines - set(ENGINE_KINDS)
+        if unknown:
+            raise ValueError(f"Unknown engine kinds: {sorted(unknown)}")
+
+        if "asr" in engines:
+            asr_config = character_config.asr_config
+            self._check_not_remote("ASR", asr_config.asr_model)
+            self.context.init_asr(asr_config)
+            self.engines["asr"] = asr_config.asr_model
+        if "tts" in engines:
+            tts_config = character_config.tts_config
+            self._check_not_remote("TTS", tts_config.tts_model)
+            self.context.init_tts(tts_config)
+            self.engines["tts"] = tts_config.tts_model
+        if "llm" in engines:
+            self._init_llm()
+            self.app.add_event_handler("startup", self._warmup_llm)
+
+        self.app.add_event_handler("shutdown", self.context.close)
+        self.app.include_router(self._create_routes())
+        logger.info(f"Inference server engines: {self.engines}")
+
+    @staticmethod
+    def _check_not_remote(kind: str, engine_name: str) -> None:
+        if engine_name.startswith("remote_"):
+            raise ValueError(
+                f"The inference server can't use {engine_name} as its {kind} engine, "
+                "select a local engine in its config."
+            )
+
+    def _init_llm(self) -> None:
+        agent_config = self.context.character_config.agent_config
+        llm_choice = AgentFactory.get_llm_config(
+            agent_config.conversation_agent_choice,
+            agent_config.agent_settings.model_dump(),
+            agent_config.llm_configs.model_dump(),
+        )
+        if llm_choice is None:
+            raise ValueError(
+                f"The agent {agent_config.conversation_agent_choice} doesn't use a "
+                "stateless LLM, there is no LLM to serve."
+            )
+        llm_provider, llm_config = llm_choice
+        self._check_not_remote("LLM", llm_provider)
+        # front servers send the system prompt with every request
+        self.llm = StatelessLLMFactory.create_llm(
+            llm_provider=llm_provider, system_prompt="", **llm_config
+        )
+        self.engines["llm"] = llm_provider
+
+    async def _warmup_llm(self) -> None:
+        # the async LLM clients are bound to the loop they are first used in
+        if not self.context.system_config.engine_warmup:
+            return
+        try:
+            await self.llm.warmup()
+        except Exception as e:
+            logger.warning(f"LLM warmup failed: {e}")
+
+    def _engine(self, kind: str):
+        if kind not in self.engines:
+            raise HTTPException(404, f"No {kind} engine on this server")
+        if kind == "asr":
+            return self.context.asr_engine
+        if kind == "tts":
+            return self.context.tts_engine
+        return self.llm
+
+    def _create_routes(self) -> APIRouter:
+        router = APIRouter()
+
+        @router.get("/health")
+        async def health():
+            return {"status": "ok", "engines": self.engines}
+
+        @router.post("/asr/transcribe")
+        async def transcribe(request: Request):
+            asr: ASRInterface = self._engine("asr")
+            body = await request.body()
+            sample_rate = int(
+                request.headers.get(SAMPLE_RATE_HEADER, ASRInterface.SAMPLE_RATE)
+            )
+            audio = AudioBuffer(np.frombuffer(body, dtype="<i2"), sample_rate)
+            return {"text": await asr.async_transcribe_np(audio)}
+
+        @router.post("/tts/synthesize")
+        async def synthesize(request: Request):
+            tts: TTSInterface = self._engine("tts")
+            payload = await request.json()
+            audio = await tts.async_generate_audio(
+                payload["text"], f"remote_{uuid.uuid4().hex}"
+            )
+            if not audio:
+                return Response(b"", media_type=PCM_CONTENT_TYPE)
+
+            try:
+                if isinstance(audio, AudioBuffer):
+                    buffer = audio
+                else:
+                    buffer = await asyncio.to_thread(AudioBuffer.from_file, audio)
+                pcm = buffer.pcm16_bytes()
+            finally:
+                tts.remove_file(audio, verbose=False)
+            return Response(
+                pcm,
+                media_type=PCM_CONTENT_TYPE,
+                headers={SAMPLE_RATE_HEADER: str(buffer.sample_rate)},
+            )
+
+        @router.post("/llm/chat")
+        async def chat(request: Request):
+            llm: StatelessLLMInterface = self._engine("llm")
+            payload = await request.json()
+
+            async def frames():
+                try:
+                    async for chunk in llm.chat_completion(
+                        payload["messages"], payload.get("system")
+                    ):
+                        if chunk:
+                            yield encode_frame(FRAME_TEXT, chunk)
+                except Exception as e:
+                    logger.error(f"LLM failed while streaming: {e}")
+                    yield encode_frame(FRAME_ERROR, str(e))
+
+            return StreamingResponse(frames(), media_type=FRAME_CONTENT_TYPE)
+
+        return router
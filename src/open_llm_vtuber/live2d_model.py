@@ -1,4 +1,8 @@
+import copy
 import json
+import os
+import re
+import threading
 import chardet
 from loguru import logger
 
@@ -6,6 +10,12 @@ from loguru import logger
 # the process of sending the payload should be done by the caller
 # This class is **Not responsible** for sending the payload to the server
 
+# model_dict.json is parsed once per version of the file for the whole process,
+# since a Live2dModel is created for every config switch.
+# path -> (mtime_ns, size, parsed model dictionary)
+_model_dict_cache: dict[str, tuple[int, int, list]] = {}
+_model_dict_lock = threading.Lock()
+
 
 class Live2dModel:
     """
@@ -17,6 +27,7 @@ class Live2dModel:
         model_info (dict): The information of the Live2D model.
         emo_map (dict): The emotion map of the Live2D model.
         emo_str (str): The string representation of the emotion map of the Live2D model.
+        emo_pattern (re.Pattern): Matches the emotion tags (e.g. `[joy]`), case-insensitively. None if there are no emotions.
     """
 
     model_dict_path: str
@@ -24,6 +35,7 @@ class Live2dModel:
     model_info: dict
     emo_map: dict
     emo_str: str
+    emo_pattern: re.Pattern | None
 
     def __init__(
         self, live2d_model_name: str, model_dict_path: str = "model_dict.json"
@@ -51,6 +63,17 @@ class Live2dModel:
         self.emo_str: str = " ".join([f"[{key}]," for key in self.emo_map.keys()])
         # emo_str is a string of the keys in the emoMap dictionary. The keys are enclosed in square brackets.
         # example: `"[fear], [anger], [disgust], [sadness], [joy], [neutral], [surprise]"`
+        # matches any of the emotion tags, so a sentence is scanned only once
+        self.emo_pattern: re.Pattern | None = (
+            re.compile(
+                r"\[("
+                + "|".join(re.escape(key) for key in self.emo_map.keys())
+                + r")\]",
+                re.IGNORECASE,
+            )
+            if self.emo_map
+            else None
+        )
 
     def _load_file_content(self, file_path: str) -> str:
         """Load the content of a file with robust encoding handling."""
@@ -81,6 +104,20 @@ class Live2dModel:
 
         raise UnicodeError(f"Failed to decode {file_path} with any encoding")
 
+    def _load_model_dict(self) -> list:
+        """Parse the model dictionary, or reuse it if the file hasn't changed."""
+        stat_result = os.stat(self.model_dict_path)
+        version = (stat_result.st_mtime_ns, stat_result.st_size)
+        with _model_dict_lock:
+            cached = _model_dict_cache.get(self.model_dict_path)
+        if cached is not None and cached[:2] == version:
+            return cached[2]
+
+        model_dict = json.loads(self._load_file_content(self.model_dict_path))
+        with _model_dict_lock:
+            _model_dict_cache[self.model_dict_path] = (*version, model_dict)
+        return model_dict
+
     def _lookup_model_info(self, model_name: str) -> dict:
         """
         Find the model information from the model dictionary and return the information about the matched model.
@@ -103,8 +140,7 @@ class Live2dModel:
         self.live2d_model_name = model_name
 
         try:
-            file_content = self._load_file_content(self.model_dict_path)
-            model_dict = json.loads(file_content)
+            model_dict = self._load_model_dict()
         except FileNotFoundError as file_e:
             logger.critical(
                 f"Model dictionary file not found at {self.model_dict_path}."
@@ -141,7 +177,8 @@ class Live2dModel:
 
         logger.info("Model Information Loaded.")
 
-        return matched_model
+        # the cached dictionary is shared by all models
+        return copy.deepcopy(matched_model)
 
     def extract_emotion(self, str_to_check: str) -> list:
         """
@@ -154,22 +191,12 @@ class Live2dModel:
             list: A list of values of the emotions found in the string. An empty list is returned if no emotions are found.
         """
 
-        expression_list = []
-        str_to_check = str_to_check.lower()
-
-        i = 0
-        while i < len(str_to_check):
-            if str_to_check[i] != "[":
-                i += 1
-                continue
-            for key in self.emo_map.keys():
-                emo_tag = f"[{key}]"
-                if str_to_check[i : i + len(emo_tag)] == emo_tag:
-                    expression_list.append(self.emo_map[key])
-                    i += len(emo_tag) - 1
-                    break
-            i += 1
-        return expression_list
+        if self.emo_pattern is None:
+            return []
+        return [
+            self.emo_map[match.group(1).lower()]
+            for match in self.emo_pattern.finditer(str_to_check)
+        ]
 
     def remove_emotion_keywords(self, target_str: str) -> str:
         """
@@ -182,13 +209,6 @@ class Live2dModel:
             str: The cleaned string with the emotion keywords removed.
         """
 
-        lower_str = target_str.lower()
-
-        for key in self.emo_map.keys():
-            lower_key = f"[{key}]".lower()
-            while lower_key in lower_str:
-                start_index = lower_str.find(lower_key)
-                end_index = start_index + len(lower_key)
-                target_str = target_str[:start_index] + target_str[end_index:]
-                lower_str = lower_str[:start_index] + lower_str[end_index:]
-        return target_str
+        if self.emo_pattern is None:
+            return target_str
+        return self.emo_pattern.sub("", target_str)
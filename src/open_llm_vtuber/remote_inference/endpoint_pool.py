@@ -0,0 +1,215 @@
+"""
+Client-side load balancing over the inference servers of one engine kind.
+"""
+
+import threading
+import time
+import weakref
+from typing import AsyncIterator, List
+
+import httpx
+from loguru import logger
+
+from ..utils.http_client import get_async_http_client, get_http_client
+
+
+class Endpoint:
+    """One inference server, as seen by this front server."""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        self.in_flight = 0
+        self.healthy = True
+        # time.monotonic() after which an unhealthy endpoint is tried again
+        self.retry_at = 0.0
+
+    def __repr__(self) -> str:
+        state = "up" if self.healthy else "down"
+        return f"Endpoint({self.url}, {state}, in_flight={self.in_flight})"
+
+
+class EndpointPool:
+    """
+    Sends each request to the healthy inference server with the fewest requests
+    in flight, and fails over to the next one if it can't be reached.
+
+    A server that fails is skipped for `retry_after` seconds, and a background
+    thread checks `/health` on every server each `health_check_interval`
+    seconds, so servers that come back (or lose the engine) are noticed
+    without waiting for a request to fail.
+    """
+
+    def __init__(
+        self,
+        urls: List[str],
+        kind: str,
+        health_check_interval: float = 10.0,
+        retry_after: float = 5.0,
+    ):
+        """
+        Args:
+            urls: Base URLs of the inference servers (e.g. "http://10.0.0.5:12394").
+            kind (str): "asr", "tts" or "llm". Servers that don't host an engine
+                of this kind are reported unhealthy.
+            health_check_interval (float): Seconds between health checks, 0 to
+                disable them.
+            retry_after (float): Seconds before a failed server is tried again.
+        """
+        if not urls:
+            raise ValueError(f"No inference server URL configured for {kind}")
+        self.kind = kind
+        self.retry_after = retry_after
+        self.endpoints = [Endpoint(url) for url in urls]
+        self._lock = threading.Lock()
+
+        if health_check_interval > 0:
+            threading.Thread(
+                target=self._health_loop,
+                args=(weakref.ref(self), health_check_interval),
+                name=f"remote-{kind}-health",
+                daemon=True,
+            ).start()
+
+    # ==== selection
+
+    def _acquire(self, tried: List[Endpoint]) -> Endpoint:
+        with self._lock:
+            now = time.monotonic()
+            candidates = [e for e in self.endpoints if e not in tried]
+            available = [e for e in candidates if e.healthy or now >= e.retry_at]
+            if not available:
+                # everything is down: try the server that failed first anyway
+                available = sorted(candidates, key=lambda e: e.retry_at)[:1]
+            endpoint = min(available, key=lambda e: e.in_flight)
+            endpoint.in_flight += 1
+            return endpoint
+
+    def _release(self, endpoint: Endpoint, error: Exception | None = None) -> None:
+        with self._lock:
+            endpoint.in_flight -= 1
+        if error is not None:
+            self.mark_down(endpoint, error)
+
+    def mark_down(self, endpoint: Endpoint, reason) -> None:
+        with self._lock:
+            was_healthy = endpoint.healthy
+            endpoint.healthy = False
+            endpoint.retry_at = time.monotonic() + self.retry_after
+        if was_healthy:
+            logger.warning(
+                f"Remote {self.kind} server {endpoint.url} is down: {reason}"
+            )
+
+    def mark_up(self, endpoint: Endpoint) -> None:
+        with self._lock:
+            was_healthy = endpoint.healthy
+            endpoint.healthy = True
+        if not was_healthy:
+            logger.info(f"Remote {self.kind} server {endpoint.url} is back up.")
+
+    def _can_retry(self, tried: List[Endpoint], error: Exception) -> bool:
+        if len(tried) >= len(self.endpoints):
+            return False
+        logger.warning(
+            f"Remote {self.kind} request to {tried[-1].url} failed ({error}), "
+            "trying the next server."
+        )
+        return True
+
+    # ==== requests
+
+    def request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send a request to the best server and return its successful response."""
+        client = get_http_client()
+        tried: List[Endpoint] = []
+        while True:
+            endpoint = self._acquire(tried)
+            tried.append(endpoint)
+            try:
+                response = client.request(method, endpoint.url + path, **kwargs)
+            except httpx.TransportError as e:
+                self._release(endpoint, e)
+                if self._can_retry(tried, e):
+                    continue
+                raise
+            self._release(endpoint)
+            return response.raise_for_status()
+
+    async def arequest(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Async version of `request`."""
+        client = get_async_http_client()
+        tried: List[Endpoint] = []
+        while True:
+            endpoint = self._acquire(tried)
+            tried.append(endpoint)
+            try:
+                response = await client.request(method, endpoint.url + path, **kwargs)
+            except httpx.TransportError as e:
+                self._release(endpoint, e)
+                if self._can_retry(tried, e):
+                    continue
+                raise
+            self._release(endpoint)
+            return response.raise_for_status()
+
+    async def astream(self, method: str, path: str, **kwargs) -> AsyncIterator[bytes]:
+        """
+        Send a request and yield the body as it arrives.
+
+        Fails over to the next server only until the first bytes are received;
+        after that the caller has already used part of the answer.
+        """
+        client = get_async_http_client()
+        tried: List[Endpoint] = []
+        while True:
+            endpoint = self._acquire(tried)
+            tried.append(endpoint)
+            received = False
+            error = None
+            try:
+                async with client.stream(
+                    method, endpoint.url + path, **kwargs
+                ) as response:
+                    response.raise_for_status()
+                    async for chunk in response.aiter_bytes():
+                        received = True
+                        yield chunk
+                return
+            except httpx.TransportError as e:
+                error = e
+                if received or not self._can_retry(tried, e):
+                    raise
+            finally:
+                self._release(endpoint, error)
+
+    # ==== health checks
+
+    def check_health(self) -> None:
+        """Ask every server whether it is up and hosts an engine of our kind."""
+        client = get_http_client()
+        for endpoint in self.endpoints:
+            try:
+                response = client.get(endpoint.url + "/health", timeout=5.0)
+                response.raise_for_status()
+                engines = response.json().get("engines", {})
+            except (httpx.HTTPError, ValueError) as e:
+                self.mark_down(endpoint, e)
+                continue
+            if self.kind in engines:
+                self.mark_up(endpoint)
+            else:
+                self.mark_down(endpoint, f"it doesn't host an {self.kind} engine")
+
+    @staticmethod
+    def _health_loop(pool_ref: weakref.ref, interval: float) -> None:
+        # holds only a weak reference, so the thread ends with the pool
+        while True:
+            time.sleep(interval)
+            pool = pool_ref()
+            if pool is None:
+                return
+            try:
+                pool.check_health()
+            except Exception as e:
+                logger.error(f"Health check of remote {pool.kind} servers failed: {e}")
+            del pool
@@ -0,0 +1,60 @@
+"""
+The wire format between the front servers and `run_inference_server.py`.
+
+Everything goes over plain HTTP, so the shared keep-alive connection pool is
+reused for every request:
+
+- `POST /asr/transcribe`: raw little-endian 16-bit mono PCM in the body, its
+  sample rate in the `X-Sample-Rate` header. Answers `{"text": ...}`.
+- `POST /tts/synthesize`: `{"text": ...}`. Answers the speech as raw 16-bit
+  mono PCM with its rate in `X-Sample-Rate`, or an empty body if there is
+  nothing to say.
+- `POST /llm/chat`: `{"messages": [...], "system": ...}`. Answers a stream of
+  frames, each a 1-byte type and a 4-byte big-endian length followed by the
+  UTF-8 payload, so chunks are forwarded as soon as the model yields them.
+- `GET /health`: `{"status": "ok", "engines": {"asr": ..., ...}}`.
+"""
+
+import struct
+from typing import Iterator, Tuple
+
+SAMPLE_RATE_HEADER = "X-Sample-Rate"
+PCM_CONTENT_TYPE = "application/octet-stream"
+FRAME_CONTENT_TYPE = "application/x-llm-vtuber-frames"
+
+# LLM stream frame types
+FRAME_TEXT = 1
+FRAME_ERROR = 2
+
+_FRAME_HEADER = struct.Struct(">BI")
+
+
+def encode_frame(frame_type: int, text: str) -> bytes:
+    """Pack one frame of the LLM stream."""
+    payload = text.encode("utf-8")
+    return _FRAME_HEADER.pack(frame_type, len(payload)) + payload
+
+
+class FrameDecoder:
+    """Splits the bytes of an LLM stream back into frames, whatever the
+    boundaries of the network chunks."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> Iterator[Tuple[int, str]]:
+        """Add received bytes and yield the (type, text) frames they complete."""
+        self._buffer += data
+        while len(self._buffer) >= _FRAME_HEADER.size:
+            frame_type, length = _FRAME_HEADER.unpack_from(self._buffer)
+            end = _FRAME_HEADER.size + length
+            if len(self._buffer) < end:
+                return
+            payload = bytes(self._buffer[_FRAME_HEADER.size : end])
+            del self._buffer[:end]
+            yield frame_type, payload.decode("utf-8")
+
+    @property
+    def pending(self) -> int:
+        """Bytes of an incomplete frame left in the buffer."""
+        return len(self._buffer)
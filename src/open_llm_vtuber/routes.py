@@ -1,22 +1,13 @@
-import json
-import asyncio
-import numpy as np
 from fastapi import APIRouter, WebSocket
+from fastapi.responses import JSONResponse
 from starlette.websockets import WebSocketDisconnect
-from loguru import logger
-from .conversation import conversation_chain
+from .client_session import ClientSession
 from .service_context import ServiceContext
-from .config_manager.utils import (
-    scan_config_alts_directory,
-    scan_bg_directory,
-)
-from .chat_history_manager import (
-    create_new_history,
-    store_message,
-    modify_latest_message,
-    get_history,
-    delete_history,
-    get_history_list,
+from .utils.engine_cache import engine_cache
+from .utils.ws_compression import (
+    CompressionPolicy,
+    compression_stats,
+    negotiate_subprotocol,
 )
 
 
@@ -26,240 +17,47 @@ def create_routes(default_context_cache: ServiceContext):
 
     @router.websocket("/client-ws")
     async def websocket_endpoint(websocket: WebSocket):
-        await websocket.accept()
-
-        session_service_context: ServiceContext = ServiceContext()
-        session_service_context.load_cache(
-            config=default_context_cache.config,
-            system_config=default_context_cache.system_config,
-            character_config=default_context_cache.character_config,
-            live2d_model=default_context_cache.live2d_model,
-            asr_engine=default_context_cache.asr_engine,
-            tts_engine=default_context_cache.tts_engine,
-            agent_engine=default_context_cache.agent_engine,
-            translate_engine=default_context_cache.translate_engine,
-        )
-
-        await websocket.send_text(
-            json.dumps({"type": "full-text", "text": "Connection established"})
+        websocket_config = default_context_cache.system_config.websocket
+        subprotocols = websocket.scope.get("subprotocols", [])
+        # the client may offer MessagePack and/or compression as a
+        # subprotocol, plain JSON otherwise
+        codec, subprotocol, compress = negotiate_subprotocol(
+            subprotocols,
+            allow_msgpack=websocket_config.msgpack,
+            allow_deflate=bool(websocket_config.compress_types),
         )
-
-        connected_clients.append(websocket)
-        logger.info("Connection established")
-
-        await websocket.send_text(
-            json.dumps(
-                {
-                    "type": "set-model-and-conf",
-                    "model_info": session_service_context.live2d_model.model_info,
-                    "conf_name": session_service_context.character_config.conf_name,
-                    "conf_uid": session_service_context.character_config.conf_uid,
-                }
+        compression = (
+            CompressionPolicy(
+                websocket_config.compress_types,
+                min_size=websocket_config.compress_min_size,
+                level=websocket_config.compress_level,
             )
+            if compress
+            else None
         )
-        received_data_buffer = np.array([])
-        # start mic
-        await websocket.send_text(json.dumps({"type": "control", "text": "start-mic"}))
-
-        current_conversation_task: asyncio.Task | None = None
-
+        await websocket.accept(subprotocol=subprotocol)
+        session = ClientSession(websocket, default_context_cache, codec, compression)
+        connected_clients.append(websocket)
         try:
-            while True:
-                message = await websocket.receive_text()
-                data = json.loads(message)
-
-                # ==== chat history related ====
-
-                if data.get("type") == "fetch-history-list":
-                    histories = get_history_list(
-                        session_service_context.character_config.conf_uid
-                    )
-                    await websocket.send_text(
-                        json.dumps({"type": "history-list", "histories": histories})
-                    )
-
-                elif data.get("type") == "fetch-and-set-history":
-                    history_uid = data.get("history_uid")
-                    if history_uid:
-                        current_history_uid = history_uid
-                        session_service_context.agent_engine.set_memory_from_history(
-                            conf_uid=session_service_context.character_config.conf_uid,
-                            history_uid=history_uid,
-                        )
-                        messages = [
-                            msg
-                            for msg in get_history(
-                                session_service_context.character_config.conf_uid,
-                                history_uid,
-                            )
-                            if msg["role"] != "system"
-                        ]
-                        await websocket.send_text(
-                            json.dumps({"type": "history-data", "messages": messages})
-                        )
-
-                elif data.get("type") == "create-new-history":
-                    current_history_uid = create_new_history(
-                        session_service_context.character_config.conf_uid
-                    )
-                    session_service_context.agent_engine.set_memory_from_history(
-                        conf_uid=session_service_context.character_config.conf_uid,
-                        history_uid=current_history_uid,
-                    )
-                    await websocket.send_text(
-                        json.dumps(
-                            {
-                                "type": "new-history-created",
-                                "history_uid": current_history_uid,
-                            }
-                        )
-                    )
-
-                elif data.get("type") == "delete-history":
-                    history_uid = data.get("history_uid")
-                    if history_uid:
-                        success = delete_history(
-                            session_service_context.character_config.conf_uid,
-                            history_uid,
-                        )
-                        await websocket.send_text(
-                            json.dumps(
-                                {
-                                    "type": "history-deleted",
-                                    "success": success,
-                                    "history_uid": history_uid,
-                                }
-                            )
-                        )
-                        if history_uid == current_history_uid:
-                            current_history_uid = None
-
-                # ==== conversation related ====
-
-                elif data.get("type") == "interrupt-signal":
-                    if current_conversation_task is None:
-                        logger.warning(
-                            "❌ Conversation task was NOT cancelled because there is no running conversation."
-                        )
-                    else:
-                        # Cancelling the task... and see if it was a success
-                        if not current_conversation_task.cancel():
-                            logger.warning(
-                                "❌ Conversation task was NOT cancelled for some reason."
-                            )
-                        else:
-                            logger.info(
-                                "🛑 Conversation task was succesfully interrupted."
-                            )
-                    # The part of the AI response heard by the user before interruption
-                    # is sent back from the frontend as an interruption signal
-                    # We'll store this in chat history instead of the full response
-                    heard_ai_response = data.get("text", "")
-
-                    try:
-                        session_service_context.agent_engine.handle_interrupt(
-                            heard_ai_response
-                        )
-                    except Exception as e:
-                        logger.error(f"Error handling interrupt: {e}")
-
-                    if not modify_latest_message(
-                        conf_uid=session_service_context.character_config.conf_uid,
-                        history_uid=current_history_uid,
-                        role="ai",
-                        new_content=heard_ai_response,
-                    ):
-                        logger.warning("Failed to modify message.")
-                    logger.info(
-                        f"💾 Stored Paritial AI message: '''{heard_ai_response}'''"
-                    )
-
-                    store_message(
-                        conf_uid=session_service_context.character_config.conf_uid,
-                        history_uid=current_history_uid,
-                        role="system",
-                        content="[Interrupted by user]",
-                    )
-
-                # Default sampleRate = 16000, frameSamples = 512, buffer window = 32ms
-                elif data.get("type") == "mic-audio-data":
-                    received_data_buffer = np.append(
-                        received_data_buffer,
-                        np.array(data.get("audio"), dtype=np.float32),
-                    )
-
-                elif data.get("type") in [
-                    "mic-audio-end",
-                    "text-input",
-                    "ai-speak-signal",
-                ]:
-                    await websocket.send_text(
-                        json.dumps({"type": "full-text", "text": "Thinking..."})
-                    )
-
-                    if data.get("type") == "ai-speak-signal":
-                        user_input = ""
-                        await websocket.send_text(
-                            json.dumps(
-                                {
-                                    "type": "full-text",
-                                    "text": "AI wants to speak something...",
-                                }
-                            )
-                        )
-                    elif data.get("type") == "text-input":
-                        user_input = data.get("text")
-                    else:
-                        user_input = received_data_buffer
-
-                    received_data_buffer = np.array([])
-
-                    # Get images if present
-                    images = data.get("images")
-
-                    logger.debug(f"data: {data}")
-
-                    # Initiate conversation chain task asynchronously
-                    # We'll store the task object so we can cancel it if needed
-                    # We'll NOT await the task here, so we can continue to receive messages
-                    current_conversation_task: asyncio.Task = asyncio.create_task(
-                        conversation_chain(
-                            user_input=user_input,
-                            asr_engine=session_service_context.asr_engine,
-                            tts_engine=session_service_context.tts_engine,
-                            agent_engine=session_service_context.agent_engine,
-                            live2d_model=session_service_context.live2d_model,
-                            websocket_send=websocket.send_text,
-                            conf_uid=session_service_context.character_config.conf_uid,
-                            history_uid=current_history_uid,
-                            images=images,
-                        )
-                    )
-
-                elif data.get("type") == "fetch-configs":
-                    config_files = scan_config_alts_directory(
-                        session_service_context.system_config.config_alts_dir
-                    )
-                    # logger.info("Sending config files +++++")
-                    # logger.debug({"type": "config-files", "configs": config_files})
-                    await websocket.send_text(
-                        json.dumps({"type": "config-files", "configs": config_files})
-                    )
-                elif data.get("type") == "switch-config":
-                    config_file_name: str = data.get("file")
-                    if config_file_name:
-                        await session_service_context.handle_config_switch(
-                            websocket, config_file_name
-                        )
-                elif data.get("type") == "fetch-backgrounds":
-                    bg_files = scan_bg_directory()
-                    await websocket.send_text(
-                        json.dumps({"type": "background-files", "files": bg_files})
-                    )
-                else:
-                    logger.info("Unknown data type received.")
-
+            await session.start()
+            await session.receive_loop()
         except WebSocketDisconnect:
             connected_clients.remove(websocket)
+        finally:
+            await session.close()
+
+    @router.get("/ready")
+    async def readiness():
+        """Report whether all engines are loaded, with their startup timings."""
+        ready = default_context_cache.ready
+        return JSONResponse(
+            {
+                "ready": ready,
+                "engines": default_context_cache.engine_timings,
+                "engine_cache": engine_cache.stats(),
+                "websocket_compression": compression_stats.stats(),
+            },
+            status_code=200 if ready else 503,
+        )
 
     return router
@@ -1,21 +1,19 @@
 import os
 import shutil
+import threading
 
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
 from .routes import create_routes
+from .static_files import CachedStaticFiles, HotFileCache
 from .service_context import ServiceContext
 from .config_manager.utils import Config
+from .utils.http_client import configure_http_client, aclose_http_clients
+from .utils.engine_cache import engine_cache
 
-
-class CustomStaticFiles(StaticFiles):
-    async def get_response(self, path, scope):
-        response = await super().get_response(path, scope)
-        if path.endswith(".js"):
-            response.headers["Content-Type"] = "application/javascript"
-        return response
+# precompressed static files, kept across restarts by clean_cache
+STATIC_SIDECAR_DIR = os.path.join("cache", "static")
 
 
 class WebSocketServer:
@@ -31,9 +29,16 @@ class WebSocketServer:
             allow_headers=["*"],
         )
 
+        # Configure the connection pool shared by HTTP-based engines
+        configure_http_client(**config.system_config.http_client.model_dump())
+        self.app.add_event_handler("shutdown", aclose_http_clients)
+        engine_cache.configure(**config.system_config.engine_cache.model_dump())
+
         # Load configurations and initialize the default context cache
         default_context_cache = ServiceContext()
         default_context_cache.load_from_config(config)
+        # the LLM client has to be warmed up on the server's event loop
+        self.app.add_event_handler("startup", default_context_cache.warmup_agent)
 
         # Include routes
         self.app.include_router(
@@ -41,27 +46,54 @@ class WebSocketServer:
         )
 
         # Mount static files
-        self.app.mount(
-            "/live2d-models",
-            StaticFiles(directory="live2d-models"),
-            name="live2d-models",
-        )
-        self.app.mount(
-            "/bg",
-            StaticFiles(directory="backgrounds"),
-            name="backgrounds",
-        )
-        self.app.mount(
-            "/", CustomStaticFiles(directory="./frontend", html=True), name="frontend"
+        static_config = config.system_config.static_files
+        static_options = dict(
+            sidecar_dir=None,
+            # one memory budget for all the directories
+            hot_cache=HotFileCache(static_config.hot_cache_mb * 1024 * 1024),
+            max_cached_file_mb=static_config.max_cached_file_mb,
+            min_compress_size=static_config.min_compress_size,
         )
+        self.static_files = []
+        for path, directory, name, html in (
+            ("/live2d-models", "live2d-models", "live2d-models", False),
+            ("/bg", "backgrounds", "backgrounds", False),
+            ("/", "./frontend", "frontend", True),
+        ):
+            if static_config.precompress:
+                static_options["sidecar_dir"] = os.path.join(STATIC_SIDECAR_DIR, name)
+            static_files = CachedStaticFiles(
+                directory=directory, html=html, **static_options
+            )
+            self.static_files.append(static_files)
+            self.app.mount(path, static_files, name=name)
+        self.app.add_event_handler("startup", self._start_precompress)
+
+    def _start_precompress(self):
+        """Compress the static files in the background, they are served meanwhile."""
+
+        def precompress():
+            for static_files in self.static_files:
+                static_files.precompress()
+
+        threading.Thread(target=precompress, daemon=True).start()
 
     def run(self):
         pass
 
     @staticmethod
     def clean_cache():
-        """Clean the cache directory by removing and recreating it."""
+        """
+        Clean the cache directory, except for the precompressed static files,
+        which would otherwise be compressed again at every start.
+        """
         cache_dir = "./cache"
-        if os.path.exists(cache_dir):
-            shutil.rmtree(cache_dir)
-            os.makedirs(cache_dir)
+        if not os.path.exists(cache_dir):
+            return
+        for entry in os.scandir(cache_dir):
+            if os.path.normpath(entry.path) == STATIC_SIDECAR_DIR:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                os.remove(entry.path)
@@ -1,20 +1,28 @@
-import os
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict
 
 from loguru import logger
-from fastapi import WebSocket
 
 from prompts import prompt_loader
 from .live2d_model import Live2dModel
 from .asr.asr_interface import ASRInterface
 from .tts.tts_interface import TTSInterface
 from .agent.agents.agent_interface import AgentInterface
+from .agent.stateless_llm.stateless_llm_interface import StatelessLLMInterface
 from .translate.translate_interface import TranslateInterface
+from .vad.vad_interface import VADInterface
 
 from .asr.asr_factory import ASRFactory
 from .tts.tts_factory import TTSFactory
 from .agent.agent_factory import AgentFactory
+from .agent.stateless_llm_factory import LLMFactory as StatelessLLMFactory
 from .translate.translate_factory import TranslateFactory
+from .vad.vad_factory import VADFactory
+from .engine_pool.pooled_engines import PooledASR, PooledTTS
+from .utils.engine_cache import engine_cache
+from .utils.websocket_sender import WebSocketSender
 
 from .config_manager import (
     Config,
@@ -24,8 +32,10 @@ from .config_manager import (
     ASRConfig,
     TTSConfig,
     TranslatorConfig,
-    read_yaml,
-    validate_config,
+    TTSPreprocessorConfig,
+    VADConfig,
+    config_catalog,
+    diff_configs,
 )
 
 
@@ -41,12 +51,24 @@ class ServiceContext:
         self.live2d_model: Live2dModel = None
         self.asr_engine: ASRInterface = None
         self.tts_engine: TTSInterface = None
+        # the stateless LLM is shared between sessions, the agent (and its
+        # memory) belongs to this context only
+        self.llm_engine: StatelessLLMInterface = None
         self.agent_engine: AgentInterface = None
         self.translate_engine: TranslateInterface = None
+        # VAD keeps the state of one audio stream, so it is never shared
+        self.vad_engine: VADInterface = None
 
         # the system prompt is a combination of the persona prompt and live2d expression prompt
         self.system_prompt: str = None
 
+        # seconds spent initializing each engine during the last load_from_config
+        self.engine_timings: Dict[str, float] = {}
+        # True once every engine of this context is loaded and warmed up
+        self.ready: bool = False
+        # the agent instance that has already been warmed up
+        self._warm_agent: AgentInterface = None
+
     def __str__(self):
         return (
             f"ServiceContext:\n"
@@ -57,7 +79,8 @@ class ServiceContext:
             f"    Config: {json.dumps(self.character_config.asr_config.model_dump(), indent=6) if self.character_config.asr_config else 'None'}\n"
             f"  TTS Engine: {type(self.tts_engine).__name__ if self.tts_engine else 'Not Loaded'}\n"
             f"    Config: {json.dumps(self.character_config.tts_config.model_dump(), indent=6) if self.character_config.tts_config else 'None'}\n"
-            f"  LLM Engine: {type(self.agent_engine).__name__ if self.agent_engine else 'Not Loaded'}\n"
+            f"  LLM Engine: {type(self.llm_engine).__name__ if self.llm_engine else 'Not Loaded'}\n"
+            f"  Agent: {type(self.agent_engine).__name__ if self.agent_engine else 'Not Loaded'}\n"
             f"    Agent Config: {json.dumps(self.character_config.agent_config.model_dump(), indent=6) if self.character_config.agent_config else 'None'}\n"
             f"  System Prompt: {self.system_prompt or 'Not Set'}"
         )
@@ -72,12 +95,16 @@ class ServiceContext:
         live2d_model: Live2dModel,
         asr_engine: ASRInterface,
         tts_engine: TTSInterface,
-        agent_engine: AgentInterface,
+        llm_engine: StatelessLLMInterface,
         translate_engine: TranslateInterface,
+        system_prompt: str,
     ) -> None:
         """
         Load the ServiceContext with the reference of the provided instances.
         Pass by reference so no reinitialization will be done.
+
+        The agent is not shared: a new one with its own memory is created around
+        the shared stateless LLM, so sessions don't see each other's history.
         """
         if not character_config:
             raise ValueError("character_config cannot be None")
@@ -86,12 +113,26 @@ class ServiceContext:
 
         self.config = config
         self.system_config = system_config
-        self.character_config = character_config
+        # copied, because the init_* methods record the loaded configs in it
+        self.character_config = character_config.model_copy(deep=True)
         self.live2d_model = live2d_model
         self.asr_engine = asr_engine
         self.tts_engine = tts_engine
-        self.agent_engine = agent_engine
+        self.llm_engine = llm_engine
+        engine_cache.retain(asr_engine)
+        engine_cache.retain(tts_engine)
+        engine_cache.retain(llm_engine)
         self.translate_engine = translate_engine
+        self.system_prompt = system_prompt
+        self.init_vad(self.character_config.vad_config)
+        self.agent_engine = self._create_agent(
+            self.character_config.agent_config,
+            system_prompt,
+            self.character_config.tts_preprocessor_config,
+        )
+        # the shared engines were warmed up by the context they come from
+        self._warm_agent = self.agent_engine
+        self.ready = True
 
         logger.debug(f"Loaded service context with cache: {character_config}")
 
@@ -100,9 +141,26 @@ class ServiceContext:
         Load the ServiceContext with the config.
         Reinitialize the instances if the config is different.
 
+        On a config switch, only the engines whose part of the character config
+        changed are touched.
+
         Parameters:
         - config (Dict): The configuration dictionary.
         """
+        # None on the first load, when everything is initialized
+        changed = (
+            diff_configs(self.character_config, config.character_config)
+            if self.character_config
+            else None
+        )
+        if changed is not None:
+            logger.debug(f"Changed character config fields: {sorted(changed)}")
+
+        def needs(field: str) -> bool:
+            return changed is None or any(
+                path == field or path.startswith(f"{field}.") for path in changed
+            )
+
         if not self.config:
             self.config = config
 
@@ -113,24 +171,85 @@ class ServiceContext:
             self.character_config = config.character_config
 
         # update all sub-configs
+        self.ready = False
+        self.engine_timings = {}
+        start = time.perf_counter()
+
+        # ASR, TTS and the translator don't depend on anything else, so they are
+        # loaded in worker threads while Live2D and the agent are set up here.
+        with ThreadPoolExecutor(
+            max_workers=3, thread_name_prefix="engine-init"
+        ) as executor:
+            futures = []
+            if needs("asr_config"):
+                futures.append(
+                    executor.submit(
+                        self._timed,
+                        "ASR",
+                        self.init_asr,
+                        config.character_config.asr_config,
+                    )
+                )
+            if needs("tts_config"):
+                futures.append(
+                    executor.submit(
+                        self._timed,
+                        "TTS",
+                        self.init_tts,
+                        config.character_config.tts_config,
+                    )
+                )
+            # the translator is needed by the agent, which feeds it the TTS text
+            translate_future = None
+            if needs("tts_preprocessor_config.translator_config"):
+                translate_future = executor.submit(
+                    self._timed,
+                    "Translator",
+                    self.init_translate,
+                    config.character_config.tts_preprocessor_config.translator_config,
+                )
 
-        # init live2d from character config
-        self.init_live2d(config.character_config.live2d_model_name)
-
-        # init asr from character config
-        self.init_asr(config.character_config.asr_config)
+            # the agent's system prompt needs the live2d expressions
+            live2d_changed = changed is not None and needs("live2d_model_name")
+            if needs("live2d_model_name"):
+                self._timed(
+                    "Live2D",
+                    self.init_live2d,
+                    config.character_config.live2d_model_name,
+                )
+            if needs("vad_config"):
+                self._timed("VAD", self.init_vad, config.character_config.vad_config)
+            translator_changed = (
+                translate_future.result() if translate_future is not None else False
+            )
+            # the agent also holds the TTS preprocessing settings
+            if (
+                needs("agent_config")
+                or needs("persona_prompt")
+                or needs("tts_preprocessor_config")
+                or translator_changed
+                or live2d_changed
+            ):
+                self._timed(
+                    "Agent",
+                    self.init_agent,
+                    config.character_config.agent_config,
+                    config.character_config.persona_prompt,
+                    config.character_config.tts_preprocessor_config,
+                    force_reload=translator_changed or live2d_changed,
+                )
 
-        # init tts from character config
-        self.init_tts(config.character_config.tts_config)
+            for future in futures:
+                future.result()
 
-        # init agent from character config
-        self.init_agent(
-            config.character_config.agent_config,
-            config.character_config.persona_prompt,
+        report = ", ".join(
+            f"{name}: {seconds:.2f}s" for name, seconds in self.engine_timings.items()
         )
-
-        self.init_translate(
-            config.character_config.tts_preprocessor_config.translator_config
+        logger.info(f"Engines loaded in {time.perf_counter() - start:.2f}s ({report})")
+        # the agent is warmed up separately on the event loop, see warmup_agent
+        self.ready = (
+            not self.system_config.engine_warmup
+            or self.agent_engine is self._warm_agent
         )
 
         # store typed config references
@@ -150,10 +269,28 @@ class ServiceContext:
     def init_asr(self, asr_config: ASRConfig) -> None:
         if not self.asr_engine or (self.character_config.asr_config != asr_config):
             logger.info(f"Initializing ASR: {asr_config.asr_model}")
-            self.asr_engine = ASRFactory.get_asr_system(
-                asr_config.asr_model,
-                **getattr(asr_config, asr_config.asr_model).model_dump(),
+            engine_config = getattr(asr_config, asr_config.asr_model).model_dump()
+
+            def create_asr() -> ASRInterface:
+                num_workers = self.system_config.process_pool.asr_workers
+                if num_workers > 0:
+                    return PooledASR(
+                        asr_config.asr_model,
+                        engine_config,
+                        num_workers,
+                        warmup=self.system_config.engine_warmup,
+                    )
+                engine = ASRFactory.get_asr_system(
+                    asr_config.asr_model, **engine_config
+                )
+                self._warmup_engine("ASR", engine.warmup)
+                return engine
+
+            previous_engine = self.asr_engine
+            self.asr_engine = engine_cache.acquire(
+                "asr", asr_config.asr_model, engine_config, create_asr
             )
+            engine_cache.release(previous_engine)
             # saving config should be done after successful initialization
             self.character_config.asr_config = asr_config
         else:
@@ -162,23 +299,76 @@ class ServiceContext:
     def init_tts(self, tts_config: TTSConfig) -> None:
         if not self.tts_engine or (self.character_config.tts_config != tts_config):
             logger.info(f"Initializing TTS: {tts_config.tts_model}")
-            self.tts_engine = TTSFactory.get_tts_engine(
-                tts_config.tts_model,
-                **getattr(tts_config, tts_config.tts_model.lower()).model_dump(),
+            engine_config = getattr(
+                tts_config, tts_config.tts_model.lower()
+            ).model_dump()
+
+            def create_tts() -> TTSInterface:
+                num_workers = self.system_config.process_pool.tts_workers
+                if num_workers > 0:
+                    return PooledTTS(
+                        tts_config.tts_model,
+                        engine_config,
+                        num_workers,
+                        warmup=self.system_config.engine_warmup,
+                    )
+                engine = TTSFactory.get_tts_engine(
+                    tts_config.tts_model, **engine_config
+                )
+                self._warmup_engine("TTS", engine.warmup)
+                return engine
+
+            previous_engine = self.tts_engine
+            self.tts_engine = engine_cache.acquire(
+                "tts", tts_config.tts_model, engine_config, create_tts
             )
+            engine_cache.release(previous_engine)
             # saving config should be done after successful initialization
             self.character_config.tts_config = tts_config
         else:
             logger.info("TTS already initialized with the same config.")
 
-    def init_agent(self, agent_config: AgentConfig, persona_prompt: str) -> None:
-        """Initialize or update the LLM engine based on agent configuration."""
+    def init_vad(self, vad_config: VADConfig) -> None:
+        if self.vad_engine and self.character_config.vad_config == vad_config:
+            logger.info("VAD already initialized with the same config.")
+            return
+
+        if not vad_config.vad_model:
+            logger.debug("Server-side VAD is disabled.")
+            self.vad_engine = None
+        else:
+            logger.info(f"Initializing VAD: {vad_config.vad_model}")
+            self.vad_engine = VADFactory.get_vad_engine(
+                vad_config.vad_model,
+                **getattr(vad_config, vad_config.vad_model).model_dump(),
+            )
+        self.character_config.vad_config = vad_config
+
+    def init_agent(
+        self,
+        agent_config: AgentConfig,
+        persona_prompt: str,
+        tts_preprocessor_config: TTSPreprocessorConfig,
+        force_reload: bool = False,
+    ) -> None:
+        """Initialize or update the LLM engine based on agent configuration.
+
+        Parameters:
+        - agent_config (AgentConfig): The agent configuration.
+        - persona_prompt (str): The persona prompt.
+        - tts_preprocessor_config (TTSPreprocessorConfig): How the agent prepares
+            its sentences for the TTS.
+        - force_reload (bool): Recreate the agent even if its config is unchanged,
+            e.g. because the translator it uses was replaced.
+        """
         logger.info(f"Initializing Agent: {agent_config.conversation_agent_choice}")
 
         if (
-            self.agent_engine is not None
+            not force_reload
+            and self.agent_engine is not None
             and agent_config == self.character_config.agent_config
             and persona_prompt == self.character_config.persona_prompt
+            and tts_preprocessor_config == self.character_config.tts_preprocessor_config
         ):
             logger.debug("Agent already initialized with the same config.")
             return
@@ -186,13 +376,12 @@ class ServiceContext:
         system_prompt = self.construct_system_prompt(persona_prompt)
 
         try:
-            self.agent_engine = AgentFactory.create_agent(
-                conversation_agent_choice=agent_config.conversation_agent_choice,
-                agent_settings=agent_config.agent_settings.model_dump(),
-                llm_configs=agent_config.llm_configs.model_dump(),
-                system_prompt=system_prompt,
-                live2d_model=self.live2d_model,
-                tts_preprocessor_config=self.character_config.tts_preprocessor_config,
+            previous_llm = self.llm_engine
+            self.llm_engine = self._acquire_llm(agent_config, system_prompt)
+            engine_cache.release(previous_llm)
+
+            self.agent_engine = self._create_agent(
+                agent_config, system_prompt, tts_preprocessor_config
             )
 
             logger.debug(f"Agent choice: {agent_config.conversation_agent_choice}")
@@ -200,18 +389,74 @@ class ServiceContext:
 
             # Save the current configuration
             self.character_config.agent_config = agent_config
+            self.character_config.tts_preprocessor_config = tts_preprocessor_config
             self.system_prompt = system_prompt
 
         except Exception as e:
             logger.error(f"Failed to initialize agent: {e}")
             raise
 
-    def init_translate(self, translator_config: TranslatorConfig) -> None:
-        """Initialize or update the translation engine based on the configuration."""
+    def _acquire_llm(
+        self, agent_config: AgentConfig, system_prompt: str
+    ) -> StatelessLLMInterface | None:
+        """Get the stateless LLM for the agent config from the engine cache.
+
+        Returns:
+        - StatelessLLMInterface | None: The LLM, or None if the agent doesn't use one.
+        """
+        llm_choice = AgentFactory.get_llm_config(
+            agent_config.conversation_agent_choice,
+            agent_config.agent_settings.model_dump(),
+            agent_config.llm_configs.model_dump(),
+        )
+        if llm_choice is None:
+            return None
+        llm_provider, llm_config = llm_choice
+
+        # The system prompt is not part of the key: agents pass it with every
+        # request, so one LLM can serve characters with different personas.
+        return engine_cache.acquire(
+            "llm",
+            llm_provider,
+            llm_config,
+            lambda: StatelessLLMFactory.create_llm(
+                llm_provider=llm_provider, system_prompt=system_prompt, **llm_config
+            ),
+        )
+
+    def _create_agent(
+        self,
+        agent_config: AgentConfig,
+        system_prompt: str,
+        tts_preprocessor_config: TTSPreprocessorConfig,
+    ) -> AgentInterface:
+        """Create an agent for this context around the shared LLM."""
+        return AgentFactory.create_agent(
+            conversation_agent_choice=agent_config.conversation_agent_choice,
+            agent_settings=agent_config.agent_settings.model_dump(),
+            llm_configs=agent_config.llm_configs.model_dump(),
+            system_prompt=system_prompt,
+            live2d_model=self.live2d_model,
+            tts_preprocessor_config=tts_preprocessor_config,
+            translate_engine=self.translate_engine,
+            llm=self.llm_engine,
+        )
+
+    def init_translate(self, translator_config: TranslatorConfig) -> bool:
+        """Initialize or update the translation engine based on the configuration.
+
+        Returns:
+        - bool: True if the translation engine was replaced or removed.
+        """
 
         if not translator_config.translate_audio:
             logger.debug("Translation is disabled.")
-            return
+            changed = self.translate_engine is not None
+            self.translate_engine = None
+            self.character_config.tts_preprocessor_config.translator_config = (
+                translator_config
+            )
+            return changed
 
         if (
             not self.translate_engine
@@ -230,11 +475,65 @@ class ServiceContext:
             self.character_config.tts_preprocessor_config.translator_config = (
                 translator_config
             )
+            return True
         else:
             logger.info("Translation already initialized with the same config.")
+            return False
+
+    def close(self) -> None:
+        """Release the cached engines held by this context."""
+        engine_cache.release(self.asr_engine)
+        engine_cache.release(self.tts_engine)
+        engine_cache.release(self.llm_engine)
+        self.asr_engine = None
+        self.tts_engine = None
+        self.llm_engine = None
+
+    async def warmup_agent(self) -> None:
+        """
+        Warm up the agent if it hasn't been warmed up yet, then mark the context
+        as ready.
+
+        Unlike the ASR and TTS warmups, this runs on the event loop, because the
+        async LLM clients are bound to the loop they are first used in.
+        """
+        if (
+            self.system_config.engine_warmup
+            and self.agent_engine is not None
+            and self.agent_engine is not self._warm_agent
+        ):
+            start = time.perf_counter()
+            try:
+                await self.agent_engine.warmup()
+            except Exception as e:
+                logger.warning(f"Agent warmup failed: {e}")
+            self.engine_timings["Agent warmup"] = round(time.perf_counter() - start, 3)
+            logger.info(
+                f"Agent warmed up in {self.engine_timings['Agent warmup']:.2f}s"
+            )
+
+        self._warm_agent = self.agent_engine
+        self.ready = True
 
     # ==== utils
 
+    def _warmup_engine(self, name: str, warmup: Callable) -> None:
+        """Run a synchronous engine warmup if enabled. Failures are only logged."""
+        if not self.system_config.engine_warmup:
+            return
+        try:
+            self._timed(f"{name} warmup", warmup)
+        except Exception as e:
+            logger.warning(f"{name} warmup failed: {e}")
+
+    def _timed(self, name: str, init: Callable, *args, **kwargs):
+        """Run an initializer and record how long it took in `engine_timings`."""
+        start = time.perf_counter()
+        try:
+            return init(*args, **kwargs)
+        finally:
+            self.engine_timings[name] = round(time.perf_counter() - start, 3)
+
     def construct_system_prompt(self, persona_prompt: str) -> str:
         """
         Append tool prompts to persona prompt.
@@ -262,7 +561,7 @@ class ServiceContext:
 
     async def handle_config_switch(
         self,
-        websocket: WebSocket,
+        sender: WebSocketSender,
         config_file_name: str,
     ) -> None:
         """
@@ -270,94 +569,49 @@ class ServiceContext:
         Change the configuration to a new config and notify the client.
 
         Parameters:
-        - websocket (WebSocket): The WebSocket connection.
+        - sender (WebSocketSender): The outbound queue of the WebSocket connection.
         - config_file_name (str): The name of the configuration file.
         """
         try:
-            new_character_config_data = None
-
-            if config_file_name == "conf.yaml":
-                # Load base config
-                new_character_config_data = read_yaml("conf.yaml").get(
-                    "character_config"
-                )
-            else:
-                # Load alternative config and merge with base config
-                characters_dir = self.system_config.config_alts_dir
-                file_path = os.path.normpath(
-                    os.path.join(characters_dir, config_file_name)
-                )
-                if not file_path.startswith(characters_dir):
-                    raise ValueError("Invalid configuration file path")
-
-                alt_config_data = read_yaml(file_path).get("character_config")
-
-                # Start with original config data and perform a deep merge
-                new_character_config_data = deep_merge(
-                    self.config.character_config.model_dump(), alt_config_data
-                )
-
-            if new_character_config_data:
-                new_config = {
-                    "system_config": self.system_config.model_dump(),
-                    "character_config": new_character_config_data,
+            # validated once per file version, alternative configs are merged
+            # into the character config of conf.yaml
+            character_config = config_catalog.character_config(
+                config_file_name, self.system_config.config_alts_dir
+            )
+            new_config = Config(
+                system_config=self.system_config, character_config=character_config
+            )
+            self.load_from_config(new_config)
+            await self.warmup_agent()
+            logger.debug(f"New config: {self}")
+            logger.debug(f"New character config: {self.character_config.model_dump()}")
+
+            # Send responses to client
+            await sender.send(
+                {
+                    "type": "set-model-and-conf",
+                    "model_info": self.live2d_model.model_info,
+                    "conf_name": self.character_config.conf_name,
+                    "conf_uid": self.character_config.conf_uid,
                 }
-                new_config = validate_config(new_config)
-                self.load_from_config(new_config)
-                logger.debug(f"New config: {self}")
-                logger.debug(
-                    f"New character config: {self.character_config.model_dump()}"
-                )
-
-                # Send responses to client
-                await websocket.send_text(
-                    json.dumps(
-                        {
-                            "type": "set-model-and-conf",
-                            "model_info": self.live2d_model.model_info,
-                            "conf_name": self.character_config.conf_name,
-                            "conf_uid": self.character_config.conf_uid,
-                        }
-                    )
-                )
+            )
 
-                await websocket.send_text(
-                    json.dumps(
-                        {
-                            "type": "config-switched",
-                            "message": f"Switched to config: {config_file_name}",
-                        }
-                    )
-                )
+            await sender.send(
+                {
+                    "type": "config-switched",
+                    "message": f"Switched to config: {config_file_name}",
+                }
+            )
 
-                logger.info(f"Configuration switched to {config_file_name}")
-            else:
-                raise ValueError(
-                    f"Failed to load configuration from {config_file_name}"
-                )
+            logger.info(f"Configuration switched to {config_file_name}")
 
         except Exception as e:
             logger.error(f"Error switching configuration: {e}")
             logger.debug(self)
-            await websocket.send_text(
-                json.dumps(
-                    {
-                        "type": "error",
-                        "message": f"Error switching configuration: {str(e)}",
-                    }
-                )
+            await sender.send(
+                {
+                    "type": "error",
+                    "message": f"Error switching configuration: {str(e)}",
+                }
             )
             raise e
-
-
-def deep_merge(dict1, dict2):
-    """
-    Recursively merges dict2 into dict1, prioritizing values from dict2.
-    """
-    result = dict1.copy()
-    for key, value in dict2.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = deep_merge(result[key], value)
-        else:
-            result[key] = value
-    return result
@@ -0,0 +1,188 @@
+"""
+Speculative turns: start the agent on the interim transcript while the user is
+still finishing the utterance, and keep the result only if the final transcript
+turns out to be the same.
+"""
+
+import asyncio
+from typing import AsyncIterator
+
+import numpy as np
+from loguru import logger
+
+from .agent.agents.agent_interface import AgentInterface
+from .agent.input_types import BatchInput, TextData, TextSource
+from .agent.output_types import BaseOutput
+from .asr.asr_interface import ASRInterface
+from .asr.audio_buffer import AudioBuffer
+
+
+class SpeculativeTurn:
+    """
+    An agent response started on an interim transcript.
+
+    The outputs are buffered until the turn is committed. The agent only writes
+    its memory once the turn is committed, so a cancelled turn leaves no trace.
+    """
+
+    def __init__(self, agent_engine: AgentInterface, text: str):
+        self.text = text
+        self.memory_gate = asyncio.Event()
+        self._stream = agent_engine.chat(
+            BatchInput(texts=[TextData(source=TextSource.INPUT, content=text)]),
+            memory_gate=self.memory_gate,
+        )
+        self._outputs: asyncio.Queue = asyncio.Queue()
+        self._prefetch_task = asyncio.create_task(self._prefetch())
+        logger.debug(f"Speculative turn started on: '{text}'")
+
+    async def _prefetch(self) -> None:
+        try:
+            async for output in self._stream:
+                self._outputs.put_nowait(output)
+        except Exception as e:
+            self._outputs.put_nowait(e)
+        self._outputs.put_nowait(None)
+
+    def matches(self, text: str) -> bool:
+        return text.strip() == self.text
+
+    def commit(self) -> AsyncIterator[BaseOutput]:
+        """Accept the turn and return the agent outputs, buffered ones first."""
+        logger.info(f"Speculative turn committed: '{self.text}'")
+        self.memory_gate.set()
+        return self._replay()
+
+    async def _replay(self) -> AsyncIterator[BaseOutput]:
+        try:
+            while True:
+                output = await self._outputs.get()
+                if output is None:
+                    return
+                if isinstance(output, Exception):
+                    raise output
+                yield output
+        finally:
+            await self.cancel()
+
+    async def cancel(self) -> None:
+        """Stop the agent. Does nothing if the turn has already finished."""
+        if not self._prefetch_task.done():
+            logger.debug(f"Speculative turn cancelled: '{self.text}'")
+            self._prefetch_task.cancel()
+            try:
+                await self._prefetch_task
+            except asyncio.CancelledError:
+                pass
+        await self._stream.aclose()
+
+
+class TurnSpeculator:
+    """
+    Watches the utterance in progress of one session and starts a speculative
+    turn once the interim transcript has been stable for `stable_ms`.
+    """
+
+    def __init__(
+        self,
+        service_context,
+        transcribe_interval_ms: float = 500,
+        stable_ms: float = 300,
+    ):
+        """
+        Args:
+            service_context (ServiceContext): The session, for its current ASR
+                and agent engines.
+            transcribe_interval_ms (float): Minimum time between two interim
+                transcriptions of the utterance.
+            stable_ms (float): How long the interim transcript must stay the same
+                before the agent is started on it.
+        """
+        self.service_context = service_context
+        self.transcribe_interval = transcribe_interval_ms / 1000
+        self.stable_time = stable_ms / 1000
+
+        self._interim_text = ""
+        self._stable_since = 0.0
+        self._last_transcription = 0.0
+        self._transcribe_task: asyncio.Task | None = None
+        # cancellations in progress, kept so they are not garbage collected
+        self._cancel_tasks: set[asyncio.Task] = set()
+        self.turn: SpeculativeTurn | None = None
+
+    def on_audio(self, utterance: np.ndarray) -> None:
+        """Called with the whole utterance so far (16 kHz) whenever new audio
+        arrives."""
+        now = asyncio.get_running_loop().time()
+        if self._transcribe_task is not None and not self._transcribe_task.done():
+            return
+        if now - self._last_transcription < self.transcribe_interval:
+            # no new transcription, but the current one may have become stable
+            self._update(self._interim_text)
+            return
+
+        self._last_transcription = now
+        self._transcribe_task = asyncio.create_task(
+            self._transcribe(AudioBuffer(utterance.copy(), ASRInterface.SAMPLE_RATE))
+        )
+
+    def on_partial_text(self, text: str) -> None:
+        """Called with the partial transcript of a streaming ASR engine."""
+        self._update(text)
+
+    async def _transcribe(self, utterance: AudioBuffer) -> None:
+        try:
+            text = await self.service_context.asr_engine.async_transcribe_np(utterance)
+        except Exception as e:
+            logger.warning(f"Interim transcription failed: {e}")
+            return
+        self._update(text)
+
+    def _update(self, text: str) -> None:
+        text = text.strip()
+        if not text:
+            return
+        now = asyncio.get_running_loop().time()
+
+        if text != self._interim_text:
+            self._interim_text = text
+            self._stable_since = now
+            # the user kept talking, so the running turn is outdated
+            if self.turn is not None and not self.turn.matches(text):
+                self._cancel_turn()
+            return
+
+        agent_engine = self.service_context.agent_engine
+        if (
+            self.turn is None
+            and now - self._stable_since >= self.stable_time
+            and agent_engine.SUPPORTS_SPECULATION
+        ):
+            self.turn = SpeculativeTurn(agent_engine, text)
+
+    def take_turn(self) -> SpeculativeTurn | None:
+        """Return the speculative turn of the utterance that just ended, if any,
+        and get ready for the next utterance."""
+        turn, self.turn = self.turn, None
+        self._reset_state()
+        return turn
+
+    def reset(self) -> None:
+        """Forget the utterance in progress and cancel its speculative turn."""
+        if self.turn is not None:
+            self._cancel_turn()
+        self._reset_state()
+
+    def _cancel_turn(self) -> None:
+        task = asyncio.create_task(self.turn.cancel())
+        self._cancel_tasks.add(task)
+        task.add_done_callback(self._cancel_tasks.discard)
+        self.turn = None
+
+    def _reset_state(self) -> None:
+        if self._transcribe_task is not None:
+            self._transcribe_task.cancel()
+            self._transcribe_task = None
+        self._interim_text = ""
+        self._stable_since = 0.0
+        self._last_transcription = 0.0
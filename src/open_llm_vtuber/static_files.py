@@ -0,0 +1,331 @@
+"""
+Static file serving for the frontend, Live2D models and backgrounds.
+
+On top of `StaticFiles`, `CachedStaticFiles`:
+- uses a hash of the content as ETag, so an unchanged model answers 304 on
+  every server (and after a restart) instead of being downloaded again;
+- marks files with a bundler content hash in their name (e.g.
+  `index-3f9a2c1b.js`) as immutable, and makes the browser revalidate others;
+- generates gzip (and brotli, if the `brotli` package is installed) copies of
+  compressible files at startup, and serves them to clients that accept them;
+- keeps the most requested files in memory, up to a total size.
+"""
+
+import email.utils
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
+
+import anyio
+from loguru import logger
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# sidecars are generated for these types only, images and audio are compressed
+COMPRESSIBLE_SUFFIXES = frozenset(
+    {".js", ".mjs", ".css", ".html", ".json", ".svg", ".txt", ".map", ".wasm"}
+)
+# bundler output such as index-3f9a2c1b.js or app.BWk3x9aZ.css: only the last
+# dash or dot separated part of the name is the hash, so that names such as
+# pixi-live2d-display.js are not taken for hashed ones
+HASHED_NAME = re.compile(
+    r"[.-](?=[A-Za-z0-9_]*\d)[A-Za-z0-9_]{8,}\.(?:js|mjs|css|woff2?|wasm)$"
+)
+
+# quality 11 (the default) is many times slower for a few percent smaller files
+BROTLI_QUALITY = 9
+
+# the compressed copies are other representations, so they get other ETags
+ENCODING_ETAG_SUFFIXES = {"br": "-br", "gzip": "-gz"}
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+
+@dataclass
+class _Asset:
+    mtime_ns: int
+    size: int
+    etag: str
+    # content encoding -> path of the precompressed copy
+    encodings: Dict[str, str] = field(default_factory=dict)
+
+
+def _parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Accept-Encoding as {content coding: q-value}."""
+    accepted = {}
+    for item in header.split(","):
+        coding, *params = item.split(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def _choose_encoding(encodings: Dict[str, str], header: str) -> str | None:
+    """The precompressed copy the client prefers, None for the file itself."""
+    accepted = _parse_accept_encoding(header)
+    best, best_q = None, 0.0
+    # encodings lists br first, so it wins ties
+    for encoding in encodings:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of If-None-Match with the ETag of any representation."""
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        tag = tag.removeprefix("W/")
+        for suffix in ENCODING_ETAG_SUFFIXES.values():
+            if tag.endswith(suffix + '"'):
+                tag = tag[: -len(suffix) - 1] + '"'
+                break
+        if tag == etag:
+            return True
+    return False
+
+
+class HotFileCache:
+    """Contents of recently served files, bounded by their total size."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> bytes | None:
+        with self._lock:
+            content = self._data.get(key)
+            if content is not None:
+                self._data.move_to_end(key)
+            return content
+
+    def put(self, key: Tuple, content: bytes) -> None:
+        if len(content) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                return
+            self._data[key] = content
+            self.size += len(content)
+            while self.size > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self.size -= len(evicted)
+
+
+class CachedStaticFiles(StaticFiles):
+    def __init__(
+        self,
+        *,
+        directory: str,
+        sidecar_dir: str | None = None,
+        hot_cache: HotFileCache | None = None,
+        max_cached_file_mb: int = 8,
+        min_compress_size: int = 1024,
+        **kwargs,
+    ):
+        """
+        Args:
+            directory (str): The directory to serve.
+            sidecar_dir (str, optional): Where to write the precompressed
+                copies. None disables them.
+            hot_cache (HotFileCache, optional): Keeps the contents of served
+                files, can be shared by several directories.
+            max_cached_file_mb (int): Larger files are streamed from disk (MB).
+            min_compress_size (int): Files smaller than this (bytes) are not
+                precompressed.
+        """
+        super().__init__(directory=directory, **kwargs)
+        self.sidecar_dir = sidecar_dir
+        self.min_compress_size = min_compress_size
+        self.max_cached_file_size = max_cached_file_mb * 1024 * 1024
+        self._hot_cache = hot_cache or HotFileCache(0)
+        self._assets: Dict[str, _Asset] = {}
+
+    # ==== precompressed copies
+
+    def _sidecar_path(self, full_path: str, suffix: str) -> str:
+        relative = os.path.relpath(full_path, self.directory)
+        return os.path.join(self.sidecar_dir, relative + suffix)
+
+    def precompress(self) -> None:
+        """Write the missing or outdated compressed copies of the directory."""
+        if self.sidecar_dir is None:
+            return
+        written = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                full_path = os.path.join(root, name)
+                if os.path.splitext(name)[1].lower() not in COMPRESSIBLE_SUFFIXES:
+                    continue
+                try:
+                    written += self._precompress_file(full_path)
+                except OSError as e:
+                    logger.warning(f"Failed to precompress {full_path}: {e}")
+        # pick up the new copies
+        for full_path, asset in list(self._assets.items()):
+            self._find_sidecars(full_path, asset)
+        logger.debug(f"Precompressed {written} files of {self.directory}")
+
+    def _precompress_file(self, full_path: str) -> int:
+        stat_result = os.stat(full_path)
+        if stat_result.st_size < self.min_compress_size:
+            return 0
+        compressors = {".gz": lambda data: gzip.compress(data, 9, mtime=0)}
+        if brotli is not None:
+            compressors[".br"] = lambda data: brotli.compress(
+                data, quality=BROTLI_QUALITY
+            )
+
+        written = 0
+        content = None
+        for suffix, compress in compressors.items():
+            sidecar = self._sidecar_path(full_path, suffix)
+            try:
+                if os.stat(sidecar).st_mtime_ns >= stat_result.st_mtime_ns:
+                    continue
+            except FileNotFoundError:
+                pass
+            if content is None:
+                with open(full_path, "rb") as f:
+                    content = f.read()
+            compressed = compress(content)
+            if len(compressed) >= len(content):
+                continue
+            os.makedirs(os.path.dirname(sidecar), exist_ok=True)
+            # written under another name first so it is never served half done
+            with open(sidecar + ".tmp", "wb") as f:
+                f.write(compressed)
+            os.replace(sidecar + ".tmp", sidecar)
+            written += 1
+        return written
+
+    # ==== serving
+
+    def _load_asset(self, full_path: str, stat_result: os.stat_result) -> _Asset:
+        asset = self._assets.get(full_path)
+        if (
+            asset is not None
+            and asset.mtime_ns == stat_result.st_mtime_ns
+            and asset.size == stat_result.st_size
+        ):
+            return asset
+
+        digest = hashlib.sha1()
+        with open(full_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        asset = _Asset(
+            stat_result.st_mtime_ns, stat_result.st_size, f'"{digest.hexdigest()}"'
+        )
+        self._find_sidecars(full_path, asset)
+        self._assets[full_path] = asset
+        return asset
+
+    def _find_sidecars(self, full_path: str, asset: _Asset) -> None:
+        if self.sidecar_dir is None:
+            return
+        encodings = {}
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            sidecar = self._sidecar_path(full_path, suffix)
+            try:
+                if os.stat(sidecar).st_mtime_ns >= asset.mtime_ns:
+                    encodings[encoding] = sidecar
+            except FileNotFoundError:
+                pass
+        asset.encodings = encodings
+
+    def _read(self, path: str, stat_key: Tuple) -> bytes:
+        key = (path, *stat_key)
+        content = self._hot_cache.get(key)
+        if content is None:
+            with open(path, "rb") as f:
+                content = f.read()
+            self._hot_cache.put(key, content)
+        return content
+
+    async def get_response(self, path: str, scope) -> Response:
+        request_headers = Headers(scope=scope)
+        # conditional requests are answered below, with the content hash
+        scope = {
+            **scope,
+            "headers": [
+                (name, value)
+                for name, value in scope["headers"]
+                if name not in (b"if-none-match", b"if-modified-since")
+            ],
+        }
+        response = await super().get_response(path, scope)
+        if not isinstance(response, FileResponse) or response.status_code != 200:
+            return response
+
+        full_path = response.path
+        stat_result = response.stat_result
+        asset = await anyio.to_thread.run_sync(self._load_asset, full_path, stat_result)
+
+        media_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+        if full_path.endswith(".js"):
+            media_type = "application/javascript"
+        headers = {
+            "etag": asset.etag,
+            "last-modified": email.utils.formatdate(stat_result.st_mtime, usegmt=True),
+            "cache-control": (
+                IMMUTABLE if HASHED_NAME.search(full_path) else REVALIDATE
+            ),
+            "vary": "Accept-Encoding",
+        }
+
+        # range requests (e.g. media seeking) are left to FileResponse
+        passthrough = "range" in request_headers or scope["method"] == "HEAD"
+        encoding = None
+        if not passthrough:
+            encoding = _choose_encoding(
+                asset.encodings, request_headers.get("accept-encoding", "")
+            )
+        if encoding is not None:
+            headers["etag"] = asset.etag[:-1] + ENCODING_ETAG_SUFFIXES[encoding] + '"'
+
+        if _etag_matches(request_headers.get("if-none-match", ""), asset.etag):
+            return Response(status_code=304, headers=headers)
+        if encoding is not None:
+            headers["content-encoding"] = encoding
+
+        if passthrough:
+            response.headers.update(headers)
+            return response
+
+        body_path = asset.encodings[encoding] if encoding is not None else full_path
+
+        if asset.size > self.max_cached_file_size:
+            return FileResponse(body_path, headers=headers, media_type=media_type)
+        content = await anyio.to_thread.run_sync(
+            self._read, body_path, (asset.mtime_ns, asset.size)
+        )
+        return Response(content, headers=headers, media_type=media_type)
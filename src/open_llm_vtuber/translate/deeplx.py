@@ -1,28 +1,103 @@
-import json
-import httpx
+from typing import List
+
 from loguru import logger
 from .translate_interface import TranslateInterface
+from ..utils.http_client import get_http_client, get_async_http_client
+from ..utils.lru_cache import LRUCache
+from ..utils.micro_batcher import MicroBatcher
 
 
 class DeepLXTranslate(TranslateInterface):
     api_endpoint: str = "http://127.0.0.1:1188/v2/translate"
     target_lang: str = "JP"
 
-    def __init__(self, api_endpoint: str, target_lang: str):
+    def __init__(
+        self,
+        api_endpoint: str,
+        target_lang: str,
+        cache_size: int = 1024,
+        max_batch_size: int = 8,
+        batch_window_ms: float = 20,
+    ):
+        """
+        Args:
+            api_endpoint (str): The DeepLX v2 translate endpoint.
+            target_lang (str): The target language code.
+            cache_size (int): Number of (text, target_lang) pairs kept in memory.
+            max_batch_size (int): Maximum number of sentences sent in one request.
+            batch_window_ms (float): How long to wait for more sentences
+                before sending a batch.
+        """
         self.api_endpoint = api_endpoint
         self.target_lang = target_lang
 
+        self._cache = LRUCache(cache_size)
+        self._batcher = MicroBatcher(
+            self._translate_batch, max_batch_size, batch_window_ms
+        )
+
+    def _parse_response(self, texts: List[str], res: dict) -> List[str]:
+        translations = [d["text"] for d in res["translations"]]
+        if len(texts) == 1:
+            # a single text may come back split into several translations
+            return [" ".join(translations)]
+        if len(translations) != len(texts):
+            raise ValueError(
+                f"Expected {len(texts)} translations, got {len(translations)}"
+            )
+        return translations
+
     # translate v2 endpoint from DeepLX
     def translate(self, text: str) -> str:
+        key = (text, self.target_lang)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        req = None
         try:
             data = {"text": [text], "target_lang": self.target_lang}
-            post_data = json.dumps(data)
-            req = httpx.post(url=self.api_endpoint, data=post_data).text
-            res = json.loads(req)["translations"]
-            res = " ".join([d["text"] for d in res])
+            req = get_http_client().post(url=self.api_endpoint, json=data)
+            res = self._parse_response([text], req.json())[0]
         except Exception as e:
             logger.critical(f"Error translating text: {e}")
-            logger.critical(f"Response: {req}")
+            logger.critical(f"Response: {req.text if req is not None else None}")
             raise e
 
+        self._cache.put(key, res)
         return res
+
+    async def async_translate(self, text: str) -> str:
+        """
+        Translate the text through the micro-batcher.
+
+        Sentences requested within `batch_window_ms` of each other are sent to
+        DeepLX together in a single `text: [...]` request.
+        """
+        key = (text, self.target_lang)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        return await self._batcher.submit(text)
+
+    async def _translate_batch(self, batch: List[str]) -> List[str]:
+        texts = list(dict.fromkeys(batch))
+        target_lang = self.target_lang
+
+        req = None
+        try:
+            data = {"text": texts, "target_lang": target_lang}
+            req = await get_async_http_client().post(url=self.api_endpoint, json=data)
+            translations = dict(
+                zip(texts, self._parse_response(texts, req.json()), strict=True)
+            )
+        except Exception as e:
+            logger.critical(f"Error translating text: {e}")
+            logger.critical(f"Response: {req.text if req is not None else None}")
+            raise e
+
+        logger.debug(f"DeepLX translated a batch of {len(texts)} sentences.")
+        for text, translation in translations.items():
+            self._cache.put((text, target_lang), translation)
+        return [translations[text] for text in batch]
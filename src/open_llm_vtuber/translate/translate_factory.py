@@ -12,6 +12,13 @@ class TranslateFactory:
             return DeepLXTranslate(
                 api_endpoint=translate_provider_config.get("deeplx_api_endpoint"),
                 target_lang=translate_provider_config.get("deeplx_target_lang"),
+                cache_size=translate_provider_config.get("deeplx_cache_size", 1024),
+                max_batch_size=translate_provider_config.get(
+                    "deeplx_max_batch_size", 8
+                ),
+                batch_window_ms=translate_provider_config.get(
+                    "deeplx_batch_window_ms", 20
+                ),
             )
         else:
             raise ValueError(f"Unsupported translate provider: {translate_provider}")
@@ -1,7 +1,17 @@
 import abc
+import asyncio
 
 
 class TranslateInterface(metaclass=abc.ABCMeta):
+    async def async_translate(self, text: str) -> str:
+        """
+        Asynchronously translate the input text to the target language.
+
+        By default, this runs the synchronous translate in a coroutine.
+        Subclasses can override this method to provide true async implementation.
+        """
+        return await asyncio.to_thread(self.translate, text)
+
     @abc.abstractmethod
     def translate(self, text: str) -> str:
         """
@@ -12,6 +12,8 @@ sys.path.append(current_dir)
 
 
 class TTSEngine(TTSInterface):
+    LOCAL_MODEL = True
+
     def __init__(self, voice="v2/en_speaker_1"):
         if platform.system() == "Darwin":
             logger.info(">> Note: Running barkTTS on macOS can be very slow.")
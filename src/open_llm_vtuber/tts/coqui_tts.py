@@ -11,6 +11,8 @@ class TTSEngine(TTSInterface):
     CoquiTTS engine implementation supporting both single-speaker and multi-speaker modes.
     """
 
+    LOCAL_MODEL = True
+
     def __init__(
         self,
         model_name: Optional[str] = None,
@@ -3,9 +3,10 @@
 ####
 
 import re
-import requests
+import httpx
 from loguru import logger
 from .tts_interface import TTSInterface
+from ..utils.http_client import get_http_client, get_async_http_client
 
 
 class TTSEngine(TTSInterface):
@@ -31,11 +32,10 @@ class TTSEngine(TTSInterface):
         self.media_type = media_type
         self.streaming_mode = streaming_mode
 
-    def generate_audio(self, text, file_name_no_ext=None):
-        file_name = self.generate_cache_file_name(file_name_no_ext, self.media_type)
+    def _request_params(self, text: str) -> dict:
         cleaned_text = re.sub(r"\[.*?\]", "", text)
-        # Prepare the data for the POST request
-        data = {
+        # Prepare the data for the request
+        return {
             "text": cleaned_text,
             "text_lang": self.text_lang,
             "ref_audio_path": self.ref_audio_path,
@@ -47,9 +47,7 @@ class TTSEngine(TTSInterface):
             "streaming_mode": self.streaming_mode,
         }
 
-        # Send POST request to the TTS API
-        response = requests.get(self.api_url, params=data, timeout=120)
-
+    def _save_response(self, response: httpx.Response, file_name: str) -> str | None:
         # Check if the request was successful
         if response.status_code == 200:
             # Save the audio content to a file
@@ -62,3 +60,21 @@ class TTSEngine(TTSInterface):
                 f"Error: Failed to generate audio. Status code: {response.status_code}"
             )
             return None
+
+    def generate_audio(self, text, file_name_no_ext=None):
+        file_name = self.generate_cache_file_name(file_name_no_ext, self.media_type)
+
+        # Send GET request to the TTS API
+        response = get_http_client().get(
+            self.api_url, params=self._request_params(text)
+        )
+        return self._save_response(response, file_name)
+
+    async def async_generate_audio(self, text, file_name_no_ext=None):
+        file_name = self.generate_cache_file_name(file_name_no_ext, self.media_type)
+
+        # Send GET request to the TTS API over the shared keep-alive pool
+        response = await get_async_http_client().get(
+            self.api_url, params=self._request_params(text)
+        )
+        return self._save_response(response, file_name)
@@ -10,6 +10,8 @@ sys.path.append(current_dir)
 
 
 class TTSEngine(TTSInterface):
+    LOCAL_MODEL = True
+
     def __init__(
         self,
         speaker: str = "EN-Default",
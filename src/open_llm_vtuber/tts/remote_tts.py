@@ -0,0 +1,45 @@
+import httpx
+import numpy as np
+from loguru import logger
+
+from .tts_interface import TTSInterface
+from ..asr.audio_buffer import AudioBuffer
+from ..remote_inference.endpoint_pool import EndpointPool
+from ..remote_inference.protocol import SAMPLE_RATE_HEADER
+
+
+class TTSEngine(TTSInterface):
+    """
+    Synthesizes speech with the TTS engine of remote inference servers
+    (`run_inference_server.py`).
+
+    The servers answer raw PCM, so `generate_audio` returns an AudioBuffer
+    instead of writing a file.
+    """
+
+    def __init__(self, urls: list[str], health_check_interval: float = 10.0):
+        self.endpoints = EndpointPool(urls, "tts", health_check_interval)
+        logger.info(f"Remote TTS servers: {[e.url for e in self.endpoints.endpoints]}")
+
+    def generate_audio(self, text: str, file_name_no_ext=None) -> AudioBuffer | None:
+        response = self.endpoints.request(
+            "POST", "/tts/synthesize", json={"text": text}
+        )
+        return self._to_audio_buffer(response)
+
+    async def async_generate_audio(
+        self, text: str, file_name_no_ext=None
+    ) -> AudioBuffer | None:
+        response = await self.endpoints.arequest(
+            "POST", "/tts/synthesize", json={"text": text}
+        )
+        return self._to_audio_buffer(response)
+
+    @staticmethod
+    def _to_audio_buffer(response: httpx.Response) -> AudioBuffer | None:
+        if not response.content:
+            return None
+        samples = np.frombuffer(response.content, dtype="<i2").astype(
+            np.int16, copy=False
+        )
+        return AudioBuffer(samples, int(response.headers[SAMPLE_RATE_HEADER]))
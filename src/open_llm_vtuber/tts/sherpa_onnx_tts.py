@@ -11,6 +11,8 @@ sys.path.append(current_dir)
 
 
 class TTSEngine(TTSInterface):
+    LOCAL_MODEL = True
+
     def __init__(
         self,
         vits_model,
@@ -6,6 +6,9 @@ from loguru import logger
 
 
 class TTSInterface(metaclass=abc.ABCMeta):
+    # True if the engine runs a model in this process, see warmup
+    LOCAL_MODEL = False
+
     async def async_generate_audio(self, text: str, file_name_no_ext=None) -> str:
         """
         Asynchronously generate speech audio file using TTS.
@@ -39,6 +42,21 @@ class TTSInterface(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError
 
+    def warmup(self) -> None:
+        """
+        Run a short synthetic synthesis so later calls don't pay the cold-start
+        cost (graph optimization, CUDA autotune, JIT...).
+
+        Only engines with LOCAL_MODEL set generate a short phrase (and remove the
+        audio file). The others do nothing, so cloud APIs aren't called (and
+        billed) on every startup and config switch.
+        """
+        if not self.LOCAL_MODEL:
+            return
+        audio_file_path = self.generate_audio("Hello.", file_name_no_ext="warmup")
+        if audio_file_path:
+            self.remove_file(audio_file_path, verbose=False)
+
     def remove_file(self, filepath: str, verbose: bool = True) -> None:
         """
         Remove a file from the file system.
@@ -49,6 +67,9 @@ class TTSInterface(metaclass=abc.ABCMeta):
             filepath (str): The path to the file to remove.
             verbose (bool): If True, print messages to the console.
         """
+        if not isinstance(filepath, str):
+            # engines that don't write files return the audio itself
+            return
         if not os.path.exists(filepath):
             logger.warning(f"File {filepath} does not exist")
             return
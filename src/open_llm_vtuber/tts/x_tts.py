@@ -1,6 +1,7 @@
-import requests
+import httpx
 from loguru import logger
 from .tts_interface import TTSInterface
+from ..utils.http_client import get_http_client, get_async_http_client
 
 
 class TTSEngine(TTSInterface):
@@ -16,19 +17,15 @@ class TTSEngine(TTSInterface):
         self.new_audio_dir = "cache"
         self.file_extension = "wav"
 
-    def generate_audio(self, text, file_name_no_ext=None):
-        file_name = self.generate_cache_file_name(file_name_no_ext, self.file_extension)
-
+    def _request_data(self, text: str) -> dict:
         # Prepare the data for the POST request
-        data = {
+        return {
             "text": text,
             "speaker_wav": self.speaker_wav,
             "language": self.language,
         }
 
-        # Send POST request to the TTS API
-        response = requests.post(self.api_url, json=data, timeout=120)
-
+    def _save_response(self, response: httpx.Response, file_name: str) -> str | None:
         # Check if the request was successful
         if response.status_code == 200:
             # Save the audio content to a file
@@ -41,3 +38,19 @@ class TTSEngine(TTSInterface):
                 f"Error: Failed to generate audio. Status code: {response.status_code}"
             )
             return None
+
+    def generate_audio(self, text, file_name_no_ext=None):
+        file_name = self.generate_cache_file_name(file_name_no_ext, self.file_extension)
+
+        # Send POST request to the TTS API
+        response = get_http_client().post(self.api_url, json=self._request_data(text))
+        return self._save_response(response, file_name)
+
+    async def async_generate_audio(self, text, file_name_no_ext=None):
+        file_name = self.generate_cache_file_name(file_name_no_ext, self.file_extension)
+
+        # Send POST request to the TTS API over the shared keep-alive pool
+        response = await get_async_http_client().post(
+            self.api_url, json=self._request_data(text)
+        )
+        return self._save_response(response, file_name)
@@ -0,0 +1,177 @@
+"""
+Process-wide cache of loaded engines.
+
+Engines are keyed by a stable hash of (kind, engine type, engine config), so a
+config switch back to a previously used character reuses the models that are
+already in memory instead of loading them again.
+
+Every user of an engine holds a reference (`acquire` / `retain` / `release`).
+Engines nobody references are kept as idle entries, and the least recently used
+idle entries are dropped once there are more than `max_idle_engines` of them or
+the process uses more memory than `memory_budget_mb`.
+"""
+
+import gc
+import os
+import sys
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
+
+from loguru import logger
+
+
+def engine_key(kind: str, engine_type: str, config: Dict[str, Any]) -> str:
+    """Return a stable hash of an engine's kind, type and config."""
+    payload = json.dumps(
+        [kind, engine_type, config], sort_keys=True, default=str, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def process_memory_mb() -> float | None:
+    """Return the resident memory of this process in MB, or None if unknown."""
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+@dataclass
+class _Entry:
+    key: str
+    name: str
+    engine: Any
+    refcount: int = 0
+
+
+class EngineCache:
+    def __init__(self, max_idle_engines: int = 2, memory_budget_mb: int = 0):
+        """
+        Args:
+            max_idle_engines (int): Maximum number of unreferenced engines to keep.
+            memory_budget_mb (int): Drop idle engines while the process uses more
+                memory than this. 0 disables the memory check.
+        """
+        self.max_idle_engines = max_idle_engines
+        self.memory_budget_mb = memory_budget_mb
+
+        self._lock = threading.RLock()
+        # ordered from least to most recently used
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        # id(engine) -> key, to release engines without knowing their config
+        self._keys: Dict[int, str] = {}
+        # one lock per key so the same engine is never loaded twice in parallel
+        self._create_locks: Dict[str, threading.Lock] = {}
+
+    def configure(self, max_idle_engines: int, memory_budget_mb: int) -> None:
+        with self._lock:
+            self.max_idle_engines = max_idle_engines
+            self.memory_budget_mb = memory_budget_mb
+            self._evict()
+
+    def acquire(
+        self,
+        kind: str,
+        engine_type: str,
+        config: Dict[str, Any],
+        create: Callable[[], Any],
+    ) -> Any:
+        """
+        Return the cached engine for this config, or create it with `create()`.
+        The caller holds a reference until it calls `release`.
+        """
+        key = engine_key(kind, engine_type, config)
+        name = f"{kind}:{engine_type}"
+
+        with self._lock:
+            create_lock = self._create_locks.setdefault(key, threading.Lock())
+
+        with create_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refcount += 1
+                    self._entries.move_to_end(key)
+                    logger.info(f"Reusing cached engine {name}")
+                    return entry.engine
+
+            engine = create()
+
+            with self._lock:
+                self._entries[key] = _Entry(key, name, engine, refcount=1)
+                self._keys[id(engine)] = key
+                self._evict()
+            return engine
+
+    def retain(self, engine: Any) -> None:
+        """Take another reference on an engine returned by `acquire`."""
+        with self._lock:
+            key = self._keys.get(id(engine))
+            if key is not None:
+                self._entries[key].refcount += 1
+
+    def release(self, engine: Any) -> None:
+        """Drop a reference on an engine. Engines not from the cache are ignored."""
+        if engine is None:
+            return
+        with self._lock:
+            key = self._keys.get(id(engine))
+            if key is None:
+                return
+            entry = self._entries[key]
+            entry.refcount = max(0, entry.refcount - 1)
+            if entry.refcount == 0:
+                logger.debug(f"Engine {entry.name} is now idle")
+                self._evict()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "engines": [
+                    {"name": e.name, "refcount": e.refcount}
+                    for e in self._entries.values()
+                ],
+                "memory_mb": process_memory_mb(),
+            }
+
+    def _over_budget(self) -> bool:
+        idle = sum(1 for e in self._entries.values() if e.refcount == 0)
+        if idle > self.max_idle_engines:
+            return True
+        if self.memory_budget_mb > 0 and idle > 0:
+            memory = process_memory_mb()
+            return memory is not None and memory > self.memory_budget_mb
+        return False
+
+    def _evict(self) -> None:
+        evicted = False
+        while self._over_budget():
+            entry = next(e for e in self._entries.values() if e.refcount == 0)
+            logger.info(f"Evicting idle engine {entry.name}")
+            del self._entries[entry.key]
+            del self._keys[id(entry.engine)]
+            # free the model now, so the memory check sees the new usage
+            entry = None
+            gc.collect()
+            evicted = True
+
+        if evicted:
+            # hand the freed GPU memory back if a torch model was dropped
+            torch = sys.modules.get("torch")
+            if torch is not None and torch.cuda.is_available():
+                torch.cuda.empty_cache()
+
+
+engine_cache = EngineCache()
@@ -0,0 +1,93 @@
+import importlib
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List
+
+from loguru import logger
+
+
+@dataclass(frozen=True)
+class EngineSpec:
+    """
+    Declarative description of how to build an engine.
+
+    Attributes:
+        module: Module path of the implementation, relative to the registry's package.
+        attr: Name of the class (or factory function) in that module.
+        params: Maps constructor arguments to config keys. None passes the
+            config through unchanged.
+    """
+
+    module: str
+    attr: str
+    params: Dict[str, str] | None = None
+
+    def build_kwargs(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        if self.params is None:
+            return dict(config)
+        return {arg: config.get(key) for arg, key in self.params.items()}
+
+
+class EngineRegistry:
+    """
+    A table of engine implementations that are imported only when first used.
+
+    Heavy engines (torch, onnxruntime, funasr...) are therefore only imported if
+    the config actually selects them.
+    """
+
+    def __init__(self, kind: str, package: str):
+        """
+        Args:
+            kind: Human readable kind, used in error messages (e.g. "TTS engine type").
+            package: Package that relative module paths are resolved against.
+        """
+        self.kind = kind
+        self.package = package
+        self._specs: Dict[str, EngineSpec] = {}
+
+    def register(
+        self,
+        name: str,
+        module: str,
+        attr: str,
+        params: Iterable[str] | Dict[str, str] | None = None,
+    ) -> None:
+        """
+        Register an engine.
+
+        Args:
+            name: The name used in the config (e.g. "edge_tts").
+            module: Module path, relative to the registry package (e.g. ".edge_tts").
+            attr: Class name in the module.
+            params: Constructor arguments to take from the config. Either a list
+                of names, or a dict of constructor argument -> config key.
+                None passes the whole config as keyword arguments.
+        """
+        if params is not None and not isinstance(params, dict):
+            params = {key: key for key in params}
+        self._specs[name] = EngineSpec(module=module, attr=attr, params=params)
+
+    def names(self) -> List[str]:
+        return list(self._specs)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._specs
+
+    def get_spec(self, name: str) -> EngineSpec:
+        spec = self._specs.get(name)
+        if spec is None:
+            raise ValueError(f"Unknown {self.kind}: {name}")
+        return spec
+
+    def load(self, name: str) -> Any:
+        """Import and return the implementation registered under `name`."""
+        spec = self.get_spec(name)
+        module = importlib.import_module(spec.module, self.package)
+        return getattr(module, spec.attr)
+
+    def create(self, name: str, **config) -> Any:
+        """Import the implementation registered under `name` and instantiate it."""
+        spec = self.get_spec(name)
+        engine_class = self.load(name)
+        logger.debug(f"Creating {name} from {spec.module}.{spec.attr}")
+        return engine_class(**spec.build_kwargs(config))
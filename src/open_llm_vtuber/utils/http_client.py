@@ -0,0 +1,104 @@
+"""
+Shared HTTP clients for engines that talk to HTTP backends.
+
+Every HTTP-based engine (x_tts, gpt_sovits_tts, the Ollama preload, ...) goes
+through the same process-wide connection pool, so keep-alive connections are
+reused across sentences instead of paying a TCP/TLS handshake for each request.
+"""
+
+import threading
+import importlib.util
+
+import httpx
+from loguru import logger
+
+_lock = threading.Lock()
+_client: httpx.Client | None = None
+_async_client: httpx.AsyncClient | None = None
+
+_settings: dict = {
+    "max_connections": 100,
+    "max_keepalive_connections": 20,
+    "keepalive_expiry": 30.0,
+    "timeout": 120.0,
+    "connect_timeout": 10.0,
+    "http2": True,
+}
+
+
+def configure_http_client(**settings) -> None:
+    """
+    Set the pool limits and timeouts of the shared clients.
+
+    Should be called once at startup, before any engine is created. Clients that
+    already exist keep their old settings until they are closed.
+
+    Parameters:
+        max_connections (int): Maximum number of concurrent connections.
+        max_keepalive_connections (int): Maximum number of idle keep-alive connections.
+        keepalive_expiry (float): Seconds an idle connection is kept open.
+        timeout (float): Default timeout in seconds for read, write and pool.
+        connect_timeout (float): Timeout in seconds for establishing a connection.
+        http2 (bool): Use HTTP/2 when the `h2` package is installed.
+    """
+    unknown = set(settings) - set(_settings)
+    if unknown:
+        raise ValueError(f"Unknown HTTP client settings: {sorted(unknown)}")
+    _settings.update(settings)
+    logger.debug(f"HTTP client settings: {_settings}")
+
+
+def _client_kwargs() -> dict:
+    http2 = _settings["http2"]
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.debug("HTTP/2 requested but `h2` is not installed. Using HTTP/1.1.")
+        http2 = False
+
+    return {
+        "limits": httpx.Limits(
+            max_connections=_settings["max_connections"],
+            max_keepalive_connections=_settings["max_keepalive_connections"],
+            keepalive_expiry=_settings["keepalive_expiry"],
+        ),
+        "timeout": httpx.Timeout(
+            _settings["timeout"], connect=_settings["connect_timeout"]
+        ),
+        "http2": http2,
+    }
+
+
+def get_http_client() -> httpx.Client:
+    """Return the shared synchronous client, creating it on first use."""
+    global _client
+    with _lock:
+        if _client is None or _client.is_closed:
+            _client = httpx.Client(**_client_kwargs())
+        return _client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared asynchronous client, creating it on first use.
+
+    The connections of an AsyncClient belong to the event loop they were opened
+    in, so this should only be called from the server's event loop.
+    """
+    global _async_client
+    with _lock:
+        if _async_client is None or _async_client.is_closed:
+            _async_client = httpx.AsyncClient(**_client_kwargs())
+        return _async_client
+
+
+async def aclose_http_clients() -> None:
+    """Close the shared clients and release their connections."""
+    global _client, _async_client
+    with _lock:
+        client, _client = _client, None
+        async_client, _async_client = _async_client, None
+
+    if async_client is not None:
+        await async_client.aclose()
+    if client is not None:
+        client.close()
+    logger.debug("Shared HTTP clients closed.")
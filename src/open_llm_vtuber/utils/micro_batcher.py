@@ -0,0 +1,87 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, List, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Collects items from concurrent callers and processes them together.
+
+    Items that arrive within `batch_window_ms` of the first one, up to
+    `max_batch_size`, are handed to `process_batch` in a single call. Only one
+    batch runs at a time.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[T]], Awaitable[List[R]]],
+        max_batch_size: int = 8,
+        batch_window_ms: float = 20,
+    ):
+        """
+        Args:
+            process_batch: Coroutine function that processes a list of items
+                and returns one result per item, in the same order. If it
+                raises, every caller of the batch gets the exception.
+            max_batch_size (int): Maximum number of items processed together.
+            batch_window_ms (float): How long to wait for more items before
+                processing a batch.
+        """
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.batch_window = batch_window_ms / 1000
+
+        self._queue: asyncio.Queue[Tuple[T, asyncio.Future]] | None = None
+        self._batch_task: asyncio.Task | None = None
+
+    async def submit(self, item: T) -> R:
+        """Queue the item for the next batch and wait for its result."""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((item, future))
+
+        # the batcher exits when the queue runs dry, so restart it if needed
+        if self._batch_task is None or self._batch_task.done():
+            self._batch_task = asyncio.create_task(self._run_batches())
+
+        return await future
+
+    async def _run_batches(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while not self._queue.empty():
+            batch = [self._queue.get_nowait()]
+            deadline = loop.time() + self.batch_window
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # callers that were interrupted in the meantime don't need a result
+            batch = [(item, future) for item, future in batch if not future.done()]
+            if batch:
+                await self._process(batch)
+
+    async def _process(self, batch: List[Tuple[T, asyncio.Future]]) -> None:
+        try:
+            results = await self.process_batch([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"Expected {len(batch)} results, got {len(results)}")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results, strict=True):
+            if not future.done():
+                future.set_result(result)
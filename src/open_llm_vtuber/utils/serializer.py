@@ -0,0 +1,124 @@
+"""
+Encoding of the WebSocket messages.
+
+JSON uses the fastest library that is installed: orjson, then msgspec, then
+the standard library. All of them produce compact UTF-8 JSON that the frontend
+parses the same way. `BACKEND` tells which one is in use.
+
+Clients can instead ask for MessagePack by offering the `MSGPACK_SUBPROTOCOL`
+WebSocket subprotocol in the handshake (requires the `msgpack` package), see
+`ws_compression.negotiate_subprotocol`.
+Messages keep the schemas of `websocket_messages`. Audio messages carry the
+WAV bytes, which JSON sends as base64 and MessagePack as binary; with
+MessagePack `volumes` is also one byte per slice (the volume times 255).
+"""
+
+import base64
+import json
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import numpy as np
+from loguru import logger
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MSGPACK_SUBPROTOCOL = "msgpack"
+
+
+def _default(obj: Any) -> Any:
+    """
+    Convert the non-JSON types that end up in messages: numpy values, and
+    bytes (the audio), which are sent as base64.
+    """
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    if isinstance(obj, (bytes, bytearray)):
+        return base64.b64encode(obj).decode("ascii")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _stdlib_backend() -> tuple[str, Callable[[Any], str], Callable[[Any], Any]]:
+    encoder = json.JSONEncoder(
+        ensure_ascii=False, separators=(",", ":"), default=_default
+    )
+    return "json", encoder.encode, json.loads
+
+
+def _select_backend() -> tuple[str, Callable[[Any], str], Callable[[Any], Any]]:
+    try:
+        import orjson
+
+        options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+        def orjson_dumps(obj: Any) -> str:
+            return orjson.dumps(obj, default=_default, option=options).decode("utf-8")
+
+        return "orjson", orjson_dumps, orjson.loads
+    except ImportError:
+        pass
+
+    try:
+        import msgspec
+
+        encoder = msgspec.json.Encoder(enc_hook=_default)
+        decoder = msgspec.json.Decoder()
+
+        def msgspec_dumps(obj: Any) -> str:
+            return encoder.encode(obj).decode("utf-8")
+
+        return "msgspec", msgspec_dumps, decoder.decode
+    except ImportError:
+        pass
+
+    return _stdlib_backend()
+
+
+BACKEND, _dumps, _loads = _select_backend()
+logger.debug(f"WebSocket messages are encoded with {BACKEND}.")
+
+
+def dumps(obj: Any) -> str:
+    """Encode a message as a JSON string."""
+    return _dumps(obj)
+
+
+def loads(data: str | bytes) -> Any:
+    """Decode a JSON message."""
+    return _loads(data)
+
+
+def quantize_volumes(volumes) -> bytes:
+    """Quantize normalized (0 to 1) volumes to one byte each."""
+    levels = np.rint(np.asarray(volumes, dtype=np.float32) * 255)
+    return np.clip(levels, 0, 255).astype(np.uint8).tobytes()
+
+
+def msgpack_dumps(obj: Any) -> bytes:
+    """Encode a message as MessagePack."""
+    if obj.get("type") == "audio":
+        obj = {**obj, "volumes": quantize_volumes(obj.get("volumes") or [])}
+    return msgpack.packb(obj, default=_default, use_bin_type=True)
+
+
+def msgpack_loads(data: bytes) -> Any:
+    """Decode a MessagePack message."""
+    return msgpack.unpackb(data, raw=False)
+
+
+@dataclass(frozen=True)
+class Codec:
+    """How the messages of one connection are encoded."""
+
+    name: str
+    dumps: Callable[[Any], str | bytes]
+    loads: Callable[[str | bytes], Any]
+
+
+JSON_CODEC = Codec(BACKEND, dumps, loads)
+MSGPACK_CODEC = (
+    Codec("msgpack", msgpack_dumps, msgpack_loads) if msgpack is not None else None
+)
@@ -1,7 +1,7 @@
-import base64
 from pydub import AudioSegment
 from pydub.utils import make_chunks
 from ..agent.output_types import Actions
+from ..asr.audio_buffer import AudioBuffer
 
 
 def _get_volume_by_chunks(audio: AudioSegment, chunk_length_ms: int) -> list:
@@ -24,7 +24,7 @@ def _get_volume_by_chunks(audio: AudioSegment, chunk_length_ms: int) -> list:
 
 
 def prepare_audio_payload(
-    audio_path: str | None,
+    audio_path: str | AudioBuffer | None,
     chunk_length_ms: int = 20,
     display_text: str = None,
     actions: Actions = None,
@@ -34,13 +34,15 @@ def prepare_audio_payload(
     If audio_path is None, returns a payload with audio=None for silent display.
 
     Parameters:
-        audio_path (str | None): The path to the audio file to be processed, or None for silent display
+        audio_path (str | AudioBuffer | None): The path to the audio file to be processed,
+            the audio itself (e.g. PCM from a TTS worker process), or None for silent display
         chunk_length_ms (int): The length of each audio chunk in milliseconds
         display_text (str, optional): Text to be displayed with the audio
         actions (Actions, optional): Actions associated with the audio
 
     Returns:
-        dict: The audio payload to be sent
+        dict: The audio payload to be sent, with the WAV bytes as "audio"
+            (the codec of the connection encodes them)
     """
     if not audio_path:
         # Return payload for silent display
@@ -54,18 +56,26 @@ def prepare_audio_payload(
         }
 
     try:
-        audio = AudioSegment.from_file(audio_path)
-        audio_bytes = audio.export(format="wav").read()
+        if isinstance(audio_path, AudioBuffer):
+            audio_bytes = audio_path.wav_bytes()
+            audio = AudioSegment(
+                data=audio_path.pcm16_bytes(),
+                sample_width=2,
+                frame_rate=audio_path.sample_rate,
+                channels=1,
+            )
+        else:
+            audio = AudioSegment.from_file(audio_path)
+            audio_bytes = audio.export(format="wav").read()
     except Exception as e:
         raise ValueError(
             f"Error loading or converting generated audio file to wav file '{audio_path}': {e}"
         )
-    audio_base64 = base64.b64encode(audio_bytes).decode("utf-8")
     volumes = _get_volume_by_chunks(audio, chunk_length_ms)
 
     payload = {
         "type": "audio",
-        "audio": audio_base64,
+        "audio": audio_bytes,
         "volumes": volumes,
         "slice_length": chunk_length_ms,
         "text": display_text,
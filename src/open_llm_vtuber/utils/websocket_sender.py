@@ -0,0 +1,172 @@
+"""
+Outbound message queue of one WebSocket connection.
+
+Sending straight from the conversation means that a slow client (e.g. a phone
+on a bad network) stalls the coroutine that schedules TTS until each frame is
+written. Instead, messages are queued and a sender task writes them in order,
+so producers only wait for the network when a client falls far behind.
+"""
+
+import asyncio
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple, Union
+
+from fastapi import WebSocket
+from loguru import logger
+
+from . import serializer
+from .ws_compression import CompressionPolicy
+from ..websocket_messages import STATUS_MESSAGE_TYPES, OutgoingMessage
+
+# deflate takes about 1 ms per 32 KB of JSON history, larger messages are
+# compressed in a thread so they don't hold up the event loop
+THREAD_COMPRESS_SIZE = 32 * 1024
+
+
+class WebSocketSender:
+    """
+    Queues the messages of one connection and sends them from a background task.
+
+    Status messages (`STATUS_MESSAGE_TYPES`, e.g. the "Thinking..." full-text)
+    only matter for their latest value: a newer one takes the place of one of
+    the same type that is still waiting, so at most one of each is queued
+    however slow the client is. Other messages (audio, control, history...) are
+    never dropped: once `max_queue_size` messages are waiting, `send` waits
+    until the client catches up, so a slow client can't make the queue grow
+    without bound.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        max_queue_size: int = 64,
+        codec: serializer.Codec = serializer.JSON_CODEC,
+        compression: CompressionPolicy | None = None,
+    ):
+        """
+        Start the sender task. Must be called from the event loop.
+
+        Args:
+            websocket (WebSocket): The accepted connection.
+            max_queue_size (int): Messages waiting to be sent at which
+                `send` waits for room (status messages excepted).
+            codec (serializer.Codec): The encoding negotiated with the client.
+            compression (CompressionPolicy, optional): Which messages to
+                compress, if the client supports it.
+        """
+        self._websocket = websocket
+        self.max_queue_size = max_queue_size
+        self.codec = codec
+        self.compression = compression
+        self._queue: Deque[Tuple[Union[str, bytes], Optional[str]]] = deque()
+        self._wakeup = asyncio.Event()
+        # set when the sender task takes a message off the queue
+        self._space = asyncio.Event()
+        self._closing = False
+        self._error: BaseException | None = None
+        self._backlogged = False
+
+        self.sent = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self._task = asyncio.create_task(self._run())
+
+    @property
+    def depth(self) -> int:
+        """Number of messages waiting to be sent."""
+        return len(self._queue)
+
+    async def send(self, message: OutgoingMessage) -> None:
+        """
+        Encode and queue a message. Returns without waiting for it to be sent,
+        unless the queue is full.
+
+        Raises:
+            RuntimeError: If the connection failed or the sender is closed.
+        """
+        message_type = message.get("type")
+        supersede = message_type if message_type in STATUS_MESSAGE_TYPES else None
+        if supersede is None:
+            while len(self._queue) >= self.max_queue_size:
+                self._check_open()
+                if not self._backlogged:
+                    self._backlogged = True
+                    logger.warning(
+                        f"Slow client: {len(self._queue)} messages waiting to be "
+                        "sent, holding back new ones."
+                    )
+                self._space.clear()
+                await self._space.wait()
+        self._check_open()
+
+        data = self.codec.dumps(message)
+        if self.compression is not None:
+            if len(data) >= THREAD_COMPRESS_SIZE:
+                data = await asyncio.to_thread(
+                    self.compression.compress, message_type, data, self.codec
+                )
+            else:
+                data = self.compression.compress(message_type, data, self.codec)
+        if supersede is not None:
+            for i, (_, key) in enumerate(self._queue):
+                if key == supersede:
+                    # in place, to keep its order with the other messages
+                    self._queue[i] = (data, supersede)
+                    self.dropped += 1
+                    return
+
+        self._queue.append((data, supersede))
+        self.max_depth = max(self.max_depth, len(self._queue))
+        self._wakeup.set()
+
+    def _check_open(self) -> None:
+        if self._error is not None:
+            raise RuntimeError(f"WebSocket send failed: {self._error}")
+        if self._closing:
+            raise RuntimeError("WebSocket sender is closed")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "sent": self.sent,
+            "dropped": self.dropped,
+        }
+
+    async def aclose(self, timeout: float = 1.0) -> None:
+        """Send what is still queued (for at most `timeout` seconds) and stop."""
+        self._closing = True
+        self._wakeup.set()
+        self._space.set()
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            pass
+        logger.debug(f"WebSocket sender closed: {self.stats()}")
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                if not self._queue:
+                    if self._closing:
+                        return
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+
+                data, _ = self._queue.popleft()
+                self._space.set()
+                if isinstance(data, bytes):
+                    await self._websocket.send_bytes(data)
+                else:
+                    await self._websocket.send_text(data)
+                self.sent += 1
+                if self._backlogged and len(self._queue) <= self.max_queue_size // 2:
+                    self._backlogged = False
+                    logger.info("Slow client caught up.")
+        except Exception as e:
+            # the connection is gone, the receive loop will notice as well
+            self._error = e
+            self._queue.clear()
+            self._space.set()
+            logger.debug(f"WebSocket sender stopped: {e}")
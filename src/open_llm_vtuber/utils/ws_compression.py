@@ -0,0 +1,134 @@
+"""
+Compression of large WebSocket messages.
+
+The permessage-deflate extension of uvicorn compresses every message of a
+connection, including audio that is already compressed or doesn't compress
+well. Clients that offer a WebSocket subprotocol ending in `DEFLATE_SUFFIX`
+("json+deflate" or "msgpack+deflate") instead get only the message types of a
+`CompressionPolicy` compressed, when they are above its size threshold.
+
+A WebSocket server confirms a single subprotocol, so each combination of
+encoding and compression is one token: the client knows messages may be
+compressed only if the server accepted a "+deflate" one.
+
+A compressed message is raw deflate (`DecompressionStream("deflate-raw")` in
+browsers) of the encoded message:
+- with JSON, in a binary frame (uncompressed JSON messages are text frames);
+- with MessagePack, in a MessagePack extension of type `MSGPACK_EXT_DEFLATE`.
+"""
+
+import threading
+import time
+import zlib
+from typing import Dict, Iterable, Tuple
+
+from loguru import logger
+
+from . import serializer
+
+DEFLATE_SUFFIX = "+deflate"
+MSGPACK_EXT_DEFLATE = 1
+
+
+class CompressionStats:
+    """Compression totals of all connections, reported by /ready."""
+
+    def __init__(self):
+        self.messages = 0
+        self.raw_bytes = 0
+        self.compressed_bytes = 0
+        self.cpu_seconds = 0.0
+        # large messages are compressed in worker threads
+        self._lock = threading.Lock()
+
+    def record(self, raw_bytes: int, compressed_bytes: int, cpu_seconds: float):
+        with self._lock:
+            self._record(raw_bytes, compressed_bytes, cpu_seconds)
+
+    def _record(self, raw_bytes: int, compressed_bytes: int, cpu_seconds: float):
+        self.messages += 1
+        self.raw_bytes += raw_bytes
+        self.compressed_bytes += compressed_bytes
+        self.cpu_seconds += cpu_seconds
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "messages": self.messages,
+            "raw_bytes": self.raw_bytes,
+            "compressed_bytes": self.compressed_bytes,
+            "ratio": (
+                round(self.compressed_bytes / self.raw_bytes, 3)
+                if self.raw_bytes
+                else None
+            ),
+            "cpu_ms": round(self.cpu_seconds * 1000, 1),
+        }
+
+
+compression_stats = CompressionStats()
+
+
+def negotiate_subprotocol(
+    subprotocols: Iterable[str], allow_msgpack: bool = True, allow_deflate: bool = True
+) -> Tuple[serializer.Codec, str | None, bool]:
+    """
+    Choose the encoding and compression of a connection from the subprotocols
+    the client offers, taking the first one it lists that the server supports.
+
+    Returns:
+        The codec, the subprotocol to accept (None for plain JSON), and whether
+        messages are compressed.
+    """
+    for subprotocol in subprotocols:
+        compress = subprotocol.endswith(DEFLATE_SUFFIX)
+        name = subprotocol.removesuffix(DEFLATE_SUFFIX) if compress else subprotocol
+        if compress and not allow_deflate:
+            continue
+        if name == serializer.MSGPACK_SUBPROTOCOL and allow_msgpack:
+            if serializer.MSGPACK_CODEC is None:
+                logger.warning(
+                    f"A client asked for {subprotocol}, but msgpack is not installed."
+                )
+                continue
+            return serializer.MSGPACK_CODEC, subprotocol, compress
+        if name == "json" and compress:
+            return serializer.JSON_CODEC, subprotocol, True
+    return serializer.JSON_CODEC, None, False
+
+
+class CompressionPolicy:
+    """Which messages of a connection are compressed."""
+
+    def __init__(self, message_types: Iterable[str], min_size: int, level: int = 6):
+        """
+        Args:
+            message_types: Types of the messages worth compressing.
+            min_size (int): Encoded size in bytes below which messages are
+                sent as is.
+            level (int): zlib compression level, 1 (fastest) to 9 (smallest).
+        """
+        self.message_types = frozenset(message_types)
+        self.min_size = min_size
+        self.level = level
+
+    def compress(
+        self, message_type: str, data: str | bytes, codec: serializer.Codec
+    ) -> str | bytes:
+        """Compress an encoded message if the policy applies to it."""
+        if message_type not in self.message_types:
+            return data
+        raw = data.encode("utf-8") if isinstance(data, str) else data
+        if len(raw) < self.min_size:
+            return data
+
+        start = time.thread_time()
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        compressed = compressor.compress(raw) + compressor.flush()
+        if len(compressed) >= len(raw):
+            return data
+        if codec is serializer.MSGPACK_CODEC:
+            compressed = serializer.msgpack.packb(
+                serializer.msgpack.ExtType(MSGPACK_EXT_DEFLATE, compressed)
+            )
+        compression_stats.record(len(raw), len(compressed), time.thread_time() - start)
+        return compressed
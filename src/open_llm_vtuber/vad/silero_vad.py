@@ -0,0 +1,91 @@
+import os
+from typing import List
+
+import numpy as np
+import sherpa_onnx
+from loguru import logger
+
+from .vad_interface import VADInterface
+from ..asr.utils import download_and_extract
+
+SILERO_VAD_URL = (
+    "https://github.com/k2-fsa/sherpa-onnx/releases/download/asr-models/silero_vad.onnx"
+)
+
+
+class VADEngine(VADInterface):
+    """Silero VAD running on the sherpa-onnx runtime."""
+
+    def __init__(
+        self,
+        model_path: str = "./models/silero_vad.onnx",
+        threshold: float = 0.5,
+        min_silence_duration: float = 0.5,
+        min_speech_duration: float = 0.25,
+        max_speech_duration: float = 20,
+        num_threads: int = 1,
+        provider: str = "cpu",
+    ):
+        """
+        Args:
+            model_path (str): Path to silero_vad.onnx. Downloaded if missing.
+            threshold (float): Speech probability above which a frame is speech.
+            min_silence_duration (float): Seconds of silence that end an utterance.
+            min_speech_duration (float): Utterances shorter than this are dropped.
+            max_speech_duration (float): Utterances longer than this are split.
+            num_threads (int): Number of threads for inference.
+            provider (str): Provider for inference (cpu or cuda).
+        """
+        if not os.path.isfile(model_path):
+            logger.warning("Silero VAD model not found. Downloading the model...")
+            model_path = str(
+                download_and_extract(SILERO_VAD_URL, os.path.dirname(model_path))
+            )
+
+        config = sherpa_onnx.VadModelConfig()
+        config.silero_vad.model = model_path
+        config.silero_vad.threshold = threshold
+        config.silero_vad.min_silence_duration = min_silence_duration
+        config.silero_vad.min_speech_duration = min_speech_duration
+        config.silero_vad.max_speech_duration = max_speech_duration
+        config.sample_rate = self.SAMPLE_RATE
+        config.num_threads = num_threads
+        config.provider = provider
+
+        self.window_size = config.silero_vad.window_size
+        self.vad = sherpa_onnx.VoiceActivityDetector(
+            config, buffer_size_in_seconds=max_speech_duration + 10
+        )
+        # samples that don't fill a whole window yet
+        self._pending = np.zeros(0, dtype=np.float32)
+
+    def _pop_segments(self) -> List[np.ndarray]:
+        segments = []
+        while not self.vad.empty():
+            segments.append(np.array(self.vad.front.samples, dtype=np.float32))
+            self.vad.pop()
+        return segments
+
+    def detect_speech(self, audio: np.ndarray) -> List[np.ndarray]:
+        samples = np.concatenate([self._pending, audio.astype(np.float32)])
+        end = len(samples) - len(samples) % self.window_size
+        for start in range(0, end, self.window_size):
+            self.vad.accept_waveform(samples[start : start + self.window_size])
+        self._pending = samples[end:]
+        return self._pop_segments()
+
+    def flush(self) -> List[np.ndarray]:
+        if len(self._pending):
+            self.vad.accept_waveform(self._pending)
+            self._pending = np.zeros(0, dtype=np.float32)
+        self.vad.flush()
+        segments = self._pop_segments()
+        self.vad.reset()
+        return segments
+
+    def is_speech_detected(self) -> bool:
+        return self.vad.is_speech_detected()
+
+    def reset(self) -> None:
+        self._pending = np.zeros(0, dtype=np.float32)
+        self.vad.reset()
@@ -0,0 +1,14 @@
+from typing import Type
+from .vad_interface import VADInterface
+from ..utils.engine_registry import EngineRegistry
+
+# Engine modules are only imported when the engine is selected in the config.
+vad_registry = EngineRegistry("VAD engine type", __package__)
+
+vad_registry.register("silero_vad", ".silero_vad", "VADEngine")
+
+
+class VADFactory:
+    @staticmethod
+    def get_vad_engine(engine_type: str, **kwargs) -> Type[VADInterface]:
+        return vad_registry.create(engine_type, **kwargs)
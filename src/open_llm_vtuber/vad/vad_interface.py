@@ -0,0 +1,43 @@
+import abc
+from typing import List
+
+import numpy as np
+
+
+class VADInterface(metaclass=abc.ABCMeta):
+    """
+    Voice activity detection over a stream of audio frames.
+
+    A VAD instance keeps the state of one audio stream, so every session needs
+    its own instance.
+    """
+
+    SAMPLE_RATE = 16000
+
+    @abc.abstractmethod
+    def detect_speech(self, audio: np.ndarray) -> List[np.ndarray]:
+        """Feed the next frames of the stream and return the utterances that ended.
+
+        Args:
+            audio: Float32 samples in [-1, 1] at SAMPLE_RATE.
+
+        Returns:
+            List[np.ndarray]: The utterances completed by these frames, with
+            leading and trailing silence removed.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def flush(self) -> List[np.ndarray]:
+        """End the stream and return the utterances still pending in it."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def is_speech_detected(self) -> bool:
+        """Return True while the user is speaking."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def reset(self) -> None:
+        """Drop all buffered audio and start a new stream."""
+        raise NotImplementedError
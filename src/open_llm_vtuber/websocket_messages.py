@@ -0,0 +1,251 @@
+"""
+Schemas of the messages exchanged with the frontend over `/client-ws`.
+
+Every message is an object with a `type` field. These TypedDicts document the
+fields of each type; they are plain dicts at runtime, so they cost nothing to
+build and serialize. They are encoded as JSON, or as MessagePack if the client
+negotiated it (see `utils.serializer`).
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, TypedDict, Union
+
+# the annotations are not evaluated at runtime (see the __future__ import), so
+# on Python 3.10 NotRequired is only needed by type checkers
+if sys.version_info >= (3, 11):
+    from typing import NotRequired
+elif TYPE_CHECKING:
+    from typing_extensions import NotRequired
+
+from .chat_history_manager import HistoryMessage
+
+
+# ==== client -> server
+
+
+class FetchHistoryListMessage(TypedDict):
+    type: Literal["fetch-history-list"]
+
+
+class FetchAndSetHistoryMessage(TypedDict):
+    type: Literal["fetch-and-set-history"]
+    history_uid: str
+    # answer with a history-page of this size instead of the whole history
+    page_size: NotRequired[int]
+
+
+class FetchHistoryPageMessage(TypedDict):
+    type: Literal["fetch-history-page"]
+    # defaults to the current history
+    history_uid: NotRequired[str]
+    # cursor of the page received last, omitted for the latest page
+    before: NotRequired[Optional[int]]
+    page_size: NotRequired[int]
+
+
+class CreateNewHistoryMessage(TypedDict):
+    type: Literal["create-new-history"]
+
+
+class DeleteHistoryMessage(TypedDict):
+    type: Literal["delete-history"]
+    history_uid: str
+
+
+class InterruptSignalMessage(TypedDict):
+    type: Literal["interrupt-signal"]
+    # the part of the AI response heard before the interruption
+    text: str
+
+
+class MicAudioDataMessage(TypedDict):
+    type: Literal["mic-audio-data"]
+    # float32 little-endian bytes are accepted as well with MessagePack
+    audio: List[float]
+    # rate of `audio` if it isn't 16 kHz
+    sample_rate: NotRequired[int]
+
+
+class ImageInput(TypedDict):
+    source: str
+    data: str
+    mime_type: str
+
+
+class MicAudioEndMessage(TypedDict):
+    type: Literal["mic-audio-end"]
+    images: NotRequired[List[ImageInput]]
+
+
+class TextInputMessage(TypedDict):
+    type: Literal["text-input"]
+    text: str
+    images: NotRequired[List[ImageInput]]
+
+
+class AISpeakSignalMessage(TypedDict):
+    type: Literal["ai-speak-signal"]
+
+
+class FetchConfigsMessage(TypedDict):
+    type: Literal["fetch-configs"]
+
+
+class SwitchConfigMessage(TypedDict):
+    type: Literal["switch-config"]
+    file: str
+
+
+class FetchBackgroundsMessage(TypedDict):
+    type: Literal["fetch-backgrounds"]
+
+
+IncomingMessage = Union[
+    FetchHistoryListMessage,
+    FetchAndSetHistoryMessage,
+    FetchHistoryPageMessage,
+    CreateNewHistoryMessage,
+    DeleteHistoryMessage,
+    InterruptSignalMessage,
+    MicAudioDataMessage,
+    MicAudioEndMessage,
+    TextInputMessage,
+    AISpeakSignalMessage,
+    FetchConfigsMessage,
+    SwitchConfigMessage,
+    FetchBackgroundsMessage,
+]
+
+
+# ==== server -> client
+
+
+class FullTextMessage(TypedDict):
+    """Status text shown in the frontend (e.g. "Thinking...")."""
+
+    type: Literal["full-text"]
+    text: str
+
+
+class ControlMessage(TypedDict):
+    type: Literal["control"]
+    # "start-mic", "conversation-chain-start", "conversation-chain-end"...
+    text: str
+
+
+class SetModelAndConfMessage(TypedDict):
+    type: Literal["set-model-and-conf"]
+    model_info: Dict[str, Any]
+    conf_name: str
+    conf_uid: str
+
+
+class UserInputPartialMessage(TypedDict):
+    """Interim transcript of the utterance in progress."""
+
+    type: Literal["user-input-partial"]
+    text: str
+
+
+class UserInputTranscriptionMessage(TypedDict):
+    type: Literal["user-input-transcription"]
+    text: str
+
+
+class AudioMessage(TypedDict):
+    """One sentence of the response, see `utils.stream_audio.prepare_audio_payload`."""
+
+    type: Literal["audio"]
+    # WAV bytes (base64 in JSON), None for text without speech
+    audio: Optional[bytes]
+    # normalized volume of each slice, for the lip sync (one byte per slice,
+    # 0 to 255, with MessagePack)
+    volumes: List[float]
+    slice_length: int
+    text: Optional[str]
+    actions: Optional[Dict[str, Any]]
+
+
+class HistoryInfo(TypedDict):
+    uid: str
+    latest_message: HistoryMessage
+    timestamp: Optional[str]
+
+
+class HistoryListMessage(TypedDict):
+    type: Literal["history-list"]
+    histories: List[HistoryInfo]
+
+
+class HistoryDataMessage(TypedDict):
+    type: Literal["history-data"]
+    messages: List[HistoryMessage]
+
+
+class HistoryPageMessage(TypedDict):
+    type: Literal["history-page"]
+    history_uid: str
+    messages: List[HistoryMessage]
+    # `before` of the previous page, None if this is the first page
+    cursor: Optional[int]
+
+
+class NewHistoryCreatedMessage(TypedDict):
+    type: Literal["new-history-created"]
+    history_uid: str
+
+
+class HistoryDeletedMessage(TypedDict):
+    type: Literal["history-deleted"]
+    success: bool
+    history_uid: str
+
+
+class ConfigInfo(TypedDict):
+    filename: str
+    name: str
+
+
+class ConfigFilesMessage(TypedDict):
+    type: Literal["config-files"]
+    configs: List[ConfigInfo]
+
+
+class ConfigSwitchedMessage(TypedDict):
+    type: Literal["config-switched"]
+    message: str
+
+
+class BackgroundFilesMessage(TypedDict):
+    type: Literal["background-files"]
+    files: List[str]
+
+
+class ErrorMessage(TypedDict):
+    type: Literal["error"]
+    message: str
+
+
+OutgoingMessage = Union[
+    FullTextMessage,
+    ControlMessage,
+    SetModelAndConfMessage,
+    UserInputPartialMessage,
+    UserInputTranscriptionMessage,
+    AudioMessage,
+    HistoryListMessage,
+    HistoryDataMessage,
+    HistoryPageMessage,
+    NewHistoryCreatedMessage,
+    HistoryDeletedMessage,
+    ConfigFilesMessage,
+    ConfigSwitchedMessage,
+    BackgroundFilesMessage,
+    ErrorMessage,
+]
+
+# Status messages only the latest value of matters. A newer one replaces one
+# that is still waiting to be sent.
+STATUS_MESSAGE_TYPES = frozenset({"full-text", "user-input-partial"})